@@ -0,0 +1,242 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from datetime import time as hora
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from telemetria import histograma, obter_logger
+
+# Um disparo atrasado mais que isto (segundos) é considerado perdido
+TOLERANCIA = 60
+# O timer nunca dorme mais que isto, para perceber ajustes no relógio do sistema
+ESPERA_MAXIMA = 60
+# Entradas canceladas continuam no heap até serem retiradas; acima desta fração, ele é reconstruído
+FRACAO_OBSOLETAS = 0.5
+# Disparos tratados por volta do timer, para não segurar o event loop (ex.: recuperação ao iniciar)
+LOTE = 10000
+
+log = obter_logger("agenda")
+
+
+def ler_horario(texto):
+    """ "HH:MM" -> datetime.time; ValueError se inválido"""
+    horas, _, minutos = texto.strip().partition(":")
+    try:
+        return hora(int(horas), int(minutos or 0))
+    except ValueError as e:
+        raise ValueError(f"Horário inválido: {texto} (use HH:MM)") from e
+
+
+def ler_fuso(nome):
+    """Nome IANA -> ZoneInfo; ValueError se desconhecido"""
+    try:
+        return ZoneInfo(nome)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Fuso horário desconhecido: {nome}") from e
+
+
+class Diaria:
+    """Horários fixos do relógio local de um fuso, todos os dias.
+
+    Um horário que cai no buraco do início do horário de verão dispara logo
+    depois da mudança (02:30 vira 03:30); um horário repetido no fim do horário
+    de verão dispara só na primeira vez.
+    """
+
+    def __init__(self, horarios, fuso):
+        self.horarios = tuple(ler_horario(h) if isinstance(h, str) else h for h in horarios)
+        self.fuso = ler_fuso(fuso) if isinstance(fuso, str) else fuso
+
+    def _do_dia(self, data):
+        # fold=0: no buraco usa o deslocamento anterior à mudança; na repetição, a primeira ocorrência
+        return [datetime.combine(data, h, tzinfo=self.fuso).astimezone(timezone.utc) for h in self.horarios]
+
+    def proximo(self, depois):
+        """Primeiro disparo (UTC) estritamente depois de `depois`"""
+        data = depois.astimezone(self.fuso).date()
+        for dias in range(3):
+            candidatos = [c for c in self._do_dia(data + timedelta(days=dias)) if c > depois]
+            if candidatos:
+                return min(candidatos)
+        raise ValueError("Regra sem próximo disparo")
+
+    def inicio_do_dia(self, agora):
+        """Meia-noite local (UTC) do dia de `agora` no fuso da regra"""
+        local = agora.astimezone(self.fuso)
+        return datetime.combine(local.date(), hora(0), tzinfo=self.fuso).astimezone(timezone.utc)
+
+
+@dataclass(eq=False)
+class Entrada:
+    tipo: str
+    alvo: str
+    regra: Diaria
+    antecedencia: timedelta
+    tolerancia: float
+    recuperar: bool
+    horario: datetime = None
+    ativa: bool = True
+
+
+class Agenda:
+    """Eventos recorrentes de todas as guilds num único heap e um único timer.
+
+    Cada entrada é (tipo, alvo), por exemplo ("terco", guild_id). Na hora
+    marcada, as entradas do mesmo tipo e horário são reunidas e a ação do tipo
+    é chamada uma vez: `acoes[tipo](alvos, horario)`. Inserir, remover e
+    disparar custam O(log n); sem nada a disparar, o timer só acorda a cada
+    ESPERA_MAXIMA segundos.
+
+    Disparo perdido (atraso > tolerância, por exemplo com o bot fora do ar):
+    roda mesmo assim se a entrada tem `recuperar`, senão é pulado. Vários
+    disparos perdidos da mesma entrada viram um só.
+    """
+
+    def __init__(self, acoes, relogio=time.time):
+        self.acoes = acoes
+        self.relogio = relogio
+        self.entradas = {}
+        self.tarefas = set()
+        self._heap = []
+        self._sequencia = itertools.count()
+        self._por_tipo = Counter()
+        self._acordar = None
+        self._tarefa = None
+        self._atrasos = histograma(
+            "liturgia_agenda_delay_seconds", "Atraso entre o horário marcado e o disparo",
+            (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0, 300.0, 3600.0),
+        )
+
+    def __len__(self):
+        return len(self.entradas)
+
+    @property
+    def rodando(self):
+        return self._tarefa is not None and not self._tarefa.done()
+
+    def _agora(self):
+        return datetime.fromtimestamp(self.relogio(), timezone.utc)
+
+    def _empilhar(self, entrada):
+        disparo = (entrada.horario - entrada.antecedencia).timestamp()
+        heapq.heappush(self._heap, (disparo, next(self._sequencia), entrada))
+        if self._acordar is not None and self._heap[0][2] is entrada:
+            # Nova entrada passou à frente: o timer precisa recalcular a espera
+            self._acordar.set()
+
+    def agendar(self, tipo, alvo, regra, antecedencia=timedelta(0), tolerancia=TOLERANCIA,
+                recuperar=False, desde=None):
+        """Agenda (ou reagenda) a entrada (tipo, alvo).
+
+        `desde`: o primeiro disparo é o próximo depois deste instante; se já
+        passou, vale a política de disparo perdido (é assim que se recupera o
+        que ficou para trás enquanto o bot estava fora do ar).
+        """
+        self.remover(tipo, alvo)
+        entrada = Entrada(tipo, alvo, regra, antecedencia, tolerancia, recuperar)
+        entrada.horario = regra.proximo(desde or self._agora() + antecedencia)
+        self.entradas[tipo, alvo] = entrada
+        self._por_tipo[tipo] += 1
+        self._empilhar(entrada)
+        return entrada.horario
+
+    def remover(self, tipo, alvo):
+        # Remoção preguiçosa: a entrada fica no heap marcada como inativa
+        entrada = self.entradas.pop((tipo, alvo), None)
+        if entrada is None:
+            return False
+        entrada.ativa = False
+        self._por_tipo[tipo] -= 1
+        if len(self._heap) > 64 and len(self.entradas) < len(self._heap) * (1 - FRACAO_OBSOLETAS):
+            self._heap = [item for item in self._heap if item[2].ativa]
+            heapq.heapify(self._heap)
+        return True
+
+    def _topo(self):
+        while self._heap and not self._heap[0][2].ativa:
+            heapq.heappop(self._heap)
+        return self._heap[0] if self._heap else None
+
+    def proximo(self):
+        """(tipo, alvo, horário) do próximo disparo, ou None"""
+        topo = self._topo()
+        if topo is None:
+            return None
+        entrada = topo[2]
+        return entrada.tipo, entrada.alvo, entrada.horario
+
+    def resumo(self):
+        proximo = self.proximo()
+        return {
+            "rodando": self.rodando,
+            "entradas": dict(+self._por_tipo),
+            "proximo": None if proximo is None else {
+                "tipo": proximo[0], "alvo": proximo[1], "horario": proximo[2].isoformat(),
+            },
+        }
+
+    def vencidas(self, limite=LOTE):
+        """Retira do heap (até `limite`) o que já deve disparar e reagenda;
+        devolve {(tipo, horario): [alvos]}"""
+        agora = self.relogio()
+        grupos = {}
+        perdidos = Counter()
+        for _ in range(limite):
+            topo = self._topo()
+            if topo is None or topo[0] > agora:
+                break
+            disparo, _, entrada = heapq.heappop(self._heap)
+            atraso = agora - disparo
+            if atraso <= entrada.tolerancia or entrada.recuperar:
+                self._atrasos.observar(atraso)
+                grupos.setdefault((entrada.tipo, entrada.horario), []).append(entrada.alvo)
+            else:
+                perdidos[entrada.tipo] += 1
+            # Próximo horário depois de agora: disparos perdidos em sequência viram um só
+            depois = max(entrada.horario, datetime.fromtimestamp(agora, timezone.utc) + entrada.antecedencia)
+            entrada.horario = entrada.regra.proximo(depois)
+            self._empilhar(entrada)
+        for tipo, n in perdidos.items():
+            log.warning("%d disparos de %s perdidos (atraso acima da tolerância); seguem no próximo horário.", n, tipo)
+        return grupos
+
+    def _disparar(self, grupos):
+        for (tipo, horario), alvos in grupos.items():
+            log.info("Disparando %s das %s para %d alvos.", tipo, horario.isoformat(), len(alvos))
+            tarefa = asyncio.create_task(self.acoes[tipo](alvos, horario), name=f"agenda-{tipo}")
+            self.tarefas.add(tarefa)
+            tarefa.add_done_callback(self._concluida)
+
+    def _concluida(self, tarefa):
+        self.tarefas.discard(tarefa)
+        if not tarefa.cancelled() and tarefa.exception() is not None:
+            log.error("Ação %s falhou", tarefa.get_name(), exc_info=tarefa.exception())
+
+    async def _rodar(self):
+        while True:
+            self._acordar.clear()
+            self._disparar(self.vencidas())
+            topo = self._topo()
+            espera = ESPERA_MAXIMA if topo is None else min(ESPERA_MAXIMA, max(0.0, topo[0] - self.relogio()))
+            try:
+                await asyncio.wait_for(self._acordar.wait(), espera)
+            except asyncio.TimeoutError:
+                pass
+
+    def iniciar(self):
+        """Chamar de dentro do event loop; idempotente (on_ready roda a cada reconexão)"""
+        if self.rodando:
+            return
+        self._acordar = asyncio.Event()
+        self._tarefa = asyncio.create_task(self._rodar(), name="agenda")
+        log.info("Agenda iniciada com %d entradas.", len(self.entradas))
+
+    def parar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+        for tarefa in self.tarefas:
+            tarefa.cancel()
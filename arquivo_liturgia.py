@@ -0,0 +1,534 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import struct
+import time
+import unicodedata
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from telemetria import obter_logger, span
+from texto_html import limpar_html
+
+ARQUIVO = "liturgia_arquivo.bin"
+INDICE = "liturgia_arquivo.db"
+# Cabeçalho de cada registro: data (AAAA-MM-DD) e tamanho do bloco comprimido que vem depois
+CABECALHO = struct.Struct("<10sI")
+NIVEL_COMPRESSAO = 9
+# Buscas simultâneas nas fontes durante o preenchimento
+CONCORRENCIA = 4
+# Caracteres do texto mostrados em cada resultado da busca
+TAMANHO_TRECHO = 200
+
+PARTES = {
+    "primeira_leitura": "Primeira leitura",
+    "salmo": "Salmo",
+    "segunda_leitura": "Segunda leitura",
+    "evangelho": "Evangelho",
+}
+# (parte, chave em "readings", campo do cabeçalho, campos do texto)
+_CAMPOS = (
+    ("primeira_leitura", "first_reading", "head", ("text",)),
+    ("salmo", "psalm", "title", ("response", "content_psalm")),
+    ("segunda_leitura", "second_reading", "head", ("text",)),
+    ("evangelho", "gospel", "head_title", ("text",)),
+)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS dias (
+    data TEXT PRIMARY KEY,
+    deslocamento INTEGER NOT NULL,
+    tamanho INTEGER NOT NULL,
+    parcial INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS trechos (
+    id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL,
+    parte TEXT NOT NULL,
+    cabecalho TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS referencias (
+    livro TEXT NOT NULL,
+    capitulo INTEGER NOT NULL,
+    inicio INTEGER NOT NULL,
+    fim INTEGER NOT NULL,
+    trecho INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS referencias_livro ON referencias (livro, capitulo);
+CREATE VIRTUAL TABLE IF NOT EXISTS busca USING fts5(
+    cabecalho, texto, content='', tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+log = obter_logger("arquivo")
+
+# "(Lc 18,1-8)", "(2Tm 3,14-4,2)", "(Jo 3,16-18.21)"
+_REFERENCIA = re.compile(r"\(\s*([1-3]?\s?[^\W\d_]+)\.?\s*(\d+)\s*,\s*([^)]*)\)")
+# O que o usuário digita: "Lc 18", "Lc 18,5", "1Cor 13:4"
+_CONSULTA_REFERENCIA = re.compile(r"^\s*([1-3]?\s?[^\W\d_]+)\.?\s*(\d+)(?:\s*[,:]\s*(\d+))?\s*$")
+_VERSICULO = re.compile(r"\s*(\d+)")
+_FIM_DO_CAPITULO = 999
+
+
+@dataclass(frozen=True)
+class Resultado:
+    data: str
+    parte: str
+    cabecalho: str
+    trecho: str
+
+
+def _texto(leitura, campos):
+    partes = []
+    for campo in campos:
+        valor = leitura.get(campo)
+        if isinstance(valor, list):
+            valor = "\n".join(valor)
+        if valor:
+            partes.append(limpar_html(valor))
+    return "\n".join(partes).strip()
+
+
+def partes_do_dia(dia):
+    """(parte, cabeçalho, texto) de cada leitura do dia, já sem HTML"""
+    leituras = dia.get("readings") or {}
+    for parte, chave, cabecalho, campos in _CAMPOS:
+        leitura = leituras.get(chave) or {}
+        texto = _texto(leitura, campos)
+        if texto:
+            yield parte, _texto(leitura, (cabecalho,)), texto
+
+
+def _sem_acentos(texto):
+    # Um caractere por caractere do original, para as posições valerem nos dois
+    return "".join(unicodedata.normalize("NFD", c)[0].lower()[0] for c in texto)
+
+
+def _livro(nome):
+    return _sem_acentos(nome).replace(" ", "")
+
+
+def _versiculo(texto):
+    m = _VERSICULO.match(texto)
+    if m is None:
+        raise ValueError(texto)
+    return int(m.group(1))
+
+
+def referencias(texto):
+    """Referências bíblicas entre parênteses: "(Lc 18,1-8)" -> [("lc", 18, 1, 8)].
+
+    Uma faixa que passa para o capítulo seguinte ("3,14-4,2") vira uma por capítulo.
+    """
+    encontradas = []
+    for m in _REFERENCIA.finditer(texto):
+        livro, capitulo = _livro(m.group(1)), int(m.group(2))
+        for n, bloco in enumerate(m.group(3).split(";")):
+            # Depois de ";" vem outro capítulo: "3,16-18; 4,1"
+            if n and "," in bloco:
+                novo, _, bloco = bloco.partition(",")
+                try:
+                    capitulo = _versiculo(novo)
+                except ValueError:
+                    continue
+            for faixa in bloco.split("."):
+                inicio, _, fim = faixa.partition("-")
+                try:
+                    if "," in fim:
+                        encontradas.append((livro, capitulo, _versiculo(inicio), _FIM_DO_CAPITULO))
+                        novo, _, fim = fim.partition(",")
+                        capitulo = _versiculo(novo)
+                        encontradas.append((livro, capitulo, 1, _versiculo(fim)))
+                    else:
+                        primeiro = _versiculo(inicio)
+                        encontradas.append((livro, capitulo, primeiro, _versiculo(fim) if fim else primeiro))
+                except ValueError:
+                    continue
+    return encontradas
+
+
+def _consultas_fts(consulta):
+    """Expressões FTS5 a tentar, em ordem, e os termos para destacar o trecho.
+
+    Primeiro a frase exata (quem cola um versículo quer aquele trecho, e a
+    frase casa com poucos dias); depois todas as palavras em qualquer ordem.
+    Entre aspas, só a frase.
+    """
+    termos = re.findall(r"\w+", consulta)
+    if not termos:
+        return [], termos
+    frase = '"' + " ".join(termos) + '"'
+    if len(termos) == 1 or consulta.strip().startswith('"'):
+        return [frase], termos
+    return [frase, " ".join(f'"{t}"' for t in termos)], termos
+
+
+def trecho(texto, termos, tamanho=TAMANHO_TRECHO):
+    """Pedaço do texto em volta do primeiro termo encontrado"""
+    normalizado = _sem_acentos(texto)
+    posicoes = [p for p in (normalizado.find(_sem_acentos(t)) for t in termos) if p >= 0]
+    inicio = max(0, min(posicoes) - tamanho // 3) if posicoes else 0
+    fim = inicio + tamanho
+    return ("…" if inicio else "") + " ".join(texto[inicio:fim].split()) + ("…" if fim < len(texto) else "")
+
+
+class ArquivoLiturgia:
+    """Histórico da liturgia num único arquivo só de acréscimos, mais um índice em SQLite.
+
+    Cada dia é gravado uma vez no fim de `arquivo` (cabeçalho + JSON comprimido
+    com zlib) e nunca reescrito; um dia parcial (do RSS, sem salmo nem segunda
+    leitura) é substituído por um registro novo quando chega a versão completa,
+    e o antigo fica sem referência no arquivo. O SQLite guarda o deslocamento de cada data,
+    as referências bíblicas das leituras e um índice invertido (FTS5, sem cópia
+    do texto). Ler um dia ou buscar toca só o índice e os registros pedidos:
+    a memória não cresce com o histórico. Se o índice se perder ou ficar para
+    trás do arquivo, ele é refeito a partir dos registros ao abrir.
+    """
+
+    def __init__(self, arquivo=ARQUIVO, indice=INDICE):
+        self.caminho = arquivo
+        self.caminho_indice = indice
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="arquivo")
+        self._conexao = None
+        self._arquivo = None
+        self._executor.submit(self._abrir).result()
+
+    def _abrir(self):
+        self._conexao = sqlite3.connect(self.caminho_indice, check_same_thread=False, isolation_level=None)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(ESQUEMA)
+        colunas = {linha[1] for linha in self._conexao.execute("PRAGMA table_info(dias)")}
+        if "parcial" not in colunas:
+            self._conexao.execute("ALTER TABLE dias ADD COLUMN parcial INTEGER NOT NULL DEFAULT 0")
+        # "a+b": toda escrita vai para o fim, e a leitura funciona com seek
+        self._arquivo = open(self.caminho, "a+b")
+        self._recuperar()
+
+    def _recuperar(self):
+        tamanho = os.path.getsize(self.caminho)
+        alem_do_fim = self._conexao.execute(
+            "SELECT COUNT(*) FROM dias WHERE deslocamento + tamanho > ?", (tamanho,)
+        ).fetchone()[0]
+        if alem_do_fim:
+            # Arquivo truncado ou trocado: o índice de texto não tem como apagar só
+            # essas entradas (não guarda o texto), então tudo é refeito do arquivo
+            log.warning("%d dias do índice apontam além do fim do arquivo da liturgia; refazendo o índice.",
+                        alem_do_fim)
+            self._limpar_indice()
+        # Registros gravados no arquivo mas não no índice (queda entre os dois, ou índice apagado)
+        fim = self._conexao.execute("SELECT COALESCE(MAX(deslocamento + tamanho), 0) FROM dias").fetchone()[0]
+        recuperados = 0
+        while fim < tamanho:
+            self._arquivo.seek(fim)
+            cabecalho = self._arquivo.read(CABECALHO.size)
+            if len(cabecalho) < CABECALHO.size:
+                break
+            data, comprimido = CABECALHO.unpack(cabecalho)
+            inicio = fim + CABECALHO.size
+            if inicio + comprimido > tamanho:
+                break
+            try:
+                dia = json.loads(zlib.decompress(self._arquivo.read(comprimido)))
+            except (zlib.error, ValueError):
+                break
+            data = data.decode()
+            # Registros repetidos da mesma data: vale o completo que veio depois do parcial
+            parcial = self._parcial(data)
+            if self._aceita(parcial, dia):
+                # Um registro que não entra no índice não pode impedir o arquivo de abrir
+                try:
+                    self._indexar(data, dia, inicio, comprimido, substituir=parcial is not None)
+                    recuperados += 1
+                except Exception as e:
+                    log.error("Registro de %s no deslocamento %d não reindexado: %s", data, inicio, e)
+            fim = inicio + comprimido
+        if fim < tamanho:
+            log.warning("Arquivo da liturgia com %d bytes incompletos no fim; descartando.", tamanho - fim)
+            self._arquivo.truncate(fim)
+        if recuperados:
+            log.info("%d dias reindexados a partir do arquivo da liturgia.", recuperados)
+
+    def _limpar_indice(self):
+        conexao = self._conexao
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            for tabela in ("dias", "trechos", "referencias"):
+                conexao.execute(f"DELETE FROM {tabela}")
+            conexao.execute("INSERT INTO busca (busca) VALUES ('delete-all')")
+            conexao.execute("COMMIT")
+        except Exception:
+            conexao.execute("ROLLBACK")
+            raise
+
+    def _parcial(self, data):
+        """None se a data não está arquivada; senão, se o registro dela é parcial"""
+        linha = self._conexao.execute("SELECT parcial FROM dias WHERE data = ?", (data,)).fetchone()
+        return None if linha is None else bool(linha[0])
+
+    @staticmethod
+    def _aceita(parcial, dia):
+        # Data nova, ou um dia completo no lugar de um parcial
+        return parcial is None or (parcial and not dia.get("parcial"))
+
+    def executar(self, funcao, *args):
+        """Roda `funcao(*args)` na thread do arquivo"""
+        return asyncio.get_running_loop().run_in_executor(self._executor, funcao, *args)
+
+    def _desindexar(self, data):
+        """Apaga a data do índice; devolve o maior id de trecho deixado no índice de texto (ou 0)"""
+        # O índice de texto não guarda o conteúdo: apagar exige os valores indexados
+        trechos = dict(self._conexao.execute("SELECT parte, id FROM trechos WHERE data = ?", (data,)).fetchall())
+        try:
+            antigo = self._ler(data)
+        except (OSError, zlib.error, ValueError) as e:
+            # Sem o registro antigo não há o que apagar do índice de texto: as entradas
+            # ficam órfãs (a busca junta com trechos e não as devolve)
+            log.warning("Registro antigo de %s ilegível; substituindo só no índice: %s", data, e)
+            antigo = None
+        if antigo is not None:
+            for parte, cabecalho, texto in partes_do_dia(antigo):
+                if parte in trechos:
+                    self._conexao.execute(
+                        "INSERT INTO busca (busca, rowid, cabecalho, texto) VALUES ('delete', ?, ?, ?)",
+                        (trechos[parte], cabecalho, texto),
+                    )
+        self._conexao.executemany("DELETE FROM referencias WHERE trecho = ?", [(i,) for i in trechos.values()])
+        self._conexao.execute("DELETE FROM trechos WHERE data = ?", (data,))
+        self._conexao.execute("DELETE FROM dias WHERE data = ?", (data,))
+        return max(trechos.values(), default=0) if antigo is None else 0
+
+    def _indexar(self, data, dia, deslocamento, tamanho, substituir=False):
+        conexao = self._conexao
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            trecho_id = None
+            if substituir:
+                orfaos = self._desindexar(data)
+                if orfaos:
+                    # Ids novos acima das entradas órfãs, para a busca não casá-las com outro trecho
+                    atual = conexao.execute("SELECT COALESCE(MAX(id), 0) FROM trechos").fetchone()[0]
+                    trecho_id = max(orfaos, atual) + 1
+            conexao.execute("INSERT INTO dias (data, deslocamento, tamanho, parcial) VALUES (?, ?, ?, ?)",
+                            (data, deslocamento, tamanho, bool(dia.get("parcial"))))
+            for parte, cabecalho, texto in partes_do_dia(dia):
+                trecho_id = conexao.execute(
+                    "INSERT INTO trechos (id, data, parte, cabecalho) VALUES (?, ?, ?, ?)",
+                    (trecho_id, data, parte, cabecalho),
+                ).lastrowid
+                conexao.execute("INSERT INTO busca (rowid, cabecalho, texto) VALUES (?, ?, ?)",
+                                (trecho_id, cabecalho, texto))
+                # Sem cabeçalho (RSS), a referência costuma estar na primeira linha do texto
+                conexao.executemany(
+                    "INSERT INTO referencias (livro, capitulo, inicio, fim, trecho) VALUES (?, ?, ?, ?, ?)",
+                    [(*r, trecho_id) for r in referencias(cabecalho or texto.split("\n", 1)[0])],
+                )
+                trecho_id = None
+            conexao.execute("COMMIT")
+        except Exception:
+            conexao.execute("ROLLBACK")
+            raise
+
+    def _guardar(self, data, dia):
+        parcial = self._parcial(data)
+        if not self._aceita(parcial, dia):
+            return False
+        bloco = zlib.compress(
+            json.dumps(dia, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), NIVEL_COMPRESSAO
+        )
+        self._arquivo.seek(0, os.SEEK_END)
+        posicao = self._arquivo.tell()
+        self._arquivo.write(CABECALHO.pack(data.encode(), len(bloco)) + bloco)
+        self._arquivo.flush()
+        try:
+            self._indexar(data, dia, posicao + CABECALHO.size, len(bloco), substituir=parcial is not None)
+        except Exception:
+            # Sem índice, o bloco ficaria órfão no arquivo e voltaria na recuperação
+            self._arquivo.truncate(posicao)
+            raise
+        return True
+
+    def _ler(self, data):
+        linha = self._conexao.execute("SELECT deslocamento, tamanho FROM dias WHERE data = ?", (data,)).fetchone()
+        if linha is None:
+            return None
+        self._arquivo.seek(linha[0])
+        return json.loads(zlib.decompress(self._arquivo.read(linha[1])))
+
+    def _por_referencia(self, consulta, parte, limite):
+        m = _CONSULTA_REFERENCIA.match(consulta)
+        if m is None:
+            return None
+        versiculo = int(m.group(3)) if m.group(3) else None
+        sql = ("SELECT DISTINCT t.id, t.data, t.parte, t.cabecalho FROM referencias r "
+               "JOIN trechos t ON t.id = r.trecho WHERE r.livro = ? AND r.capitulo = ? AND r.fim >= ? AND r.inicio <= ?")
+        parametros = [_livro(m.group(1)), int(m.group(2)), versiculo or 1, versiculo or _FIM_DO_CAPITULO]
+        if parte:
+            sql += " AND t.parte = ?"
+            parametros.append(parte)
+        sql += " ORDER BY t.data DESC LIMIT ?"
+        return self._conexao.execute(sql, (*parametros, limite)).fetchall()
+
+    def _por_texto(self, expressao, parte, limite):
+        sql = ("SELECT t.id, t.data, t.parte, t.cabecalho FROM busca JOIN trechos t ON t.id = busca.rowid "
+               "WHERE busca MATCH ?")
+        parametros = [expressao]
+        if parte:
+            sql += " AND t.parte = ?"
+            parametros.append(parte)
+        sql += " ORDER BY busca.rank LIMIT ?"
+        return self._conexao.execute(sql, (*parametros, limite)).fetchall()
+
+    def _buscar(self, consulta, parte, limite):
+        expressoes, termos = _consultas_fts(consulta)
+        linhas = self._por_referencia(consulta, parte, limite)
+        for expressao in expressoes:
+            if linhas:
+                break
+            linhas = self._por_texto(expressao, parte, limite)
+        resultados = []
+        dias = {}
+        for _, data, parte_linha, cabecalho in linhas or ():
+            # O texto não fica no índice: vem do registro comprimido do dia
+            if data not in dias:
+                dias[data] = {p: t for p, _, t in partes_do_dia(self._ler(data))}
+            texto = dias[data].get(parte_linha, "")
+            resultados.append(Resultado(data, parte_linha, cabecalho, trecho(texto, termos)))
+        return resultados
+
+    def _faltando(self, inicio, fim):
+        existentes = {linha[0] for linha in self._conexao.execute(
+            # Dias parciais contam como faltando: a fonte pode ter a versão completa
+            "SELECT data FROM dias WHERE data BETWEEN ? AND ? AND NOT parcial", (inicio.isoformat(), fim.isoformat())
+        )}
+        return [
+            (inicio + timedelta(days=n)).isoformat() for n in range((fim - inicio).days + 1)
+            if (inicio + timedelta(days=n)).isoformat() not in existentes
+        ]
+
+    def _resumo(self):
+        dias, primeiro, ultimo = self._conexao.execute("SELECT COUNT(*), MIN(data), MAX(data) FROM dias").fetchone()
+        return {"dias": dias, "primeiro": primeiro, "ultimo": ultimo, "bytes": os.path.getsize(self.caminho)}
+
+    async def guardar(self, data, dia):
+        """Acrescenta o dia ao arquivo; False se a data já estava arquivada (e não era parcial)"""
+        return await self.executar(self._guardar, data, dia)
+
+    async def ler(self, data):
+        """Bloco 'dia' arquivado da data (AAAA-MM-DD), ou None"""
+        return await self.executar(self._ler, data)
+
+    async def buscar(self, consulta, parte=None, limite=5):
+        """Referência ("Jo 3,16", "Lc 18") ou palavras ("videira ramos"; entre aspas, a frase exata)"""
+        with span("buscar_arquivo", consulta=consulta):
+            return await self.executar(self._buscar, consulta, parte, limite)
+
+    async def resumo(self):
+        return await self.executar(self._resumo)
+
+    def fechar(self):
+        def fechar():
+            self._conexao.close()
+            self._arquivo.close()
+
+        self._executor.submit(fechar).result()
+        self._executor.shutdown()
+
+
+async def preencher(arquivo, buscar, inicio, fim, concorrencia=CONCORRENCIA):
+    """Busca e arquiva as datas de `inicio` a `fim` que ainda faltam.
+
+    `concorrencia` buscas de cada vez; cada dia é gravado assim que chega,
+    então a memória não depende do tamanho do intervalo.
+    """
+    datas = iter(await arquivo.executar(arquivo._faltando, inicio, fim))
+    contagem = Counter()
+    comeco = time.perf_counter()
+
+    async def trabalhador():
+        # Todos puxam do mesmo iterador: nunca há mais que `concorrencia` pedidos em voo
+        for data in datas:
+            try:
+                dia = await buscar(data)
+                await arquivo.guardar(data, dia)
+                contagem["arquivados"] += 1
+            except Exception as e:
+                contagem["falhas"] += 1
+                log.error("Falha ao arquivar %s: %s", data, e)
+            feitos = contagem["arquivados"] + contagem["falhas"]
+            if feitos % 100 == 0:
+                log.info("%d dias processados (%.1f/s)", feitos, feitos / (time.perf_counter() - comeco))
+
+    await asyncio.gather(*(trabalhador() for _ in range(concorrencia)))
+    return contagem["arquivados"], contagem["falhas"]
+
+
+def _fonte(nome):
+    from fontes_liturgia import FonteApiJson, FonteRss, MotorFontes
+
+    if nome == "api":
+        return FonteApiJson().buscar
+    if nome == "rss":
+        return FonteRss().buscar
+    return MotorFontes([FonteApiJson(), FonteRss()]).buscar
+
+
+async def _preencher_cli(args):
+    from liturgia_api import fechar_sessao
+
+    arquivo = ArquivoLiturgia(args.arquivo, args.indice)
+    try:
+        arquivados, falhas = await preencher(
+            arquivo, _fonte(args.fonte), date.fromisoformat(args.de), date.fromisoformat(args.ate), args.concorrencia
+        )
+        resumo = await arquivo.resumo()
+    finally:
+        await fechar_sessao()
+        arquivo.fechar()
+    print(f"{arquivados} dias arquivados, {falhas} falhas. Arquivo: {resumo['dias']} dias "
+          f"({resumo['primeiro']} a {resumo['ultimo']}), {resumo['bytes'] / 2**20:.1f} MiB")
+
+
+async def _buscar_cli(args):
+    arquivo = ArquivoLiturgia(args.arquivo, args.indice)
+    try:
+        inicio = time.perf_counter()
+        resultados = await arquivo.buscar(args.consulta, args.parte, args.limite)
+        duracao = time.perf_counter() - inicio
+    finally:
+        arquivo.fechar()
+    for r in resultados:
+        print(f"{r.data} · {PARTES[r.parte]} – {r.cabecalho}\n    {r.trecho}")
+    print(f"{len(resultados)} resultados em {duracao * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arquivo local da liturgia: preenchimento e busca")
+    parser.add_argument("--arquivo", default=ARQUIVO)
+    parser.add_argument("--indice", default=INDICE)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    p = comandos.add_parser("preencher", help="Busca e arquiva um intervalo de datas")
+    p.add_argument("--de", required=True, help="Primeira data (AAAA-MM-DD)")
+    p.add_argument("--ate", default=date.today().isoformat(), help="Última data (AAAA-MM-DD)")
+    p.add_argument("--fonte", choices=("api", "rss", "todas"), default="api",
+                   help="O RSS só tem o dia corrente")
+    p.add_argument("--concorrencia", type=int, default=CONCORRENCIA)
+
+    b = comandos.add_parser("buscar", help="Procura por referência ou palavras")
+    b.add_argument("consulta")
+    b.add_argument("--parte", choices=tuple(PARTES))
+    b.add_argument("--limite", type=int, default=5)
+
+    args = parser.parse_args()
+    asyncio.run(_preencher_cli(args) if args.comando == "preencher" else _buscar_cli(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import hashlib
+import os
+import subprocess
+
+import discord
+from discord.oggparse import OggStream
+
+from quadros_opus import LeitorQuadros, abrir_armazem, armazem_disponivel, empacotar
+from telemetria import obter_logger, span
+
+log = obter_logger("audio")
+
+FFMPEG = "./bin/ffmpeg"
+DIRETORIO_CACHE = "audio_cache"
+DIRETORIOS_AUDIO = ("audio", "audio_latim")
+
+# Parâmetros de voz do Discord: 48 kHz, estéreo, quadros de 20 ms
+PARAMETROS_OPUS = [
+    "-vn", "-map_metadata", "-1",
+    "-c:a", "libopus", "-b:a", "96k", "-ar", "48000", "-ac", "2",
+    "-frame_duration", "20", "-application", "audio",
+    "-f", "ogg",
+]
+
+# Caminho do MP3 -> caminho do Ogg/Opus já transcodificado
+_transcodificados = {}
+
+
+def hash_arquivo(caminho, bloco=1 << 20):
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        while parte := f.read(bloco):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def transcodificar(origem, diretorio=DIRETORIO_CACHE, executavel=FFMPEG):
+    """Converte `origem` para Ogg/Opus uma única vez; o cache é indexado pelo hash do conteúdo"""
+    os.makedirs(diretorio, exist_ok=True)
+    destino = os.path.join(diretorio, f"{hash_arquivo(origem)[:32]}.ogg")
+    if os.path.exists(destino):
+        return destino
+    temporario = destino + ".tmp"
+    log.info("Transcodificando %s para Opus...", origem)
+    with span("transcodificar", origem=origem):
+        subprocess.run(
+            [executavel, "-hide_banner", "-loglevel", "error", "-y", "-i", origem, *PARAMETROS_OPUS, temporario],
+            check=True,
+        )
+    os.replace(temporario, destino)
+    return destino
+
+
+def preparar_audios(diretorios=DIRETORIOS_AUDIO, executavel=FFMPEG):
+    """Transcodifica todos os MP3 dos diretórios de áudio (chamar fora do event loop)"""
+    for diretorio in diretorios:
+        # Inclui subdiretórios, como os segmentos do terço em audio/segmentos
+        for raiz, _, nomes in os.walk(diretorio):
+            for nome in sorted(nomes):
+                if not nome.endswith(".mp3"):
+                    continue
+                origem = os.path.join(raiz, nome)
+                try:
+                    _transcodificados[origem] = transcodificar(origem, executavel=executavel)
+                    empacotar(_transcodificados[origem])
+                except (OSError, subprocess.CalledProcessError) as e:
+                    log.error("Falha ao transcodificar %s: %s", origem, e)
+    log.info("%d áudios prontos em Opus.", len(_transcodificados))
+    return dict(_transcodificados)
+
+
+class OpusPassthrough(discord.AudioSource):
+    """Lê os pacotes Opus de um arquivo Ogg e os entrega sem decodificar nem reencodar"""
+
+    def __init__(self, caminho):
+        self._arquivo = open(caminho, "rb")
+        self._pacotes = OggStream(self._arquivo).iter_packets()
+
+    def read(self):
+        for pacote in self._pacotes:
+            # Cabeçalhos do Ogg/Opus não são áudio
+            if pacote.startswith((b"OpusHead", b"OpusTags")):
+                continue
+            return pacote
+        return b""
+
+    def is_opus(self):
+        return True
+
+    def cleanup(self):
+        self._arquivo.close()
+
+
+def opus_em_cache(caminho):
+    opus = _transcodificados.get(caminho)
+    return opus if opus and os.path.exists(opus) else None
+
+
+def armazem_em_cache(caminho):
+    opus = opus_em_cache(caminho)
+    base = os.path.splitext(opus)[0] if opus else None
+    return abrir_armazem(base) if base and armazem_disponivel(base) else None
+
+
+def fonte_opus(caminho):
+    """Quadros mapeados em memória quando houver armazém; senão, lê o Ogg"""
+    armazem = armazem_em_cache(caminho)
+    if armazem is not None:
+        return LeitorQuadros(armazem)
+    return OpusPassthrough(opus_em_cache(caminho))
+
+
+def fonte_audio(caminho, executavel=FFMPEG):
+    """Usa o Opus pré-transcodificado quando houver; senão, o caminho antigo via ffmpeg"""
+    if opus_em_cache(caminho):
+        return fonte_opus(caminho)
+    log.debug("Sem Opus em cache para %s, usando FFmpegPCMAudio", caminho)
+    return discord.FFmpegPCMAudio(executable=executavel, source=caminho)
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from telemetria import obter_logger
+
+log = obter_logger("banco")
+
+DB_FILE = "liturgia.db"
+
+PADRAO = {
+    "canal_texto": None,
+    "canal_voz": None,
+    "horario_liturgia": "08:00",
+    "horario_terco": "18:00",
+    "fuso": "America/Sao_Paulo",
+}
+CAMPOS = tuple(PADRAO)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS guilds (
+    guild_id TEXT PRIMARY KEY,
+    canal_texto TEXT,
+    canal_voz TEXT,
+    horario_liturgia TEXT NOT NULL DEFAULT '08:00',
+    horario_terco TEXT NOT NULL DEFAULT '18:00',
+    fuso TEXT NOT NULL DEFAULT 'America/Sao_Paulo',
+    atualizado REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT);
+"""
+
+
+def load_config(arquivo):
+    if os.path.exists(arquivo):
+        with open(arquivo, "r") as f:
+            return json.load(f)
+    return {}
+
+
+class BancoConfig:
+    """Configuração por guild em SQLite (WAL), com cópia em memória para leitura.
+
+    Toda escrita roda numa única thread fora do event loop; escritas que chegam
+    juntas são gravadas numa só transação. A cópia em memória só muda depois
+    que a transação foi confirmada.
+    """
+
+    def __init__(self, caminho=DB_FILE):
+        self.caminho = caminho
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="banco")
+        self._conexao = None
+        self._pendentes = []
+        self._gravando = False
+        self._tarefas = set()
+        self.guilds = self._executor.submit(self._abrir).result()
+
+    def _abrir(self):
+        self._conexao = sqlite3.connect(self.caminho, check_same_thread=False, isolation_level=None)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(ESQUEMA)
+        cursor = self._conexao.execute(f"SELECT guild_id, {', '.join(CAMPOS)} FROM guilds")
+        return {linha[0]: dict(zip(CAMPOS, linha[1:])) for linha in cursor}
+
+    def executar(self, funcao, *args):
+        """Roda `funcao(conexao, *args)` na thread do banco"""
+        return asyncio.get_running_loop().run_in_executor(self._executor, funcao, self._conexao, *args)
+
+    def migrar_json(self, config_file, config_voz_file=None):
+        """Importa config.json (e config_voz.json) uma única vez"""
+        def migrar(conexao):
+            if conexao.execute("SELECT 1 FROM meta WHERE chave = 'migrado_json'").fetchone():
+                return []
+            linhas = [(g, {"canal_texto": c}) for g, c in load_config(config_file).items()]
+            if config_voz_file:
+                linhas += [(g, {"canal_voz": c}) for g, c in load_config(config_voz_file).items()]
+            conexao.execute("BEGIN IMMEDIATE")
+            try:
+                self._upsert(conexao, linhas)
+                conexao.execute("INSERT INTO meta (chave, valor) VALUES ('migrado_json', ?)", (str(time.time()),))
+                conexao.execute("COMMIT")
+            except Exception:
+                conexao.execute("ROLLBACK")
+                raise
+            return linhas
+
+        for guild_id, campos in self._executor.submit(migrar, self._conexao).result():
+            self.guilds.setdefault(guild_id, dict(PADRAO)).update(campos)
+            log.info("Configuração da guild %s migrada do JSON: %s", guild_id, campos)
+
+    @staticmethod
+    def _upsert(conexao, linhas):
+        agora = time.time()
+        for guild_id, campos in linhas:
+            colunas = list(campos)
+            conexao.execute(
+                f"INSERT INTO guilds (guild_id, {', '.join(colunas)}, atualizado) "
+                f"VALUES (?, {', '.join('?' for _ in colunas)}, ?) "
+                f"ON CONFLICT(guild_id) DO UPDATE SET "
+                f"{', '.join(f'{c} = excluded.{c}' for c in colunas)}, atualizado = excluded.atualizado",
+                (guild_id, *campos.values(), agora),
+            )
+
+    def _gravar_lote(self, conexao, linhas):
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            self._upsert(conexao, linhas)
+            conexao.execute("COMMIT")
+        except Exception:
+            conexao.execute("ROLLBACK")
+            raise
+
+    async def _gravar(self):
+        try:
+            while self._pendentes:
+                lote, self._pendentes = self._pendentes, []
+                try:
+                    await self.executar(self._gravar_lote, [(g, c) for g, c, _ in lote])
+                except Exception as e:
+                    for _, _, futuro in lote:
+                        if not futuro.done():
+                            futuro.set_exception(e)
+                    continue
+                # A memória segue o que foi gravado, mesmo que quem pediu tenha sido cancelado
+                for guild_id, campos, _ in lote:
+                    self.guilds.setdefault(guild_id, dict(PADRAO)).update(campos)
+                for _, _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_result(None)
+        finally:
+            self._gravando = False
+
+    async def definir(self, guild_id, **campos):
+        """Atualiza campos da guild; retorna quando a alteração estiver gravada em disco"""
+        desconhecidos = set(campos) - set(CAMPOS)
+        if desconhecidos:
+            raise ValueError(f"Campos desconhecidos: {', '.join(sorted(desconhecidos))}")
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendentes.append((str(guild_id), campos, futuro))
+        if not self._gravando:
+            self._gravando = True
+            self.em_segundo_plano(self._gravar())
+        await futuro
+
+    def em_segundo_plano(self, coro):
+        """Tarefa de gravação guardada até terminar; `fechar` espera por todas"""
+        tarefa = asyncio.create_task(coro)
+        self._tarefas.add(tarefa)
+        tarefa.add_done_callback(self._tarefas.discard)
+        return tarefa
+
+    def guild(self, guild_id):
+        return self.guilds.get(str(guild_id), PADRAO)
+
+    def canais_texto(self):
+        return {g: c["canal_texto"] for g, c in self.guilds.items() if c["canal_texto"]}
+
+    def canais_voz(self):
+        return {g: c["canal_voz"] for g, c in self.guilds.items() if c["canal_voz"]}
+
+    async def fechar(self):
+        """Espera as gravações pendentes (daqui e do RegistroEntregas) e fecha a conexão"""
+        while self._tarefas:
+            await asyncio.gather(*self._tarefas, return_exceptions=True)
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._conexao.close)
+        self._executor.shutdown()
@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from agenda import Agenda, Diaria
+
+FUSOS = ("America/Sao_Paulo", "America/Manaus", "America/New_York", "Europe/Lisbon", "Europe/Rome",
+         "Africa/Luanda", "Asia/Tokyo", "Australia/Sydney", "Pacific/Auckland", "UTC")
+
+
+def regra_aleatoria(rng):
+    return Diaria((f"{rng.randrange(24):02d}:{rng.randrange(60):02d}",), rng.choice(FUSOS))
+
+
+async def nada(alvos, horario):
+    pass
+
+
+def medir_insercao(entradas, amostra, rng):
+    """µs por agendar() medidos em cada ordem de grandeza do tamanho da agenda"""
+    relogio = [datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp()]
+    agenda = Agenda({"liturgia": nada}, relogio=lambda: relogio[0])
+    regras = [regra_aleatoria(rng) for _ in range(64)]
+    resultados = []
+    tamanho = 1000
+    while tamanho <= entradas:
+        while len(agenda) < tamanho - amostra:
+            agenda.agendar("liturgia", len(agenda), rng.choice(regras))
+        inicio = time.perf_counter()
+        for _ in range(amostra):
+            agenda.agendar("liturgia", len(agenda), rng.choice(regras))
+        resultados.append((len(agenda), (time.perf_counter() - inicio) / amostra * 1e6))
+        tamanho *= 10
+    return agenda, relogio, resultados
+
+
+def medir_disparo(agenda, relogio):
+    """Avança o relógio um dia inteiro: cada entrada dispara uma vez e é reagendada"""
+    fim = relogio[0] + 86400
+    disparos = 0
+    inicio = time.perf_counter()
+    while relogio[0] < fim:
+        relogio[0] += 60
+        disparos += sum(len(alvos) for alvos in agenda.vencidas(limite=10**9).values())
+    return disparos, time.perf_counter() - inicio
+
+
+async def medir_ocioso(entradas, segundos, rng):
+    """CPU do processo com a agenda cheia e nada a disparar durante a medição"""
+    agenda = Agenda({"liturgia": nada})
+    # Horários entre 1h e 23h a partir de agora: nenhum vence durante a medição
+    agora = datetime.now(timezone.utc)
+    for i in range(entradas):
+        horario = (agora + timedelta(minutes=rng.randrange(60, 23 * 60))).time().replace(second=0, microsecond=0)
+        agenda.agendar("liturgia", i, Diaria((horario,), "UTC"))
+    agenda.iniciar()
+    await asyncio.sleep(0.1)
+    cpu, inicio = time.process_time(), time.perf_counter()
+    await asyncio.sleep(segundos)
+    cpu, parede = time.process_time() - cpu, time.perf_counter() - inicio
+    agenda.parar()
+    return len(agenda), cpu, parede
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo da agenda (heap único) com muitas entradas")
+    parser.add_argument("--entradas", type=int, default=100_000)
+    parser.add_argument("--amostra", type=int, default=1000, help="Inserções medidas em cada tamanho")
+    parser.add_argument("--ocioso", type=float, default=5.0, help="Segundos medindo a CPU ociosa")
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    agenda, relogio, insercoes = medir_insercao(args.entradas, args.amostra, rng)
+    print("Inserção (agendar):")
+    for tamanho, micros in insercoes:
+        print(f"  {tamanho:>8} entradas: {micros:6.1f} µs por inserção")
+
+    disparos, duracao = medir_disparo(agenda, relogio)
+    print(f"Disparo: {disparos} disparos em um dia simulado, {duracao / disparos * 1e6:.1f} µs por disparo "
+          f"(retirar + reagendar)")
+
+    inicio = time.perf_counter()
+    for i in range(0, len(agenda), 10):
+        agenda.remover("liturgia", i)
+    remocoes = len(range(0, args.entradas, 10))
+    print(f"Remoção: {(time.perf_counter() - inicio) / remocoes * 1e6:.1f} µs por remoção")
+
+    tamanho, cpu, parede = asyncio.run(medir_ocioso(args.entradas, args.ocioso, rng))
+    print(f"Ocioso: {tamanho} entradas, CPU {cpu * 1000:.1f} ms em {parede:.1f}s "
+          f"({cpu / parede * 100:.3f}% de um núcleo)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# Substitutos locais para medir o bot sem rede: REST do Discord, API da liturgia e RSS,
+# mais fixtures de configuração e de áudio
+import asyncio
+import json
+import multiprocessing
+import os
+from array import array
+from datetime import datetime, timezone
+
+import aiohttp
+from aiohttp import web
+
+from benchmarks.rss import feed_sintetico
+from calendario import MISTERIOS
+
+DADOS = os.path.join(os.path.dirname(__file__), "dados", "liturgia.json")
+# Pacote Opus típico de 20 ms a 96 kb/s
+TAMANHO_QUADRO = 240
+USUARIO = {"id": "1", "username": "liturgia", "discriminator": "0", "avatar": None, "bot": True}
+
+
+def _mensagem(channel_id, corpo, contador):
+    return {
+        "id": str(10**18 + contador),
+        "channel_id": channel_id,
+        "type": 0,
+        "content": corpo.get("content") or "",
+        "embeds": corpo.get("embeds") or [],
+        "attachments": [],
+        "author": USUARIO,
+        "mentions": [],
+        "mention_roles": [],
+        "mention_everyone": False,
+        "pinned": False,
+        "tts": False,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "edited_timestamp": None,
+        "flags": 0,
+        "components": [],
+    }
+
+
+def _json(dados):
+    # O discord.py só decodifica JSON com o Content-Type exato, sem charset
+    return web.Response(body=json.dumps(dados).encode(), content_type="application/json")
+
+
+def criar_app(latencia):
+    """REST do Discord (só o que o bot usa), API JSON da liturgia e feed RSS"""
+    with open(DADOS, encoding="utf-8") as f:
+        dia = json.load(f)
+    rss = feed_sintetico(1)
+    rotas = {}
+    contador = [0]
+
+    def registrar(request):
+        rota = request.match_info.route.resource.canonical
+        chave = f"{request.method} {rota}"
+        rotas[chave] = rotas.get(chave, 0) + 1
+
+    async def eu(request):
+        registrar(request)
+        return _json(USUARIO)
+
+    async def aplicacao(request):
+        registrar(request)
+        return _json({
+            "id": "1", "name": "liturgia", "icon": None, "description": "", "bot_public": True,
+            "bot_require_code_grant": False, "verify_key": "0", "flags": 0, "owner": USUARIO,
+        })
+
+    async def comandos(request):
+        registrar(request)
+        corpo = await request.json()
+        app_id = request.match_info["app_id"]
+        return _json([
+            {**c, "id": str(10**17 + i), "application_id": app_id, "version": "1"} for i, c in enumerate(corpo)
+        ])
+
+    async def enviar(request):
+        registrar(request)
+        corpo = await request.json()
+        await asyncio.sleep(latencia)
+        contador[0] += 1
+        return _json(_mensagem(request.match_info["channel_id"], corpo, contador[0]))
+
+    async def liturgia(request):
+        registrar(request)
+        await asyncio.sleep(latencia)
+        return web.json_response({"today": dia})
+
+    async def feed(request):
+        registrar(request)
+        await asyncio.sleep(latencia)
+        return web.Response(body=rss, content_type="application/rss+xml")
+
+    async def estatisticas(request):
+        return web.json_response(rotas)
+
+    async def zerar(request):
+        rotas.clear()
+        return web.json_response({})
+
+    app = web.Application(client_max_size=2**24)
+    app.router.add_get("/api/v10/users/@me", eu)
+    app.router.add_get("/api/v10/oauth2/applications/@me", aplicacao)
+    app.router.add_put("/api/v10/applications/{app_id}/commands", comandos)
+    app.router.add_post("/api/v10/channels/{channel_id}/messages", enviar)
+    app.router.add_get("/liturgia/", liturgia)
+    app.router.add_get("/rss", feed)
+    app.router.add_get("/_estatisticas", estatisticas)
+    app.router.add_post("/_zerar", zerar)
+    return app
+
+
+def _servir(fila, latencia):
+    async def principal():
+        runner = web.AppRunner(criar_app(latencia), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        fila.put(runner.addresses[0][1])
+        await asyncio.Event().wait()
+
+    asyncio.run(principal())
+
+
+class Substitutos:
+    """Sobe os substitutos num processo separado, para não dividir CPU com o bot medido"""
+
+    def __init__(self, latencia=0.05):
+        self.latencia = latencia
+        self.processo = None
+        self.porta = None
+
+    def __enter__(self):
+        fila = multiprocessing.Queue()
+        self.processo = multiprocessing.Process(target=_servir, args=(fila, self.latencia), daemon=True)
+        self.processo.start()
+        self.porta = fila.get(timeout=10)
+        return self
+
+    def __exit__(self, *erro):
+        self.processo.terminate()
+        self.processo.join()
+
+    @property
+    def base(self):
+        return f"http://127.0.0.1:{self.porta}"
+
+    def ambiente(self):
+        """Variáveis de ambiente para o bot usar os substitutos"""
+        return {
+            "LITURGIA_API_URL": f"{self.base}/liturgia/",
+            "LITURGIA_RSS_URL": f"{self.base}/rss",
+            "DISCORD_API_BASE": f"{self.base}/api/v10",
+        }
+
+    async def _pedir(self, metodo, caminho):
+        async with aiohttp.ClientSession() as sessao:
+            async with sessao.request(metodo, self.base + caminho) as resp:
+                return await resp.json()
+
+    def estatisticas(self):
+        return asyncio.run(self._pedir("GET", "/_estatisticas"))
+
+    def zerar(self):
+        asyncio.run(self._pedir("POST", "/_zerar"))
+
+
+def criar_config(caminho_banco, guilds, inicio=10**17):
+    """Banco com N guilds, cada uma com canal de texto e de voz"""
+    from banco_config import BancoConfig
+
+    banco = BancoConfig(caminho_banco)
+    linhas = [
+        (str(inicio + i), {"canal_texto": str(inicio + 10**6 + i), "canal_voz": str(inicio + 2 * 10**6 + i)})
+        for i in range(guilds)
+    ]
+    banco._executor.submit(banco._gravar_lote, banco._conexao, linhas).result()
+    asyncio.run(banco.fechar())
+
+
+def criar_audios(pasta, minutos=20):
+    """Áudios de exemplo já "transcodificados": um armazém de quadros por mistério.
+
+    Devolve {mp3: ogg} no formato de audio_opus._transcodificados. Os quadros são
+    bytes aleatórios do tamanho de um pacote Opus real; o bot só os repassa.
+    """
+    quadros = minutos * 60 * 50
+    mapa = {}
+    os.makedirs(os.path.join(pasta, "audio_cache"), exist_ok=True)
+    for diretorio in ("audio", "audio_latim"):
+        os.makedirs(os.path.join(pasta, diretorio), exist_ok=True)
+        for tipo in MISTERIOS:
+            mp3 = f"{diretorio}/{tipo}.mp3"
+            open(os.path.join(pasta, mp3), "wb").close()
+            base = os.path.join("audio_cache", f"{diretorio}_{tipo}")
+            with open(os.path.join(pasta, base + ".quadros"), "wb") as f:
+                f.write(os.urandom(TAMANHO_QUADRO) * quadros)
+            with open(os.path.join(pasta, base + ".idx"), "wb") as f:
+                array("Q", range(0, (quadros + 1) * TAMANHO_QUADRO, TAMANHO_QUADRO)).tofile(f)
+            open(os.path.join(pasta, base + ".ogg"), "wb").close()
+            mapa[mp3] = base + ".ogg"
+    with open(os.path.join(pasta, "audios.json"), "w") as f:
+        json.dump(mapa, f)
+    return mapa
+
@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import re
+import tempfile
+import time
+from datetime import date
+
+from arquivo_liturgia import ArquivoLiturgia, preencher
+from benchmarks.falsos import percentil
+from voz import rss_processo
+
+DADOS = os.path.join(os.path.dirname(__file__), "dados", "liturgia.json")
+# Vocabulário com frequências de Zipf, como num texto real: poucas palavras comuns, muitas raras
+PALAVRAS = 20000
+SILABAS = ("ra", "me", "to", "li", "sa", "cor", "de", "mi", "nu", "po", "ves", "ta", "gra", "ção", "lu", "ben")
+LIVROS = ("Ex", "Is", "Jr", "Ez", "Rm", "1Cor", "2Tm", "Hb", "Ap", "At")
+EVANGELHOS = ("Mt", "Mc", "Lc", "Jo")
+
+
+def carregar_dia():
+    with open(DADOS, encoding="utf-8") as f:
+        dia = json.load(f)
+    return dia.get("today", dia)
+
+
+class Sintetico:
+    """Dias variados a partir do exemplo: textos sorteados e referências diferentes"""
+
+    def __init__(self, semente=1):
+        self.base = carregar_dia()
+        self.rng = random.Random(semente)
+        reais = sorted(set(re.findall(r"[^\W\d_]{4,}", json.dumps(self.base, ensure_ascii=False))))
+        inventadas = {"".join(self.rng.choices(SILABAS, k=self.rng.randrange(2, 5))) for _ in range(PALAVRAS)}
+        self.vocabulario = reais + sorted(inventadas - set(reais))
+        self.pesos = [1 / (n + 1) for n in range(len(self.vocabulario))]
+        # Alguns evangelhos gerados, para citar versículos nas buscas
+        self.evangelhos = []
+
+    def _texto(self, palavras):
+        return " ".join(self.rng.choices(self.vocabulario, self.pesos, k=palavras)) + "."
+
+    def citacao(self, rng, palavras=4):
+        """Palavras seguidas de um evangelho já gerado, como quem procura um versículo"""
+        texto = rng.choice(self.evangelhos).split()
+        inicio = rng.randrange(len(texto) - palavras)
+        return " ".join(texto[inicio:inicio + palavras]).rstrip(".")
+
+    def _referencia(self, livros):
+        inicio = self.rng.randrange(1, 30)
+        return f"({self.rng.choice(livros)} {self.rng.randrange(1, 28)},{inicio}-{inicio + self.rng.randrange(3, 15)})"
+
+    async def __call__(self, data):
+        dia = copy.deepcopy(self.base)
+        leituras = dia["readings"]
+        leituras["first_reading"]["head"] = f"Primeira leitura {self._referencia(LIVROS)}"
+        leituras["first_reading"]["text"] = self._texto(250)
+        leituras["second_reading"]["head"] = f"Segunda leitura {self._referencia(LIVROS)}"
+        leituras["second_reading"]["text"] = self._texto(250)
+        leituras["gospel"]["head_title"] = f"Evangelho {self._referencia(EVANGELHOS)}"
+        leituras["gospel"]["text"] = self._texto(300)
+        if len(self.evangelhos) < 1000:
+            self.evangelhos.append(leituras["gospel"]["text"])
+        return dia
+
+
+async def medir_buscas(arquivo, consultas):
+    tempos = []
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        await arquivo.buscar(consulta)
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+async def rodar(args, pasta):
+    arquivo = ArquivoLiturgia(os.path.join(pasta, "a.bin"), os.path.join(pasta, "a.db"))
+    fonte = Sintetico()
+    rng = random.Random(2)
+    bruto = len(json.dumps(await fonte(None), ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    inicio_datas = date(2000, 1, 1)
+    rss_inicial = rss_processo()
+    print(f"{'anos':>5} {'dias':>6} {'dias/s':>8} {'arquivo':>9} {'índice':>9} {'compressão':>10} "
+          f"{'citação p50/p99':>15} {'ref. p50/p99':>14} {'RSS':>9}")
+    for ano in range(1, args.anos + 1):
+        fim = date(inicio_datas.year + ano - 1, 12, 31)
+        comeco = time.perf_counter()
+        arquivados, _ = await preencher(arquivo, fonte, inicio_datas, fim, args.concorrencia)
+        taxa = arquivados / (time.perf_counter() - comeco)
+        if ano not in (1, 2, 5) and ano % 10 and ano != args.anos:
+            continue
+        palavras = [fonte.citacao(rng) for _ in range(args.buscas)]
+        refs = [f"{rng.choice(EVANGELHOS)} {rng.randrange(1, 28)},{rng.randrange(1, 30)}" for _ in range(args.buscas)]
+        texto = await medir_buscas(arquivo, palavras)
+        referencia = await medir_buscas(arquivo, refs)
+        resumo = await arquivo.resumo()
+        indice = sum(os.path.getsize(os.path.join(pasta, n)) for n in os.listdir(pasta) if n.startswith("a.db"))
+        print(f"{ano:>5} {resumo['dias']:>6} {taxa:>8.0f} {resumo['bytes'] / 2**20:>7.1f}MB {indice / 2**20:>7.1f}MB "
+              f"{bruto * resumo['dias'] / resumo['bytes']:>9.1f}x "
+              f"{percentil(texto, 50) * 1000:>6.2f}/{percentil(texto, 99) * 1000:<6.2f}ms "
+              f"{percentil(referencia, 50) * 1000:>5.2f}/{percentil(referencia, 99) * 1000:<5.2f}ms "
+              f"{(rss_processo() - rss_inicial) / 2**20:>+7.1f}MB")
+    arquivo.fechar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arquivo da liturgia: gravação, tamanho, busca e memória por anos")
+    parser.add_argument("--anos", type=int, default=20)
+    parser.add_argument("--buscas", type=int, default=200, help="Buscas medidas em cada ponto")
+    parser.add_argument("--concorrencia", type=int, default=4)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as pasta:
+        asyncio.run(rodar(args, pasta))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import discord
+
+from audio_opus import FFMPEG, OpusPassthrough, transcodificar
+
+
+def consumir(fonte, codificar):
+    # Lê todos os quadros como o player do discord.py faria (sem o ritmo de 20 ms)
+    encoder = discord.opus.Encoder() if codificar else None
+    quadros = 0
+    while quadro := fonte.read():
+        if encoder:
+            encoder.encode(quadro, encoder.SAMPLES_PER_FRAME)
+        quadros += 1
+    fonte.cleanup()
+    return quadros
+
+
+def medir(modo, caminho, executavel):
+    """Executado num processo filho, para isolar CPU e RSS de cada caminho"""
+    if modo == "pcm":
+        fonte = discord.FFmpegPCMAudio(executable=executavel, source=caminho)
+        codificar = True
+    else:
+        fonte = OpusPassthrough(transcodificar(caminho, executavel=executavel))
+        codificar = False
+    inicio = time.perf_counter()
+    quadros = consumir(fonte, codificar)
+    proprio = resource.getrusage(resource.RUSAGE_SELF)
+    filhos = resource.getrusage(resource.RUSAGE_CHILDREN)
+    print(json.dumps({
+        "modo": modo,
+        "quadros": quadros,
+        "tempo": time.perf_counter() - inicio,
+        "cpu": proprio.ru_utime + proprio.ru_stime + filhos.ru_utime + filhos.ru_stime,
+        "rss_kb": proprio.ru_maxrss,
+        "rss_filhos_kb": filhos.ru_maxrss,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU e RSS: FFmpegPCMAudio + Opus encoder vs passthrough de Opus")
+    parser.add_argument("caminho", help="MP3 de exemplo, ex.: audio/gloriosos.mp3")
+    parser.add_argument("--ffmpeg", default=FFMPEG)
+    parser.add_argument("--modo", choices=["pcm", "opus"])
+    args = parser.parse_args()
+
+    if args.modo:
+        medir(args.modo, args.caminho, args.ffmpeg)
+        return
+
+    # Garante o Opus em cache antes de medir, para não contar a transcodificação
+    transcodificar(args.caminho, executavel=args.ffmpeg)
+    for modo in ("pcm", "opus"):
+        saida = subprocess.run(
+            [sys.executable, "-m", "benchmarks.audio", args.caminho, "--ffmpeg", args.ffmpeg, "--modo", modo],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        r = json.loads(saida.strip().splitlines()[-1])
+        print(f"{r['modo']:>5}: {r['quadros']} quadros, CPU {r['cpu']:.2f}s, "
+              f"RSS {r['rss_kb'] / 1024:.1f} MB (+ffmpeg {r['rss_filhos_kb'] / 1024:.1f} MB), {r['tempo']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from banco_config import BancoConfig
+from benchmarks.falsos import percentil
+
+
+async def medir_atraso(parar, atrasos, intervalo=0.005):
+    # Mede o atraso do event loop: quanto um sleep curto demora além do pedido
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(intervalo)
+        atrasos.append(time.perf_counter() - inicio - intervalo)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Carga de !definir simultâneos no banco de configuração")
+    parser.add_argument("--chamadas", type=int, default=5000)
+    parser.add_argument("--guilds", type=int, default=500, help="Menos guilds que chamadas força escritas concorrentes na mesma guild")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "carga.db")
+        banco = BancoConfig(caminho)
+        esperado = {}
+        chamadas = []
+        for i in range(args.chamadas):
+            guild = str(random.randrange(args.guilds))
+            canal = str(10**6 + i)
+            esperado[guild] = canal  # a última chamada criada para a guild deve prevalecer
+            chamadas.append(banco.definir(guild, canal_texto=canal))
+
+        parar, atrasos = asyncio.Event(), []
+        monitor = asyncio.create_task(medir_atraso(parar, atrasos))
+        inicio = time.perf_counter()
+        await asyncio.gather(*chamadas)
+        duracao = time.perf_counter() - inicio
+        parar.set()
+        await monitor
+        await banco.fechar()
+
+        # Confere em disco, com uma conexão nova, que nenhuma atualização se perdeu
+        gravado = dict(sqlite3.connect(caminho).execute("SELECT guild_id, canal_texto FROM guilds"))
+        perdidas = {g for g, c in esperado.items() if gravado.get(g) != c}
+        print(f"{args.chamadas} chamadas em {len(esperado)} guilds: {duracao:.2f}s "
+              f"({args.chamadas / duracao:.0f}/s), atualizações perdidas: {len(perdidas)}")
+        print(f"atraso do loop: p50={percentil(atrasos, 50) * 1000:.2f}ms "
+              f"p99={percentil(atrasos, 99) * 1000:.2f}ms max={max(atrasos, default=0) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
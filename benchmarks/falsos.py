@@ -0,0 +1,61 @@
+import asyncio
+import random
+
+
+class CanalFalso:
+    """Imita um discord.TextChannel: cada send custa uma latência de rede simulada"""
+
+    def __init__(self, channel_id, latencia=0.05, variacao=0.03, lentos=0.01):
+        self.id = channel_id
+        self.name = f"canal-{channel_id}"
+        self.latencia = latencia
+        self.variacao = variacao
+        self.lentos = lentos
+        self.recebidas = []
+
+    async def send(self, content=None, **kwargs):
+        espera = self.latencia + random.uniform(0, self.variacao)
+        # Uma pequena fração de canais responde bem mais devagar
+        if random.random() < self.lentos:
+            espera *= 20
+        await asyncio.sleep(espera)
+        self.recebidas.append((content, kwargs))
+
+
+class GravadorRotas:
+    """Registra cada requisição HTTP que o discord.py faria (método, rota, tamanho do corpo)"""
+
+    def __init__(self):
+        self.requisicoes = []
+
+    def canal(self, channel_id, **kwargs):
+        return CanalGravado(self, channel_id, **kwargs)
+
+    def por_rota(self):
+        contagem = {}
+        for metodo, rota, _ in self.requisicoes:
+            contagem[(metodo, rota)] = contagem.get((metodo, rota), 0) + 1
+        return contagem
+
+
+class CanalGravado(CanalFalso):
+    def __init__(self, gravador, channel_id, **kwargs):
+        super().__init__(channel_id, **kwargs)
+        self.gravador = gravador
+
+    async def send(self, content=None, **kwargs):
+        embeds = kwargs.get("embeds") or ([kwargs["embed"]] if kwargs.get("embed") else [])
+        corpo = len(content or "") + sum(len(e.to_dict().get("description") or "") for e in embeds)
+        self.gravador.requisicoes.append(("POST", f"/channels/{self.id}/messages", corpo))
+        await super().send(content, **kwargs)
+
+
+def config_sintetica(n, inicio=10**17):
+    return {str(inicio + i): str(inicio + 10**6 + i) for i in range(n)}
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
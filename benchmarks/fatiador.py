@@ -0,0 +1,86 @@
+import argparse
+import time
+
+from fatiador import LIMITE_MENSAGEM, agrupar, dividir, montar_embeds
+
+FRASE = "Naquele tempo, disse Jesus aos seus discípulos: Eu sou a videira e vós os ramos. "
+
+
+def leitura_longa(caracteres):
+    # Parágrafos de tamanhos variados, como nas leituras da Vigília Pascal
+    paragrafos, total, i = [], 0, 0
+    while total < caracteres:
+        paragrafo = FRASE * (3 + i % 7)
+        paragrafos.append(paragrafo.strip())
+        total += len(paragrafo) + 2
+        i += 1
+    return "\n\n".join(paragrafos)
+
+
+def dividir_bloco_em_mensagens(titulo, texto, emoji, limite=2000):
+    # Versão antiga de bot.py, mantida aqui só para comparação
+    if not texto:
+        return []
+    header = f"{emoji} {titulo}:\n"
+    blocos = []
+    paragrafos = texto.split('\\n')
+    bloco_atual = header
+    header_usado = False
+    for p in paragrafos:
+        p = p.strip()
+        if not p:
+            continue
+        while len(p) > (limite if header_usado else limite - len(header)):
+            parte = p[:(limite if header_usado else limite - len(header))]
+            if not header_usado:
+                bloco_atual += parte
+                blocos.append(bloco_atual.strip())
+                bloco_atual = ''
+                header_usado = True
+            else:
+                blocos.append(parte)
+            p = p[(limite if header_usado else limite - len(header)):]
+        if len(bloco_atual) + len(p) + 1 > limite:
+            blocos.append(bloco_atual.strip())
+            bloco_atual = ''
+            header_usado = True
+        if bloco_atual:
+            bloco_atual += '\\n' + p
+        else:
+            bloco_atual = p
+    if bloco_atual.strip():
+        blocos.append(bloco_atual.strip())
+    return blocos
+
+
+def medir(funcao, repeticoes):
+    inicio = time.process_time()
+    for _ in range(repeticoes):
+        resultado = funcao()
+    return resultado, (time.process_time() - inicio) / repeticoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fatiamento de leituras longas em mensagens do Discord")
+    parser.add_argument("--caracteres", type=int, nargs="+", default=[1000, 10000, 50000, 200000])
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'caracteres':>10} {'antigo (ms)':>12} {'msgs':>5} {'texto (ms)':>11} {'msgs':>5} "
+          f"{'embeds (ms)':>12} {'embeds':>7} {'msgs':>5}")
+    for n in args.caracteres:
+        texto = leitura_longa(n)
+        antigo, t_antigo = medir(lambda: dividir_bloco_em_mensagens("Leitura", texto, "📖"), args.repeticoes)
+        partes, t_partes = medir(lambda: dividir(texto, LIMITE_MENSAGEM), args.repeticoes)
+        embeds, t_embeds = medir(
+            lambda: montar_embeds({"title": "📜 Proclamação da Liturgia", "footer": {"text": "rodapé"}},
+                                  "", [("📖 Leitura", texto)]),
+            args.repeticoes,
+        )
+        assert "".join(texto.split()) == "".join("".join(partes).split())
+        print(f"{n:>10} {t_antigo * 1000:>12.2f} {len(antigo):>5} {t_partes * 1000:>11.2f} {len(partes):>5} "
+              f"{t_embeds * 1000:>12.2f} {len(embeds):>7} {len(agrupar(embeds)):>5}")
+
+
+if __name__ == "__main__":
+    main()
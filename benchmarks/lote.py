@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+import json
+import os
+
+from benchmarks.falsos import GravadorRotas, config_sintetica, percentil
+from conteudo_dia import renderizar_dia
+from transmissao import Transmissor
+
+DADOS = os.path.join(os.path.dirname(__file__), "dados", "liturgia.json")
+
+
+def carregar_conteudo():
+    with open(DADOS, encoding="utf-8") as f:
+        dia = json.load(f)
+    return renderizar_dia(dia.get("today", dia), "2026-10-19")
+
+
+async def transmitir(conteudo, config, agrupado, concorrencia):
+    gravador = GravadorRotas()
+    destinos = [(g, c, gravador.canal(c, lentos=0)) for g, c in config.items()]
+
+    def montar(guild_id, channel_id, channel):
+        if agrupado:
+            return conteudo.mensagens("Capela")
+        # Caminho antigo: uma mensagem (e uma requisição) por tipo
+        return [m for tipo in conteudo.tipos for m in conteudo.mensagens("Capela", (tipo,))]
+
+    relatorio = await Transmissor(concorrencia, None).transmitir(destinos, montar)
+    return gravador, relatorio
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Requisições HTTP por transmissão: um tipo por mensagem vs embeds agrupados")
+    parser.add_argument("--guilds", type=int, default=1000)
+    parser.add_argument("--concorrencia", type=int, default=25)
+    args = parser.parse_args()
+
+    conteudo = carregar_conteudo()
+    config = config_sintetica(args.guilds)
+    print(f"{'modo':>10} {'requisições':>12} {'por guild':>10} {'rotas':>6} {'tempo (s)':>10} {'p99 (ms)':>9}")
+    for nome, agrupado in (("por tipo", False), ("agrupado", True)):
+        gravador, relatorio = await transmitir(conteudo, config, agrupado, args.concorrencia)
+        duracoes = [r.duracao for r in relatorio.resultados]
+        total = len(gravador.requisicoes)
+        print(f"{nome:>10} {total:>12} {total / args.guilds:>10.1f} {len(gravador.por_rota()):>6} "
+              f"{relatorio.duracao:>10.2f} {percentil(duracoes, 99) * 1000:>9.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
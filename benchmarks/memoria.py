@@ -0,0 +1,170 @@
+import argparse
+import asyncio
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from discord.user import ClientUser
+
+from benchmarks.ambiente import USUARIO
+from gateway import criar_cliente
+from voz import rss_processo
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PERFIS = ("completo", "minimo")
+AGORA = datetime.now(timezone.utc).isoformat()
+
+
+def _usuario(user_id):
+    return {"id": str(user_id), "username": f"membro{user_id}", "discriminator": "0", "avatar": None}
+
+
+def _membro(user_id):
+    return {"user": _usuario(user_id), "roles": [], "joined_at": AGORA, "deaf": False, "mute": False, "flags": 0}
+
+
+def guild_create(i, intents, texto=30, voz=5, categorias=4, cargos=20, emojis=25, em_voz=3, threads=5):
+    """GUILD_CREATE sintético, como o gateway mandaria para uma guild média com esses intents"""
+    base = 10**17 + i * 10**4
+    ids = iter(range(base + 1, base + 10**4))
+
+    def canal(tipo, nome, pai=None, **extra):
+        return {
+            "id": str(next(ids)), "type": tipo, "guild_id": str(base), "name": nome, "position": 0,
+            "parent_id": str(pai) if pai else None, "nsfw": False,
+            "permission_overwrites": [
+                {"id": str(base), "type": 0, "allow": "0", "deny": "1024"},
+                {"id": str(base + 1), "type": 0, "allow": "1024", "deny": "0"},
+            ],
+            **extra,
+        }
+
+    grupos = [canal(4, f"categoria-{k}") for k in range(categorias)]
+    pais = [int(c["id"]) for c in grupos]
+    textos = [
+        canal(0, f"texto-{k}", pais[k % categorias], topic="Canal de conversa " * 3, last_message_id=None,
+              rate_limit_per_user=0)
+        for k in range(texto)
+    ]
+    vozes = [canal(2, f"voz-{k}", pais[k % categorias], bitrate=64000, user_limit=0, rtc_region=None)
+             for k in range(voz)]
+    membros = [_membro(USUARIO["id"])]
+    estados = []
+    if intents.voice_states:
+        for k in range(em_voz):
+            user_id = next(ids)
+            membros.append(_membro(user_id))
+            estados.append({
+                "user_id": str(user_id), "channel_id": vozes[0]["id"], "session_id": "s", "deaf": False,
+                "mute": False, "self_deaf": False, "self_mute": False, "self_video": False, "suppress": False,
+            })
+    return {
+        "id": str(base), "name": f"guild-{i}", "icon": None, "owner_id": str(base + 2), "features": [],
+        "member_count": 500, "large": False, "unavailable": False, "joined_at": AGORA,
+        "verification_level": 0, "default_message_notifications": 0, "explicit_content_filter": 0,
+        "mfa_level": 0, "premium_tier": 0, "preferred_locale": "pt-BR", "system_channel_flags": 0,
+        "roles": [
+            {"id": str(base if k == 0 else next(ids)), "name": f"cargo-{k}", "color": 0, "hoist": False,
+             "position": k, "permissions": "104324673", "managed": False, "mentionable": False}
+            for k in range(cargos)
+        ],
+        "emojis": [
+            {"id": str(next(ids)), "name": f"emoji{k}", "roles": [], "require_colons": True, "managed": False,
+             "animated": False, "available": True}
+            for k in range(emojis)
+        ],
+        "stickers": [],
+        "channels": grupos + textos + vozes,
+        "threads": [
+            {"id": str(next(ids)), "type": 11, "guild_id": str(base), "parent_id": textos[k]["id"],
+             "owner_id": str(base + 2), "name": f"thread-{k}", "member_count": 2, "message_count": 10,
+             "thread_metadata": {"archived": False, "auto_archive_duration": 1440,
+                                 "archive_timestamp": AGORA, "locked": False}}
+            for k in range(threads)
+        ],
+        "members": membros,
+        "voice_states": estados,
+        "presences": [],
+    }
+
+
+def message_create(guild, k):
+    canal = next(c for c in guild["channels"] if c["type"] == 0)
+    autor = _usuario(int(guild["owner_id"]))
+    return {
+        "id": str(10**18 + k), "channel_id": canal["id"], "guild_id": guild["id"], "author": autor,
+        "member": {"roles": [], "joined_at": AGORA, "deaf": False, "mute": False, "flags": 0},
+        # Sem message_content o conteúdo chega vazio, mas a mensagem ainda ocupa o cache
+        "content": "", "timestamp": AGORA, "edited_timestamp": None, "tts": False,
+        "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [], "embeds": [],
+        "pinned": False, "type": 0,
+    }
+
+
+async def alimentar(perfil, guilds, mensagens):
+    """Gateway substituto: entrega GUILD_CREATE (e MESSAGE_CREATE, se o intent pedir) ao estado do cliente"""
+    cliente = criar_cliente(shards="", perfil=perfil)
+    await cliente._async_setup_hook()
+    estado = cliente._connection
+    estado.user = ClientUser(state=estado, data=USUARIO)
+    intents = estado.intents
+
+    gc.collect()
+    antes = rss_processo()
+    inicio = time.perf_counter()
+    ultima = None
+    for i in range(guilds):
+        # O payload é descartado logo após o parse, como faria o gateway
+        ultima = guild_create(i, intents)
+        estado.parse_guild_create(ultima)
+        if i % 100 == 99:
+            # Deixa rodar os eventos despachados (on_guild_available, que poda o cache)
+            await asyncio.sleep(0)
+    if intents.guild_messages:
+        for k in range(mensagens):
+            estado.parse_message_create(message_create(ultima, k))
+    await asyncio.sleep(0)
+    duracao = time.perf_counter() - inicio
+    gc.collect()
+    depois = rss_processo()
+
+    return {
+        "guilds": len(cliente.guilds),
+        "canais": sum(len(g.channels) for g in cliente.guilds),
+        "threads": sum(len(g.threads) for g in cliente.guilds),
+        "membros": sum(len(g.members) for g in cliente.guilds),
+        "emojis": len(cliente.emojis),
+        "mensagens": len(cliente.cached_messages),
+        "rss_por_1k_guilds": (depois - antes) * 1000 / guilds,
+        "parse": duracao,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória do cache do discord.py por perfil, com um gateway substituto")
+    parser.add_argument("--guilds", type=int, default=5000)
+    parser.add_argument("--mensagens", type=int, default=1000, help="MESSAGE_CREATE recebidos (só no perfil que os pede)")
+    parser.add_argument("--perfil", choices=PERFIS, help="Mede um perfil só (usado nos subprocessos)")
+    args = parser.parse_args()
+
+    if args.perfil:
+        print(json.dumps(asyncio.run(alimentar(args.perfil, args.guilds, args.mensagens))))
+        return
+
+    # Um processo por perfil, para o RSS de um não contaminar o outro
+    for perfil in PERFIS:
+        comando = [sys.executable, "-m", "benchmarks.memoria", "--perfil", perfil,
+                   "--guilds", str(args.guilds), "--mensagens", str(args.mensagens)]
+        saida = subprocess.run(comando, cwd=RAIZ, capture_output=True, text=True, check=True).stdout
+        r = json.loads(saida.strip().splitlines()[-1])
+        print(f"{perfil:>8}: {r['rss_por_1k_guilds'] / 2**20:6.1f} MiB por 1k guilds  "
+              f"({r['guilds']} guilds, {r['canais']} canais, {r['threads']} threads, {r['membros']} membros, "
+              f"{r['emojis']} emojis, {r['mensagens']} mensagens; parse {r['parse']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import json
+import os
+import time
+from datetime import date
+
+import discord
+
+from calendario import calendario
+from conteudo_dia import aviso_latim, embed_liturgia, embed_terco, limpar_html, renderizar_dia
+
+DADOS = os.path.join(os.path.dirname(__file__), "dados", "liturgia.json")
+
+
+def carregar_dia():
+    with open(DADOS, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def por_canal(dia, canais):
+    # Caminho antigo: meditação e terço montados de novo para cada canal
+    liturgia = [discord.Embed.from_dict(e) for e in embed_liturgia(dia, "2026-10-19")]
+    for _ in range(canais):
+        meditacao = "\n".join([limpar_html(l) for l in dia["extra"] if l.strip()])
+        discord.Embed(title="🕊️ Meditação do Dia", description=meditacao, color=0x7FDBFF)
+        terco = embed_terco(calendario.dia(date(2026, 10, 18)))[-1]
+        terco["fields"].append(aviso_latim("Capela"))
+        discord.Embed.from_dict(terco)
+        for embed in liturgia:
+            embed.to_dict()
+
+
+def por_dia(dia, canais):
+    conteudo = renderizar_dia(dia, "2026-10-19")
+    for _ in range(canais):
+        for _, mensagem in conteudo.mensagens("Capela"):
+            for embed in mensagem["embeds"]:
+                embed.to_dict()
+
+
+def medir(funcao, dia, canais):
+    inicio = time.process_time()
+    funcao(dia, canais)
+    return time.process_time() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de CPU para renderizar uma transmissão")
+    parser.add_argument("--canais", type=int, nargs="+", default=[1, 10, 100, 1000])
+    args = parser.parse_args()
+
+    dia = carregar_dia()
+    print(f"{'canais':>8} {'por canal (ms)':>16} {'por dia (ms)':>14}")
+    for n in args.canais:
+        antes = medir(por_canal, dia, n)
+        depois = medir(por_dia, dia, n)
+        print(f"{n:>8} {antes * 1000:>16.1f} {depois * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from rss_liturgia import ler_primeiro_item
+
+DESCRICAO = "<p>Leitura do Livro do Profeta Isaías &mdash; " + "Naquele tempo, disse Jesus aos seus discípulos. " * 40 + "</p>"
+
+
+def feed_sintetico(itens):
+    partes = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>',
+        "<title>Palavra do Dia</title><link>https://www.vaticannews.va/pt.html</link>",
+    ]
+    for i in range(itens):
+        partes.append(
+            f"<item><title>Palavra do Dia {i}</title>"
+            f"<pubDate>Sun, 18 Oct 2026 00:00:00 +0200</pubDate>"
+            f"<description><![CDATA[{DESCRICAO}]]></description></item>"
+        )
+    partes.append("</channel></rss>")
+    return "".join(partes).encode("utf-8")
+
+
+def ler_com_bs4(conteudo):
+    # Caminho antigo: o documento inteiro vira uma árvore antes de achar o primeiro item
+    soup = BeautifulSoup(conteudo, "xml")
+    item = soup.find("item")
+    return {
+        "titulo": item.title.text,
+        "pubdate": item.pubDate.text,
+        "descricao": item.description.text,
+    }
+
+
+def medir(funcao, conteudo):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    item = funcao(conteudo)
+    duracao = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return item, duracao, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parser do RSS: BeautifulSoup vs leitura incremental")
+    parser.add_argument("--itens", type=int, nargs="+", default=[1, 100, 1000, 5000])
+    args = parser.parse_args()
+
+    print(f"{'itens':>6} {'feed (KiB)':>11} {'bs4 (ms)':>10} {'bs4 pico (KiB)':>15} "
+          f"{'incr. (ms)':>11} {'incr. pico (KiB)':>17}")
+    for n in args.itens:
+        conteudo = feed_sintetico(n)
+        antigo, t_antigo, m_antigo = medir(ler_com_bs4, conteudo)
+        novo, t_novo, m_novo = medir(ler_primeiro_item, conteudo)
+        assert antigo == novo, (antigo, novo)
+        print(f"{n:>6} {len(conteudo) / 1024:>11.0f} {t_antigo * 1000:>10.1f} {m_antigo / 1024:>15.0f} "
+              f"{t_novo * 1000:>11.2f} {m_novo / 1024:>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import json
+import os
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks.rss import DESCRICAO
+from texto_html import limpar_html
+
+DADOS = os.path.join(os.path.dirname(__file__), "dados", "liturgia.json")
+
+
+def limpar_html_bs4(texto):
+    # Versão antiga: uma árvore BeautifulSoup por string
+    soup = BeautifulSoup(texto, "html.parser")
+    text = soup.get_text(separator=" ")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def amostras():
+    with open(DADOS, encoding="utf-8") as f:
+        dia = json.load(f)
+    dia = dia.get("today", dia)
+    textos = [dia["entry_title"], *[l for l in dia["extra"] if l.strip()]]
+    textos.append(DESCRICAO * 10)
+    return textos
+
+
+def medir(funcao, textos, repeticoes):
+    inicio = time.process_time()
+    for _ in range(repeticoes):
+        for texto in textos:
+            funcao(texto)
+    return time.process_time() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conversão HTML -> texto: BeautifulSoup vs texto_html")
+    parser.add_argument("--repeticoes", type=int, default=200)
+    args = parser.parse_args()
+
+    textos = amostras()
+    tamanho = sum(len(t) for t in textos)
+    antigo = medir(limpar_html_bs4, textos, args.repeticoes)
+    novo = medir(limpar_html, textos, args.repeticoes)
+    total = len(textos) * args.repeticoes
+    print(f"{total} strings ({tamanho / 1024:.0f} KiB por rodada)")
+    print(f"BeautifulSoup: {antigo * 1000:8.1f} ms ({antigo / total * 1e6:7.1f} µs/string)")
+    print(f"texto_html:    {novo * 1000:8.1f} ms ({novo / total * 1e6:7.1f} µs/string)")
+    print(f"ganho: {antigo / novo:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
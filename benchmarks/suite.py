@@ -0,0 +1,221 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from benchmarks.ambiente import Substitutos, criar_audios, criar_config
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CENARIOS = ("inicio", "liturgia", "liturgia_cache", "terco_audio", "terco_latim")
+TOKEN_FALSO = "benchmark.token.falso"
+
+
+# --- Processo filho: importa o bot contra os substitutos e mede um cenário ---
+
+async def conectar(bot):
+    """Login no REST substituto; canais viram PartialMessageable, sem gateway nem cache"""
+    import discord
+
+    await bot.client.login(TOKEN_FALSO)
+    guild_do_canal = {int(c): int(g) for g, c in bot.banco.canais_texto().items()}
+    canais_voz = {int(c) for c in bot.banco.canais_voz().values()}
+
+    def get_channel(channel_id):
+        if channel_id in canais_voz:
+            return SimpleNamespace(id=channel_id, name=f"voz-{channel_id}")
+        return bot.client.get_partial_messageable(channel_id, guild_id=guild_do_canal.get(channel_id))
+
+    bot.client.get_channel = get_channel
+    bot.client._connection._get_guild = lambda guild_id: discord.Object(guild_id) if guild_id else None
+    return list(guild_do_canal)
+
+
+async def cenario_liturgia(bot, args):
+    await conectar(bot)
+    inicio = time.perf_counter()
+    await bot.enviar_liturgia_e_terco_texto(force_send=True)
+    duracao = time.perf_counter() - inicio
+    await bot.client.close()
+    return {"parede": duracao, "mensagens": bot.saude.mensagens_enviadas, "canais_ok": bot.saude.canais["ok"]}
+
+
+async def cenario_liturgia_cache(bot, args):
+    """Segundo envio do dia: liturgia e embeds já em cache, só o envio aos canais"""
+    await conectar(bot)
+    await bot.enviar_liturgia_e_terco_texto(force_send=True)
+    mensagens, canais_ok = bot.saude.mensagens_enviadas, bot.saude.canais["ok"]
+    inicio = time.perf_counter()
+    await bot.enviar_liturgia_e_terco_texto(force_send=True)
+    duracao = time.perf_counter() - inicio
+    await bot.client.close()
+    return {
+        "parede": duracao,
+        "mensagens": bot.saude.mensagens_enviadas - mensagens,
+        "canais_ok": bot.saude.canais["ok"] - canais_ok,
+    }
+
+
+def cenario_audio(idioma):
+    async def cenario(bot, args):
+        import audio_opus
+        from voz import FonteMedida
+
+        with open("audios.json") as f:
+            audio_opus._transcodificados.update(json.load(f))
+        fabrica = bot.criar_fonte(bot.calendario.hoje().misterios, idioma)
+        inicio = time.perf_counter()
+        fontes = [FonteMedida(fabrica()) for _ in range(args.vozes)]
+        criacao = time.perf_counter() - inicio
+
+        def tocar(fonte):
+            # Sem o ritmo de 20 ms do player: mede só o custo de produzir cada quadro
+            while fonte.read():
+                pass
+
+        threads = [threading.Thread(target=tocar, args=(f,)) for f in fontes]
+        inicio = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        duracao = time.perf_counter() - inicio
+        cpu = [f.cpu for f in fontes]
+        quadros = fontes[0].quadros
+        return {
+            "parede": duracao,
+            "criacao_fontes": criacao,
+            "vozes": len(fontes),
+            "quadros_por_voz": quadros,
+            "cpu_por_voz": sum(cpu) / len(cpu),
+            # CPU gasta por segundo de áudio tocado (quadros de 20 ms)
+            "cpu_por_segundo_audio": sum(cpu) / len(cpu) / (quadros / 50) if quadros else None,
+        }
+    return cenario
+
+
+EXECUTORES = {
+    "liturgia": cenario_liturgia,
+    "liturgia_cache": cenario_liturgia_cache,
+    "terco_audio": cenario_audio("portugues"),
+    "terco_latim": cenario_audio("latim"),
+}
+
+
+def executar_filho(args):
+    sys.path.insert(0, RAIZ)
+    inicio = time.perf_counter()
+    import discord
+
+    discord.http.Route.BASE = os.environ["DISCORD_API_BASE"]
+    import bot
+    resultado = {"importacao": time.perf_counter() - inicio}
+    if args.cenario in EXECUTORES:
+        cpu = time.process_time()
+        resultado.update(asyncio.run(EXECUTORES[args.cenario](bot, args)))
+        resultado["cpu"] = time.process_time() - cpu
+    asyncio.run(bot.banco.fechar())
+    bot.historico.fechar()
+    # ru_maxrss vem em KiB no Linux
+    resultado["rss_pico"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    bot.telemetria.encerrar()
+    print(json.dumps(resultado))
+
+
+# --- Processo pai: sobe os substitutos, gera as fixtures e roda um filho por cenário ---
+
+def revisao():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def rodar_cenario(nome, pasta, substitutos, args):
+    ambiente = dict(os.environ, **substitutos.ambiente())
+    ambiente.update({"PYTHONPATH": RAIZ, "DISCORD_TOKEN": TOKEN_FALSO, "LOG_LEVEL": "ERROR"})
+    comando = [sys.executable, "-m", "benchmarks.suite", "--cenario", nome, "--vozes", str(args.vozes)]
+    substitutos.zerar()
+    inicio = time.perf_counter()
+    processo = subprocess.run(comando, cwd=pasta, env=ambiente, capture_output=True, text=True)
+    total = time.perf_counter() - inicio
+    if processo.returncode != 0:
+        raise RuntimeError(f"Cenário {nome} falhou:\n{processo.stderr}")
+    # O resultado é a última linha; antes dela podem vir logs de erro do bot
+    resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+    resultado["processo"] = total
+    resultado["requisicoes"] = substitutos.estatisticas()
+    return resultado
+
+
+def comparar(anterior, atual):
+    for nome, medidas in atual["cenarios"].items():
+        antes = anterior.get("cenarios", {}).get(nome, {})
+        for chave, valor in medidas.items():
+            velho = antes.get(chave)
+            if isinstance(valor, (int, float)) and isinstance(velho, (int, float)) and velho:
+                print(f"  {nome}.{chave}: {velho:.4g} -> {valor:.4g} ({(valor - velho) * 100 / velho:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do bot contra substitutos locais")
+    parser.add_argument("--guilds", type=int, default=1000)
+    parser.add_argument("--vozes", type=int, default=16, help="Sessões de voz simultâneas nos cenários de áudio")
+    parser.add_argument("--minutos", type=int, default=20, help="Duração dos áudios de exemplo")
+    parser.add_argument("--latencia", type=float, default=0.05, help="Latência simulada de cada resposta (s)")
+    parser.add_argument("--cenarios", nargs="+", choices=CENARIOS, default=list(CENARIOS))
+    parser.add_argument("--saida", help="Arquivo JSON (padrão: benchmarks/resultados/<data>.json)")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para mostrar as diferenças")
+    parser.add_argument("--cenario", choices=CENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cenario:
+        executar_filho(args)
+        return
+
+    resultado = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "revisao": revisao(),
+        "python": platform.python_version(),
+        "parametros": {k: getattr(args, k) for k in ("guilds", "vozes", "minutos", "latencia")},
+        "cenarios": {},
+    }
+    with tempfile.TemporaryDirectory() as pasta, Substitutos(args.latencia) as substitutos:
+        print(f"Gerando fixtures: {args.guilds} guilds, áudios de {args.minutos} min...")
+        criar_config(os.path.join(pasta, "liturgia.db"), args.guilds)
+        criar_audios(pasta, args.minutos)
+        for nome in args.cenarios:
+            medidas = rodar_cenario(nome, pasta, substitutos, args)
+            resultado["cenarios"][nome] = medidas
+            resumo = ", ".join(
+                f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in medidas.items()
+            )
+            print(f"{nome}: {resumo}")
+
+    saida = args.saida or os.path.join(
+        RAIZ, "benchmarks", "resultados", datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(saida), exist_ok=True)
+    with open(saida, "w") as f:
+        json.dump(resultado, f, indent=2)
+    print(f"Resultados em {saida}")
+
+    if args.comparar:
+        with open(args.comparar) as f:
+            anterior = json.load(f)
+        print(f"Comparação com {args.comparar}:")
+        comparar(anterior, resultado)
+
+
+if __name__ == "__main__":
+    main()
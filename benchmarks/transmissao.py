@@ -0,0 +1,44 @@
+import argparse
+import asyncio
+import time
+
+from benchmarks.falsos import CanalFalso, config_sintetica, percentil
+from transmissao import Transmissor
+
+
+async def sequencial(destinos, mensagens):
+    inicio = time.perf_counter()
+    latencias = []
+    for _, _, canal in destinos:
+        for _, m in mensagens:
+            await canal.send(**m)
+        latencias.append(time.perf_counter() - inicio)
+    return time.perf_counter() - inicio, latencias
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark da transmissão para N guilds")
+    parser.add_argument("--guilds", type=int, default=1000)
+    parser.add_argument("--concorrencia", type=int, default=25)
+    parser.add_argument("--limite-global", type=int, default=0, help="0 desativa o limitador global")
+    parser.add_argument("--sequencial", action="store_true", help="Mede também o laço antigo, um canal por vez")
+    args = parser.parse_args()
+
+    config = config_sintetica(args.guilds)
+    destinos = [(g, c, CanalFalso(c)) for g, c in config.items()]
+    mensagens = [((t,), {"embed": t}) for t in ("liturgia", "meditacao", "terco")]
+
+    transmissor = Transmissor(args.concorrencia, args.limite_global or None)
+    relatorio = await transmissor.transmitir(destinos, lambda guild, canal_id, canal: mensagens)
+    duracoes = [r.duracao for r in relatorio.resultados]
+    print(f"Fan-out: {args.guilds} guilds, concorrência {args.concorrencia}")
+    print(f"  tempo total: {relatorio.duracao:.2f}s  sucessos: {relatorio.sucessos}")
+    print(f"  latência por canal p50={percentil(duracoes, 50) * 1000:.0f}ms p99={percentil(duracoes, 99) * 1000:.0f}ms")
+
+    if args.sequencial:
+        total, latencias = await sequencial(destinos, mensagens)
+        print(f"Sequencial: tempo total {total:.2f}s, p99 até a entrega {percentil(latencias, 99):.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
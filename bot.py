@@ -1,527 +1,482 @@
 import os
 import discord
-import requests
-import json
-import re
+from discord import app_commands
 import asyncio
-from datetime import date, datetime, time, timedelta, timezone
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
+import io
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-from flask import Flask
-from threading import Thread
+from agenda import Agenda, Diaria, ler_fuso, ler_horario
+from banco_config import BancoConfig
+from arquivo_liturgia import PARTES, ArquivoLiturgia
+from cache_liturgia import FUSO_HORARIO, CacheLiturgia, chave, hoje_sp
+from registro_entregas import RegistroEntregas
+from fontes_liturgia import FonteApiJson, FonteRss, MotorFontes
+from liturgia_api import fechar_sessao
+from transmissao import Transmissor
+from conteudo_dia import renderizar_dia
+from calendario import calendario
+from fatiador import LIMITE_MENSAGEM, dividir
+from audio_opus import fonte_audio, preparar_audios
+from voz import GerenciadorVoz
+from fila_audio import FilaAudio, roteiro_terco
+from saude import ServidorSaude
+from gateway import criar_cliente
+from vigia_loop import VigiaLoop, pilhas_agregadas, resumir_perfil
+import telemetria
+from telemetria import obter_logger, span
 
 load_dotenv()
+telemetria.configurar()
+log = obter_logger("bot")
 TOKEN = os.getenv("DISCORD_TOKEN")
 CONFIG_FILE = "config.json"
+CONFIG_VOZ_FILE = "config_voz.json"  # Só lidos para migrar para o banco
 VOICE_CHANNEL_ID = int(os.getenv("VOICE_CHANNEL_ID", 1386432203486920845))  # Canal de voz para o áudio do terço
 GUILD_ID = int(os.getenv("GUILD_ID", 1307006114612908083))
 
-intents = discord.Intents.default()
-intents.message_content = True
-client = discord.Client(intents=intents)
-scheduler = AsyncIOScheduler()
-
-app = Flask(__name__)
-
-@app.route("/")
-def home():
-    return "Bot online!", 200
-
-def run():
-    app.run(host="0.0.0.0", port=8080)
-
-def keep_alive():
-    t = Thread(target=run)
-    t.start()
-
-def load_config():
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, "r") as f:
-            return json.load(f)
-    return {}
-
-def save_config(config):
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f)
-
-config = load_config()
-
-def limpar_html(texto):
-    soup = BeautifulSoup(texto, 'html.parser')
-    text = soup.get_text(separator=' ')
-    text = re.sub(r'\\s+', ' ', text).strip()
-    return text
-
-def dividir_bloco_em_mensagens(titulo, texto, emoji, limite=2000):
-    if not texto:
-        return []
-    header = f"{emoji} {titulo}:\n"
-    blocos = []
-    paragrafos = texto.split('\\n')
-    bloco_atual = header
-    header_usado = False
-    for p in paragrafos:
-        p = p.strip()
-        if not p:
-            continue
-        while len(p) > (limite if header_usado else limite - len(header)):
-            parte = p[:(limite if header_usado else limite - len(header))]
-            if not header_usado:
-                bloco_atual += parte
-                blocos.append(bloco_atual.strip())
-                bloco_atual = ''
-                header_usado = True
-            else:
-                blocos.append(parte)
-            p = p[(limite if header_usado else limite - len(header)):]
-        if len(bloco_atual) + len(p) + 1 > limite:
-            blocos.append(bloco_atual.strip())
-            bloco_atual = ''
-            header_usado = True
-        if bloco_atual:
-            bloco_atual += '\\n' + p
-        else:
-            bloco_atual = p
-    if bloco_atual.strip():
-        blocos.append(bloco_atual.strip())
-    return blocos
-
-def formatar_mensagens(title_str, date_str, leitura, evangelho, salmo):
-    mensagens = []
-    mensagens.append(f"📖 Palavra do Dia – {title_str}\\n🗓️ {date_str}")
-    mensagens.extend(dividir_bloco_em_mensagens("Leitura", leitura, "📖"))
-    mensagens.extend(dividir_bloco_em_mensagens("Salmo", salmo, "🎶"))
-    mensagens.extend(dividir_bloco_em_mensagens("Evangelho", evangelho, "✝️"))
-    return mensagens
-
-async def enviar_liturgia_e_terco_texto(force_send=False):
+# Só comandos de barra: sem message_content, o gateway não entrega o conteúdo das mensagens.
+# SHARD_COUNT e PERFIL_CACHE escolhem os shards e o quanto o discord.py guarda em cache
+client = criar_cliente()
+tree = app_commands.CommandTree(client)
+tarefas = set()
+# A conexão de voz começa um pouco antes do horário do terço
+ANTECEDENCIA_VOZ = timedelta(minutes=3)
+HORARIOS_LATIM = ("06:00", "22:00")
+# Arquivo único por mistério (<tipo>.mp3), quando não há segmentos
+AUDIO_POR_IDIOMA = {"portugues": "audio", "latim": "audio_latim"}
+
+banco = BancoConfig()
+banco.migrar_json(CONFIG_FILE, CONFIG_VOZ_FILE)
+
+def canal_voz_de(guild_id):
+    # A guild do .env continua com o canal de voz padrão
+    canal = banco.guild(guild_id)["canal_voz"]
+    if canal is None and str(guild_id) == str(GUILD_ID):
+        canal = str(VOICE_CHANNEL_ID)
+    return canal
+
+def fuso_de(guild_id):
     try:
-        print("[DEBUG] Iniciando envio da liturgia e terço em texto...")
-        hoje = date.today().strftime("%Y-%m-%d")
-        url = f"https://api-liturgia-diaria.vercel.app/?date={hoje}"
-        print(f"[DEBUG] Buscando dados da API: {url}")
-        response = requests.get(url)
-        if response.status_code != 200:
-            print(f"[ERRO] Status da API: {response.status_code}")
-            raise Exception("Erro ao buscar dados da API")
-
-        dados = response.json()
-        dia = dados["today"]
-
-        entry_title = limpar_html(dia.get("entry_title", ""))
-        color_lit = dia.get("color", "branco").lower()
-        date_str = dia.get("date", hoje)
-
-        print(f"[DEBUG] Dados recebidos: entry_title={entry_title}, color={color_lit}, date={date_str}")
-
-        leitura = (
-            f"{dia['readings']['first_reading']['head']}\n\n"
-            f"{dia['readings']['first_reading']['text']}\n\n"
-            f"{dia['readings']['first_reading']['footer']}"
-        ).replace("\\n", "\n")
-
-        salmo = (
-            f"{dia['readings']['psalm']['title']}\n\n"
-            f"{dia['readings']['psalm']['response']}\n\n" +
-            "\n".join(dia['readings']['psalm']['content_psalm'])
-        ).replace("\\n", "\n")
-
-        evangelho = (
-            f"{dia['readings']['gospel']['head_title']}\n\n"
-            f"{dia['readings']['gospel']['text']}\n\n"
-            f"{dia['readings']['gospel']['footer']}"
-        ).replace("\\n", "\n")
-
-        print("[DEBUG] Mensagens formatadas para leitura, salmo e evangelho.")
-
-        cores = {
-            "verde": 0x228B22,
-            "vermelho": 0xB22222,
-            "roxo": 0x800080,
-            "branco": 0xF8F8FF,
-            "rosa": 0xFFC0CB,
-            "preto": 0x111111
-        }
-        cor_embed = cores.get(color_lit, 0xAAAAAA)
-
-        embed = discord.Embed(
-            title="📜 Proclamação da Liturgia",
-            description=(
-                f"{entry_title}\n"
-                f"📅 {date_str}\n"
-                f"🕯️ Cor litúrgica: **{color_lit.capitalize()}**"
-            ),
-            color=cor_embed
-        )
-
-        def cortar(texto):
-            return texto if len(texto) < 1024 else texto[:1020] + "..."
-
-        embed.add_field(name="📖 Letanía da Palavra", value=cortar(leitura), inline=False)
-        embed.add_field(name="🎶 Salmodia Real", value=cortar(salmo), inline=False)
-        embed.add_field(name="✝️ Evangelho Sagrado", value=cortar(evangelho), inline=False)
-
-        embed.set_footer(text="Scriptor Sacrum · O Escriba da Aurora")
-        embed.set_thumbnail(url="https://upload.wikimedia.org/wikipedia/commons/thumb/b/ba/Emblem_of_the_Holy_See_%28no_background%29.svg/1510px-Emblem_of_the_Holy_See_%28no_background%29.svg.png")
-
-        print(f"[DEBUG] Enviando para {len(config)} canais configurados...")
-        # Envio para todos os canais definidos
+        return ler_fuso(banco.guild(guild_id)["fuso"])
+    except ValueError as e:
+        log.warning("Guild %s: %s; usando %s", guild_id, e, FUSO_HORARIO.key)
+        return FUSO_HORARIO
+
+def data_local(guild_id):
+    return datetime.now(fuso_de(guild_id)).date()
+
+motor_fontes = MotorFontes([FonteApiJson(), FonteRss()])
+historico = ArquivoLiturgia()
+cache_liturgia = CacheLiturgia(buscar=motor_fontes.buscar, arquivo=historico)
+registro = RegistroEntregas(banco, desde=chave(hoje_sp() - timedelta(days=1)))
+transmissor = Transmissor()
+gerenciador_voz = GerenciadorVoz(client)
+agenda = Agenda({
+    "liturgia": lambda guilds, horario: enviar_liturgia_e_terco_texto(guilds=guilds),
+    "terco": lambda guilds, horario: tocar_terco_audio(guilds, inicio=horario),
+    "terco_latim": lambda guilds, horario: tocar_terco_audio_latim(guilds, inicio=horario),
+    "pre_carregar": lambda alvos, horario: cache_liturgia.pre_carregar_amanha(),
+})
+saude = ServidorSaude(client, agenda, gerenciador_voz, motor_fontes)
+vigia = VigiaLoop()
+preparo_audio = None
+
+async def enviar_liturgia_e_terco_texto(force_send=False, guilds=None):
+    """Envia a liturgia do dia aos canais de texto (de todas as guilds, ou só de `guilds`)"""
+    try:
+        log.debug("Iniciando envio da liturgia e terço em texto...")
+        registro.expirar(chave(hoje_sp() - timedelta(days=1)))
+        config = banco.canais_texto()
+        if guilds is not None:
+            config = {g: config[g] for g in map(str, guilds) if g in config}
+
+        # Cada guild recebe a liturgia do dia no seu fuso; o terço é a última
+        # mensagem do dia: se já foi entregue, o canal está completo
+        por_data = {}
         for guild_id, channel_id in config.items():
-            print(f"[DEBUG] Tentando enviar para guild_id={guild_id}, channel_id={channel_id}")
-            channel = client.get_channel(int(channel_id))
-            if channel:
-                await channel.send(embed=embed)
-                print(f"[SUCESSO] Liturgia enviada para {channel.name}")
-
-                # Se houver meditação no campo "extra"
-                extra = dia.get("extra", [])
-                if extra:
-                    meditacao = "\n".join([limpar_html(l) for l in extra if l.strip()])
-                    if meditacao:
-                        embed_meditacao = discord.Embed(
-                            title="🕊️ Meditação do Dia",
-                            description=meditacao,
-                            color=0x7FDBFF
-                        )
-                        embed_meditacao.set_footer(text="Scriptor Sacrum · O Escriba da Aurora")
-                        embed_meditacao.set_thumbnail(url="https://upload.wikimedia.org/wikipedia/commons/thumb/b/ba/Emblem_of_the_Holy_See_%28no_background%29.svg/1510px-Emblem_of_the_Holy_See_%28no_background%29.svg.png")
-                        await channel.send(embed=embed_meditacao)
-                        print(f"[SUCESSO] Meditação enviada para {channel.name}")
-
-                # Terço do dia (texto)
-                print(f"[DEBUG] Enviando terço em texto para {channel.name}")
-                await enviar_terco_texto(channel)
-            else:
-                print(f"[ERRO] Canal não encontrado para guild {guild_id}")
+            hoje = chave(data_local(guild_id))
+            if force_send or not registro.ja_enviado(guild_id, channel_id, hoje, "terco"):
+                por_data.setdefault(hoje, {})[guild_id] = channel_id
+        if not por_data:
+            log.info("Liturgia já entregue em todos os canais.")
+            return
+        for hoje, canais in sorted(por_data.items()):
+            await transmitir_dia(hoje, canais, force_send)
 
     except Exception as e:
-        print("[ERRO]", str(e))
-
-async def enviar_terco_texto(channel):
-    misterios_do_terco = {
-        "segunda-feira": {
-            "tipo": "Gozosos",
-            "mistérios": [
-                {"título": "A Anunciação do Anjo a Maria", "descrição": "O anjo Gabriel anuncia a Maria que ela será a Mãe do Salvador. (Lc 1,26-38)"},
-                {"título": "A Visitação de Maria a Isabel", "descrição": "Maria visita sua prima Isabel, que também espera um filho (João Batista). (Lc 1,39-56)"},
-                {"título": "O Nascimento de Jesus em Belém", "descrição": "Jesus nasce em um estábulo, em humildade e pobreza. (Lc 2,1-20)"},
-                {"título": "A Apresentação de Jesus no Templo", "descrição": "Maria e José apresentam Jesus ao Senhor no templo. (Lc 2,22-38)"},
-                {"título": "O Encontro do Menino Jesus no Templo", "descrição": "Jesus, com 12 anos, é encontrado entre os doutores da Lei. (Lc 2,41-50)"}
-            ]
-        },
-        "terça-feira": {
-            "tipo": "Dolorosos",
-            "mistérios": [
-                {"título": "A Agonia de Jesus no Horto", "descrição": "Jesus sua sangue e reza ao Pai antes de ser preso. (Mt 26,36-46)"},
-                {"título": "A Flagelação de Jesus", "descrição": "Jesus é cruelmente açoitado. (Jo 19,1)"},
-                {"título": "A Coroação de Espinhos", "descrição": "Soldados zombam de Jesus, coroando-O com espinhos. (Mt 27,27-31)"},
-                {"título": "Jesus Carrega a Cruz até o Calvário", "descrição": "Jesus carrega Sua cruz até o lugar da crucificação. (Jo 19,17)"},
-                {"título": "A Crucificação e Morte de Jesus", "descrição": "Jesus morre na cruz para a salvação da humanidade. (Lc 23,33-46)"}
-            ]
-        },
-        "quarta-feira": {
-            "tipo": "Gloriosos",
-            "mistérios": [
-                {"título": "A Ressurreição de Jesus", "descrição": "Jesus ressuscita dos mortos ao terceiro dia. (Mt 28,1-10)"},
-                {"título": "A Ascensão de Jesus ao Céu", "descrição": "Jesus sobe aos céus à vista dos apóstolos. (At 1,6-11)"},
-                {"título": "A Vinda do Espírito Santo", "descrição": "O Espírito Santo desce sobre os apóstolos. (At 2,1-4)"},
-                {"título": "A Assunção de Maria", "descrição": "Maria é elevada em corpo e alma ao Céu. (Ap 12)"},
-                {"título": "A Coroação de Maria", "descrição": "Maria é coroada por Deus como Rainha do Céu e da Terra. (Ap 12,1)"}
-            ]
-        },
-        "quinta-feira": {
-            "tipo": "Luminosos",
-            "mistérios": [
-                {"título": "O Batismo de Jesus no Jordão", "descrição": "Jesus é batizado por João Batista e o Espírito Santo desce sobre Ele. (Mt 3,13-17)"},
-                {"título": "As Bodas de Caná", "descrição": "Jesus realiza seu primeiro milagre, transformando água em vinho. (Jo 2,1-12)"},
-                {"título": "O Anúncio do Reino de Deus", "descrição": "Jesus prega, cura e chama todos à conversão. (Mc 1,14-15)"},
-                {"título": "A Transfiguração de Jesus", "descrição": "Jesus aparece em glória com Moisés e Elias no monte Tabor. (Lc 9,28-36)"},
-                {"título": "A Instituição da Eucaristia", "descrição": "Jesus oferece seu Corpo e Sangue sob o pão e o vinho na Última Ceia. (Lc 22,14-20)"}
-            ]
-        },
-        "sexta-feira": {
-            "tipo": "Dolorosos",
-            "mistérios": [
-                {"título": "A Agonia de Jesus no Horto", "descrição": "Jesus sua sangue e reza ao Pai antes de ser preso. (Mt 26,36-46)"},
-                {"título": "A Flagelação de Jesus", "descrição": "Jesus é cruelmente açoitado. (Jo 19,1)"},
-                {"título": "A Coroação de Espinhos", "descrição": "Soldados zombam de Jesus, coroando-O com espinhos. (Mt 27,27-31)"},
-                {"título": "Jesus Carrega a Cruz até o Calvário", "descrição": "Jesus carrega Sua cruz até o lugar da crucificação. (Jo 19,17)"},
-                {"título": "A Crucificação e Morte de Jesus", "descrição": "Jesus morre na cruz para a salvação da humanidade. (Lc 23,33-46)"}
-            ]
-        },
-        "sábado": {
-            "tipo": "Gozosos",
-            "mistérios": [
-                {"título": "A Anunciação do Anjo a Maria", "descrição": "O anjo Gabriel anuncia a Maria que ela será a Mãe do Salvador. (Lc 1,26-38)"},
-                {"título": "A Visitação de Maria a Isabel", "descrição": "Maria visita sua prima Isabel, que também espera um filho (João Batista). (Lc 1,39-56)"},
-                {"título": "O Nascimento de Jesus em Belém", "descrição": "Jesus nasce em um estábulo, em humildade e pobreza. (Lc 2,1-20)"},
-                {"título": "A Apresentação de Jesus no Templo", "descrição": "Maria e José apresentam Jesus ao Senhor no templo. (Lc 2,22-38)"},
-                {"título": "O Encontro do Menino Jesus no Templo", "descrição": "Jesus, com 12 anos, é encontrado entre os doutores da Lei. (Lc 2,41-50)"}
-            ]
-        },
-        "domingo": {
-            "tipo": "Gloriosos",
-            "observação": "Pode-se rezar os Luminosos no Tempo Comum, se preferir.",
-            "mistérios": [
-                {"título": "A Ressurreição de Jesus", "descrição": "Jesus ressuscita dos mortos ao terceiro dia. (Mt 28,1-10)"},
-                {"título": "A Ascensão de Jesus ao Céu", "descrição": "Jesus sobe aos céus à vista dos apóstolos. (At 1,6-11)"},
-                {"título": "A Vinda do Espírito Santo", "descrição": "O Espírito Santo desce sobre os apóstolos. (At 2,1-4)"},
-                {"título": "A Assunção de Maria", "descrição": "Maria é elevada em corpo e alma ao Céu. (Ap 12)"},
-                {"título": "A Coroação de Maria", "descrição": "Maria é coroada por Deus como Rainha do Céu e da Terra. (Ap 12,1)"}
-            ]
-        }
-    }
-    dias_pt = [
-        "segunda-feira", "terça-feira", "quarta-feira", "quinta-feira", "sexta-feira", "sábado", "domingo"
+        saude.registrar_falha()
+        log.exception("Falha na transmissão da liturgia: %s", e)
+
+async def transmitir_dia(hoje, config, force_send):
+    log.debug("Obtendo liturgia de %s (cache ou API)", hoje)
+    dia = await cache_liturgia.obter(hoje)
+    conteudo = conteudo_do_dia(dia, hoje)
+    log.debug("Enviando para %d canais configurados...", len(config))
+
+    def montar(guild_id, channel_id, channel):
+        tipos = conteudo.tipos
+        if not force_send:
+            # Depois de uma queda no meio do envio, manda só o que faltou
+            tipos = registro.pendentes(guild_id, channel_id, hoje, tipos)
+        return conteudo.mensagens(nome_canal_voz(guild_id), tipos, horarios_aviso(guild_id)) if tipos else []
+
+    # Envio para todos os canais definidos, em paralelo
+    destinos = [
+        # PartialMessageable: envia sem depender do cache de canais
+        (guild_id, channel_id, client.get_partial_messageable(int(channel_id), guild_id=int(guild_id)))
+        for guild_id, channel_id in config.items()
     ]
-    dia_semana = dias_pt[date.today().weekday()]
-    terco = misterios_do_terco[dia_semana]
-    descricao_terco = f"**Mistérios {terco['tipo']}**\n\n"
-    for idx, misterio in enumerate(terco["mistérios"], 1):
-        descricao_terco += f"{idx}. **{misterio['título']}**\n{misterio['descrição']}\n\n"
-    if 'observação' in terco:
-        descricao_terco += f"\n_Observação: {terco['observação']}_"
-    embed_terco = discord.Embed(
-        title=f"📿 Terço do Dia – {dia_semana.capitalize()}",
-        description=descricao_terco,
-        color=0xFFD700
-    )
-    embed_terco.set_footer(text="Scriptor Sacrum · O Escriba da Aurora")
-    embed_terco.set_thumbnail(url="https://yata-apix-9da23243-671c-42a8-9014-41a94dafae05.s3-object.locaweb.com.br/ae792e6635b3427f9ab1f5ed4774e121.png")
-
-    # Adiciona aviso sobre o terço em latim
-    guild = client.get_guild(GUILD_ID)
-    voice_channel = guild.get_channel(VOICE_CHANNEL_ID) if guild else None
-    canal_nome = voice_channel.name if voice_channel else "Canal de voz não encontrado"
-    aviso_latim = (
-        f"🔔 O terço já foi transmitido hoje em latim neste canal de voz: **{canal_nome}**.\n"
-        f"Será transmitido novamente em português às **18h** e em latim às **22h** (horário de São Paulo) no mesmo canal."
-    )
-    embed_terco.add_field(
-        name="ℹ️ Aviso sobre o Terço em Latim",
-        value=aviso_latim,
-        inline=False
-    )
-
-    await channel.send(embed=embed_terco)
-    print(f"[SUCESSO] Terço enviado para {channel.name}")
-
-async def tocar_terco_audio(ignorar_espera=False):
-    print("[INFO] Preparando para iniciar o Terço em áudio...")
-    guild = client.get_guild(GUILD_ID)
-    if guild is None:
-        print("[ERRO] Guild não encontrada. Verifique o GUILD_ID.")
-        return
-
-    voice_channel = guild.get_channel(VOICE_CHANNEL_ID)
-    if not voice_channel or not isinstance(voice_channel, discord.VoiceChannel):
-        print("[ERRO] Canal de voz inválido ou não encontrado.")
-        return
-
-    try:
-        # Verifica se já está conectado
-        if client.voice_clients and any(vc.channel == voice_channel for vc in client.voice_clients):
-            voice_client = next(vc for vc in client.voice_clients if vc.channel == voice_channel)
-            print(f"[INFO] Já conectado ao canal de voz: {voice_channel.name}")
+    with span("transmissao", data=hoje, canais=len(destinos)):
+        relatorio = await transmissor.transmitir(
+            destinos, montar, lambda guild_id, channel_id, tipo: registro.marcar(guild_id, channel_id, hoje, tipo)
+        )
+    saude.registrar_transmissao(relatorio)
+    for r in relatorio.resultados:
+        if r.ok:
+            log.debug("Liturgia enviada para guild %s (%d mensagens, %.2fs)", r.guild_id, r.enviadas, r.duracao)
         else:
-            print("[DEBUG] Tentando conectar ao canal de voz...")
-            voice_client = await voice_channel.connect()
-            print(f"[INFO] Conectado ao canal de voz: {voice_channel.name}")
-
-        # Espera até 18h00 apenas se não for ignorar_espera
-        if not ignorar_espera:
-            agora = datetime.now(timezone(timedelta(hours=-3)))
-            inicio_terco = datetime.combine(agora.date(), time(18, 0), tzinfo=agora.tzinfo)
-            segundos_ate_inicio = (inicio_terco - agora).total_seconds()
-            if segundos_ate_inicio > 0:
-                print(f"[INFO] Aguardando {segundos_ate_inicio:.1f} segundos até 18h")
-                await asyncio.sleep(segundos_ate_inicio)
-
-        caminho, tipo = caminho_audio_terco()
-        print(f"[DEBUG] Caminho do áudio: {caminho}")
-        print(f"[DEBUG] Verificando existência do arquivo de áudio...")
+            log.error("Falha ao enviar para guild %s, canal %s: %s", r.guild_id, r.channel_id, r.erro)
+    log.info("Transmissão concluída: %d/%d canais em %.2fs",
+             relatorio.sucessos, len(relatorio.resultados), relatorio.duracao)
+
+
+def horarios_aviso(guild_id):
+    """(terço, último terço em latim, fuso) da guild, para o aviso do canal de voz"""
+    config = banco.guild(guild_id)
+    return config["horario_terco"], HORARIOS_LATIM[-1], fuso_de(guild_id).key
+
+def nome_canal_voz(guild_id):
+    channel_id = canal_voz_de(guild_id)
+    voice_channel = client.get_channel(int(channel_id)) if channel_id else None
+    return voice_channel.name if voice_channel else None
+
+_conteudo_cache = {}
+
+def conteudo_do_dia(dia, data):
+    # Renderiza os embeds uma vez por dia e reaproveita em todos os canais;
+    # com guilds em fusos diferentes, dois dias podem estar em uso ao mesmo tempo.
+    # Dia parcial não entra no cache: o completo, quando chegar, é renderizado
+    if dia.get("parcial"):
+        return renderizar_dia(dia, data)
+    if data not in _conteudo_cache:
+        ontem = chave(hoje_sp() - timedelta(days=1))
+        for antigo in [d for d in _conteudo_cache if d < ontem]:
+            del _conteudo_cache[antigo]
+        _conteudo_cache[data] = renderizar_dia(dia, data)
+    return _conteudo_cache[data]
+
+def caminho_audio_terco(tipo, idioma="portugues"):
+    return os.path.join(AUDIO_POR_IDIOMA[idioma], f"{tipo}.mp3")
+
+def criar_fonte(tipo, idioma):
+    def fonte():
+        # Preferência: terço montado por segmentos; senão, o arquivo único do mistério
+        roteiro = roteiro_terco(tipo, idioma)
+        if roteiro:
+            log.debug("Tocando %d segmentos em fila (%s)", len(roteiro), idioma)
+            return FilaAudio(roteiro)
+        caminho = caminho_audio_terco(tipo, idioma)
+        log.debug("Caminho do áudio: %s", caminho)
         if not os.path.exists(caminho):
-            print(f"[ERRO] Áudio não encontrado: {caminho}")
-            await voice_client.disconnect()
-            return
-
-        print(f"[INFO] Tocando o Terço ({tipo}) agora...")
-        print(f"[DEBUG] Criando FFmpegPCMAudio...")
-        try:
-            audio_source = discord.FFmpegPCMAudio(executable="./bin/ffmpeg", source=caminho)
-        except Exception as e:
-            print(f"[ERRO] Erro ao criar FFmpegPCMAudio: {e}")
-            await voice_client.disconnect()
-            return
-
-        print(f"[DEBUG] Iniciando reprodução do áudio...")
-        try:
-            voice_client.play(audio_source)
-        except Exception as e:
-            print(f"[ERRO] Erro ao iniciar reprodução: {e}")
-            import traceback
-            traceback.print_exc()
-            await voice_client.disconnect()
-            return
-
-        print(f"[DEBUG] Esperando o áudio terminar...")
-        while voice_client.is_playing():
-            await asyncio.sleep(1)
-
-        print("[INFO] Terço finalizado. Permanecendo em silêncio por 10 minutos...")
-        await asyncio.sleep(600)
-
-        await voice_client.disconnect()
-        print("[INFO] Desconectado do canal de voz após silêncio.")
-    except Exception as e:
-        print(f"[ERRO] Falha ao executar transmissão do terço: {e}")
-        import traceback
-        traceback.print_exc()
-        if 'voice_client' in locals() and voice_client.is_connected():
-            await voice_client.disconnect()
-
-def tipo_misterio_hoje():
-    dias = {
-        0: "gozosos",     # Segunda
-        1: "dolorosos",   # Terça
-        2: "gloriosos",   # Quarta
-        3: "luminosos",   # Quinta
-        4: "dolorosos",   # Sexta
-        5: "gozosos",     # Sábado
-        6: "gloriosos"    # Domingo
-    }
-    return dias[datetime.now().weekday()]
-
-def caminho_audio_terco():
-    tipo = tipo_misterio_hoje()
-    return f"audio/{tipo}.mp3", tipo.capitalize()
-
-def caminho_audio_terco_latim():
-    tipo = tipo_misterio_hoje()
-    return f"audio_latim/{tipo}.mp3", tipo.capitalize()
-
-async def tocar_terco_audio_latim(ignorar_espera=False):
-    print("[INFO] Preparando para iniciar o Terço em latim...")
-    guild = client.get_guild(GUILD_ID)
-    if guild is None:
-        print("[ERRO] Guild não encontrada. Verifique o GUILD_ID.")
-        return
-
-    voice_channel = guild.get_channel(VOICE_CHANNEL_ID)
-    if not voice_channel or not isinstance(voice_channel, discord.VoiceChannel):
-        print("[ERRO] Canal de voz inválido ou não encontrado.")
-        return
-
+            log.error("Áudio não encontrado: %s", caminho)
+            return None
+        return fonte_audio(caminho)
+    return fonte
+
+def destinos_voz(guilds=None):
+    destinos = banco.canais_voz()
+    if canal_voz_de(GUILD_ID):
+        destinos.setdefault(str(GUILD_ID), canal_voz_de(GUILD_ID))
+    if guilds is not None:
+        destinos = {g: destinos[g] for g in map(str, guilds) if g in destinos}
+    return destinos
+
+def misterios_de(guild_id, inicio=None):
+    """Mistérios do dia da guild, no fuso dela, no instante `inicio` (ou agora)"""
+    if inicio is None:
+        return calendario.dia(data_local(guild_id)).misterios
+    return calendario.em(inicio, fuso_de(guild_id)).misterios
+
+async def tocar_terco(guilds, inicio, idioma, rotulo):
+    # No mesmo instante, guilds em fusos diferentes podem estar em dias (e mistérios) diferentes
+    por_tipo = {}
+    for guild_id, channel_id in destinos_voz(guilds).items():
+        por_tipo.setdefault(misterios_de(guild_id, inicio), {})[guild_id] = channel_id
+    resultados = await asyncio.gather(*(
+        gerenciador_voz.tocar_em(destinos, criar_fonte(tipo, idioma), rotulo, inicio)
+        for tipo, destinos in por_tipo.items()
+    ))
+    return [r for parcial in resultados for r in parcial]
+
+async def tocar_terco_audio(guilds=None, inicio=None):
+    """Terço em áudio nas guilds (todas, se None); `inicio` com fuso, ou None para tocar já"""
+    log.info("Preparando para iniciar o Terço em áudio...")
+    return await tocar_terco(guilds, inicio, "portugues", "Terço")
+
+async def tocar_terco_audio_latim(guilds=None, inicio=None):
+    log.info("Preparando para iniciar o Terço em latim...")
+    return await tocar_terco(guilds, inicio, "latim", "Terço em latim")
+
+def agendar_guild(guild_id, recuperar=False):
+    """(Re)agenda a liturgia e os terços da guild conforme os horários e o fuso dela.
+
+    Com `recuperar`, a liturgia de hoje que ficou para trás (bot fora do ar) sai
+    logo; o registro de entregas evita repetir o que já foi enviado.
+    """
+    guild_id = str(guild_id)
+    config = banco.guild(guild_id)
+    fuso = fuso_de(guild_id)
     try:
-        # Verifica se já está conectado
-        if client.voice_clients and any(vc.channel == voice_channel for vc in client.voice_clients):
-            voice_client = next(vc for vc in client.voice_clients if vc.channel == voice_channel)
-            print(f"[INFO] Já conectado ao canal de voz: {voice_channel.name}")
+        if config["canal_texto"]:
+            regra = Diaria((config["horario_liturgia"],), fuso)
+            desde = regra.inicio_do_dia(datetime.now(timezone.utc)) if recuperar else None
+            agenda.agendar("liturgia", guild_id, regra, recuperar=True, desde=desde)
         else:
-            print("[DEBUG] Tentando conectar ao canal de voz...")
-            voice_client = await voice_channel.connect()
-            print(f"[INFO] Conectado ao canal de voz: {voice_channel.name}")
-
-        # Espera até o horário agendado, se não for ignorar_espera
-        if not ignorar_espera:
-            agora = datetime.now(timezone(timedelta(hours=-3)))
-            # Determina o próximo horário agendado (6h ou 22h)
-            hora_atual = agora.hour
-            if hora_atual < 6:
-                proxima = datetime.combine(agora.date(), time(6, 0), tzinfo=agora.tzinfo)
-            elif hora_atual < 22:
-                proxima = datetime.combine(agora.date(), time(22, 0), tzinfo=agora.tzinfo)
-            else:
-                proxima = datetime.combine(agora.date() + timedelta(days=1), time(6, 0), tzinfo=agora.tzinfo)
-            segundos_ate_inicio = (proxima - agora).total_seconds()
-            if segundos_ate_inicio > 0:
-                print(f"[INFO] Aguardando {segundos_ate_inicio:.1f} segundos até o próximo horário agendado")
-                await asyncio.sleep(segundos_ate_inicio)
-
-        caminho, tipo = caminho_audio_terco_latim()
-        print(f"[DEBUG] Caminho do áudio latim: {caminho}")
-        print(f"[DEBUG] Verificando existência do arquivo de áudio...")
-        if not os.path.exists(caminho):
-            print(f"[ERRO] Áudio não encontrado: {caminho}")
-            await voice_client.disconnect()
-            return
-
-        print(f"[INFO] Tocando o Terço em latim ({tipo}) agora...")
-        print(f"[DEBUG] Criando FFmpegPCMAudio...")
-        try:
-            audio_source = discord.FFmpegPCMAudio(executable="./bin/ffmpeg", source=caminho)
-        except Exception as e:
-            print(f"[ERRO] Erro ao criar FFmpegPCMAudio: {e}")
-            await voice_client.disconnect()
-            return
+            agenda.remover("liturgia", guild_id)
+        if canal_voz_de(guild_id):
+            agenda.agendar("terco", guild_id, Diaria((config["horario_terco"],), fuso), antecedencia=ANTECEDENCIA_VOZ)
+            agenda.agendar("terco_latim", guild_id, Diaria(HORARIOS_LATIM, fuso), antecedencia=ANTECEDENCIA_VOZ)
+        else:
+            agenda.remover("terco", guild_id)
+            agenda.remover("terco_latim", guild_id)
+    except ValueError as e:
+        log.error("Agenda da guild %s não atualizada: %s", guild_id, e)
+
+def registrar_agendamentos():
+    # on_ready roda a cada reconexão: a agenda é montada e iniciada uma vez só
+    if agenda.rodando:
+        return
+    for guild_id in set(banco.canais_texto()) | set(destinos_voz()):
+        agendar_guild(guild_id, recuperar=True)
+    # Pré-carrega a liturgia de amanhã à noite, para o envio da manhã não depender da API
+    agenda.agendar("pre_carregar", None, Diaria(("20:00",), FUSO_HORARIO))
+    agenda.iniciar()
 
-        print(f"[DEBUG] Iniciando reprodução do áudio...")
-        try:
-            voice_client.play(audio_source)
-        except Exception as e:
-            print(f"[ERRO] Erro ao iniciar reprodução: {e}")
-            import traceback
-            traceback.print_exc()
-            await voice_client.disconnect()
-            return
+@client.event
+async def setup_hook():
+    # Publica os comandos de barra uma vez por inicialização (não a cada reconexão)
+    comandos = await tree.sync()
+    log.info("%d comandos de barra sincronizados.", len(comandos))
 
-        print(f"[DEBUG] Esperando o áudio terminar...")
-        while voice_client.is_playing():
-            await asyncio.sleep(1)
+@client.event
+async def on_ready():
+    log.info("Bot conectado como %s", client.user)
+    global preparo_audio
+    if preparo_audio is None:
+        # Transcodifica os MP3 para Opus uma vez, fora do event loop
+        preparo_audio = asyncio.create_task(asyncio.to_thread(preparar_audios))
+    registrar_agendamentos()
 
-        print("[INFO] Terço em latim finalizado. Permanecendo em silêncio por 10 minutos...")
-        await asyncio.sleep(600)
+@client.event
+async def on_shard_ready(shard_id):
+    log.info("Shard %d pronto (%d guilds no total).", shard_id, len(client.guilds))
+    saude.shard_pronto(shard_id)
 
-        await voice_client.disconnect()
-        print("[INFO] Desconectado do canal de voz após silêncio.")
-    except Exception as e:
-        print(f"[ERRO] Falha ao executar transmissão do terço em latim: {e}")
-        import traceback
-        traceback.print_exc()
-        if 'voice_client' in locals() and voice_client.is_connected():
-            await voice_client.disconnect()
+@client.event
+async def on_shard_resumed(shard_id):
+    saude.shard_pronto(shard_id)
 
 @client.event
-async def on_ready():
-    print(f"[INFO] Bot conectado como {client.user}")
-    await enviar_liturgia_e_terco_texto()
-    # Liturgia e terço em texto às 8h
-    scheduler.add_job(enviar_liturgia_e_terco_texto, CronTrigger(hour=8, minute=0, timezone="America/Sao_Paulo"))
-    # Terço em áudio: conecta às 17:57, toca às 18:00
-    scheduler.add_job(tocar_terco_audio, CronTrigger(hour=17, minute=57, timezone="America/Sao_Paulo"))
-    # Terço em latim: às 6h e às 22h
-    scheduler.add_job(tocar_terco_audio_latim, CronTrigger(hour=6, minute=0, timezone="America/Sao_Paulo"))
-    scheduler.add_job(tocar_terco_audio_latim, CronTrigger(hour=22, minute=0, timezone="America/Sao_Paulo"))
-    scheduler.start()
-    print("[INFO] Agendamento iniciado.")
+async def on_shard_disconnect(shard_id):
+    log.warning("Shard %d desconectado.", shard_id)
+    saude.shard_caiu(shard_id)
 
 @client.event
-async def on_message(message):
-    if message.author == client.user:
+async def on_voice_state_update(member, before, after):
+    # Alguém saiu de um canal de voz: se o bot ficou sozinho, o silêncio pós-terço acaba antes
+    if before.channel is not None and before.channel != after.channel:
+        gerenciador_voz.canal_atualizado(member.guild.id)
+
+def em_segundo_plano(coro, nome):
+    # Trabalho longo sai do handler do comando; a referência fica guardada até a tarefa acabar
+    tarefa = asyncio.create_task(coro, name=nome)
+    tarefas.add(tarefa)
+
+    def concluida(t):
+        tarefas.discard(t)
+        if not t.cancelled() and t.exception() is not None:
+            log.error("Tarefa %s falhou", nome, exc_info=t.exception())
+
+    tarefa.add_done_callback(concluida)
+    return tarefa
+
+async def responder(interaction, texto):
+    # Depois do defer, a resposta vai em followups de até 2000 caracteres
+    for parte in dividir(texto, LIMITE_MENSAGEM):
+        await interaction.followup.send(parte)
+
+@tree.error
+async def on_app_command_error(interaction, erro):
+    if isinstance(erro, app_commands.MissingPermissions):
+        mensagem = "❌ Comando restrito a administradores."
+    else:
+        log.error("Falha no comando /%s", interaction.command and interaction.command.name, exc_info=erro)
+        mensagem = "❌ Não foi possível executar o comando."
+    if interaction.response.is_done():
+        await interaction.followup.send(mensagem, ephemeral=True)
+    else:
+        await interaction.response.send_message(mensagem, ephemeral=True)
+
+@tree.command(name="definir", description="Define este canal para receber a Liturgia Diária")
+@app_commands.guild_only()
+async def cmd_definir(interaction: discord.Interaction):
+    await interaction.response.defer()
+    await banco.definir(interaction.guild_id, canal_texto=str(interaction.channel_id))
+    agendar_guild(interaction.guild_id)
+    await interaction.followup.send("✅ Canal definido para receber a Liturgia Diária!")
+
+@tree.command(name="definirvoz", description="Define o seu canal de voz atual para o Terço em áudio")
+@app_commands.guild_only()
+async def cmd_definirvoz(interaction: discord.Interaction):
+    voz = getattr(interaction.user, "voice", None)
+    if not voz or not voz.channel:
+        await interaction.response.send_message(
+            "❌ Entre no canal de voz que deve receber o terço e repita o comando.", ephemeral=True
+        )
         return
-    if message.content.lower().startswith("!definir"):
-        guild_id = str(message.guild.id)
-        channel_id = str(message.channel.id)
-        config[guild_id] = channel_id
-        save_config(config)
-        await message.channel.send("✅ Canal definido para receber a Liturgia Diária!")
-    elif message.content.lower().startswith("!testar"):
-        await enviar_liturgia_e_terco_texto(force_send=True)
-    elif message.content.lower().startswith("!terco") or message.content.lower().startswith("!terço"):
-        await message.channel.send("⏳ Iniciando o terço em áudio no canal de voz configurado...")
-        await tocar_terco_audio(ignorar_espera=True)
-    elif message.content.lower().startswith("!tertiolatinum"):
-        await message.channel.send("⏳ Iniciando o terço em latim no canal de voz configurado...")
-        await tocar_terco_audio_latim(ignorar_espera=True)
-    elif message.content.lower().startswith("!desconectar"):
-        if client.voice_clients:
-            for vc in client.voice_clients:
-                await vc.disconnect()
-            await message.channel.send("🔌 Bot desconectado do canal de voz.")
-        else:
-            await message.channel.send("❌ O bot não está conectado a nenhum canal de voz.")
+    await interaction.response.defer()
+    await banco.definir(interaction.guild_id, canal_voz=str(voz.channel.id))
+    agendar_guild(interaction.guild_id)
+    await interaction.followup.send(f"✅ Canal de voz **{voz.channel.name}** definido para o Terço em áudio!")
+
+@tree.command(name="horarios", description="Define os horários da liturgia e do terço e o fuso horário da guild")
+@app_commands.describe(liturgia="Horário da liturgia (HH:MM)", terco="Horário do terço em áudio (HH:MM)",
+                       fuso="Fuso horário IANA, ex.: America/Sao_Paulo")
+@app_commands.guild_only()
+@app_commands.default_permissions(manage_guild=True)
+async def cmd_horarios(interaction: discord.Interaction, liturgia: str = None, terco: str = None, fuso: str = None):
+    campos = {}
+    try:
+        if liturgia:
+            campos["horario_liturgia"] = ler_horario(liturgia).strftime("%H:%M")
+        if terco:
+            campos["horario_terco"] = ler_horario(terco).strftime("%H:%M")
+        if fuso:
+            campos["fuso"] = ler_fuso(fuso).key
+    except ValueError as e:
+        await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+        return
+    await interaction.response.defer()
+    if campos:
+        await banco.definir(interaction.guild_id, **campos)
+        agendar_guild(interaction.guild_id)
+    config = banco.guild(interaction.guild_id)
+    await interaction.followup.send(
+        f"🕗 Liturgia às **{config['horario_liturgia']}** e terço às **{config['horario_terco']}** "
+        f"(fuso {config['fuso']})."
+    )
 
-keep_alive()
-client.run(TOKEN)
+@tree.command(name="testar", description="Envia agora a liturgia e o terço para o canal definido nesta guild")
+@app_commands.guild_only()
+@app_commands.default_permissions(administrator=True)
+@app_commands.checks.has_permissions(administrator=True)
+async def cmd_testar(interaction: discord.Interaction):
+    if not banco.guild(interaction.guild_id)["canal_texto"]:
+        await interaction.response.send_message("❌ Nenhum canal definido nesta guild. Use /definir.", ephemeral=True)
+        return
+    await interaction.response.send_message("⏳ Enviando a liturgia para o canal definido...", ephemeral=True)
+    em_segundo_plano(enviar_liturgia_e_terco_texto(force_send=True, guilds=[interaction.guild_id]),
+                     f"testar-{interaction.guild_id}")
+
+@tree.command(name="terco", description="Inicia o terço em áudio no canal de voz configurado")
+@app_commands.guild_only()
+async def cmd_terco(interaction: discord.Interaction):
+    await interaction.response.send_message("⏳ Iniciando o terço em áudio no canal de voz configurado...")
+    em_segundo_plano(tocar_terco_audio([interaction.guild_id]),
+                     f"terco-{interaction.guild_id}")
+
+@tree.command(name="tertiolatinum", description="Inicia o terço em latim no canal de voz configurado")
+@app_commands.guild_only()
+async def cmd_tertiolatinum(interaction: discord.Interaction):
+    await interaction.response.send_message("⏳ Iniciando o terço em latim no canal de voz configurado...")
+    em_segundo_plano(tocar_terco_audio_latim([interaction.guild_id]),
+                     f"terco-latim-{interaction.guild_id}")
+
+@tree.command(name="voz", description="Sessão de voz desta guild e consumo de recursos")
+@app_commands.guild_only()
+@app_commands.default_permissions(administrator=True)
+@app_commands.checks.has_permissions(administrator=True)
+async def cmd_voz(interaction: discord.Interaction):
+    await interaction.response.defer(ephemeral=True)
+    r = gerenciador_voz.relatorio(interaction.guild_id)
+    linhas = [f"🎧 Sessões ativas nesta guild: **{r['sessoes_ativas']}** · "
+              f"RSS do processo do bot (todas as guilds): {r['rss_processo'] / 2**20:.1f} MB"]
+    for s in r["sessoes"]:
+        linhas.append(f"• {s['rotulo']}: CPU {s['cpu']:.2f}s, {s['quadros']} quadros, "
+                      f"ffmpeg {s['rss_ffmpeg'] / 2**20:.1f} MB, {s['duracao']:.0f}s")
+    await responder(interaction, "\n".join(linhas))
+
+@tree.command(name="travamentos", description="Travamentos recentes do event loop")
+@app_commands.guild_only()
+@app_commands.default_permissions(administrator=True)
+@app_commands.checks.has_permissions(administrator=True)
+async def cmd_travamentos(interaction: discord.Interaction):
+    await interaction.response.defer(ephemeral=True)
+    linhas = [f"⏱️ Travamentos do event loop (limite {vigia.limite * 1000:.0f}ms): {len(vigia.travamentos)}"]
+    for t in vigia.travamentos:
+        ultima = t["pilha"].strip().splitlines()[-2:] if t["pilha"] else []
+        linhas.append(f"• {datetime.fromtimestamp(t['quando'], FUSO_HORARIO):%d/%m %H:%M:%S} – "
+                      f"{t['duracao'] * 1000:.0f}ms\n" + "\n".join(l.strip() for l in ultima))
+    await responder(interaction, "\n".join(linhas))
+
+@tree.command(name="perfil", description="Amostra o event loop e devolve as pilhas mais frequentes")
+@app_commands.describe(segundos="Duração da amostragem")
+@app_commands.guild_only()
+@app_commands.default_permissions(administrator=True)
+@app_commands.checks.has_permissions(administrator=True)
+async def cmd_perfil(interaction: discord.Interaction, segundos: app_commands.Range[int, 1, 60] = 10):
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    contagem = await vigia.perfilar(segundos)
+    if contagem is None:
+        await interaction.followup.send("❌ Já há um perfil em andamento.")
+        return
+    arquivo = discord.File(io.BytesIO(pilhas_agregadas(contagem).encode("utf-8")), filename="perfil.txt")
+    await interaction.followup.send(f"```\n{resumir_perfil(contagem)[:1900]}\n```", file=arquivo)
+
+@tree.command(name="buscar", description="Procura no histórico da liturgia por referência ou palavras")
+@app_commands.describe(consulta='Referência (ex.: Jo 3,16) ou palavras; entre aspas, a frase exata',
+                       parte="Só nesta parte da liturgia")
+@app_commands.choices(parte=[app_commands.Choice(name=nome, value=chave) for chave, nome in PARTES.items()])
+async def cmd_buscar(interaction: discord.Interaction, consulta: str, parte: app_commands.Choice[str] = None):
+    await interaction.response.defer()
+    resultados = await historico.buscar(consulta, parte.value if parte else None)
+    if not resultados:
+        await interaction.followup.send(f"🔎 Nada encontrado no histórico para **{consulta}**.")
+        return
+    linhas = [f"🔎 **{consulta}**: {len(resultados)} resultado(s)"]
+    for r in resultados:
+        data = datetime.strptime(r.data, "%Y-%m-%d")
+        linhas.append(f"• **{data:%d/%m/%Y}** · {PARTES[r.parte]} – {r.cabecalho or 'sem título'}\n> {r.trecho}")
+    await responder(interaction, "\n".join(linhas))
+
+@tree.command(name="desconectar", description="Desconecta o bot do canal de voz")
+@app_commands.guild_only()
+async def cmd_desconectar(interaction: discord.Interaction):
+    await interaction.response.defer()
+    if await gerenciador_voz.desconectar(interaction.guild_id):
+        await interaction.followup.send("🔌 Bot desconectado do canal de voz.")
+    else:
+        await interaction.followup.send("❌ O bot não está conectado a nenhum canal de voz.")
+
+async def main():
+    # Servidor de saúde, agenda e gateway compartilham o mesmo event loop
+    await saude.iniciar()
+    vigia.iniciar()
+    try:
+        async with client:
+            await client.start(TOKEN)
+    finally:
+        agenda.parar()
+        await saude.parar()
+        for tarefa in tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*tarefas, return_exceptions=True)
+        await fechar_sessao()
+        # Gravações pendentes (configuração e entregas) terminam antes de fechar o banco
+        await banco.fechar()
+        historico.fechar()
+        vigia.parar()
+        telemetria.encerrar()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import zlib
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from liturgia_api import buscar_liturgia
+from telemetria import obter_logger, span
+
+FUSO_HORARIO = ZoneInfo("America/Sao_Paulo")
+CACHE_FILE = "liturgia_cache.json.gz"
+
+log = obter_logger("cache")
+
+
+def hoje_sp():
+    return datetime.now(FUSO_HORARIO).date()
+
+
+def chave(dia):
+    return dia.strftime("%Y-%m-%d")
+
+
+class CacheLiturgia:
+    """Cache da liturgia por data (AAAA-MM-DD), em memória e em disco.
+
+    Entradas de dias anteriores a ontem (horário de São Paulo) expiram à meia-noite:
+    guilds a oeste de São Paulo ainda estão no dia anterior por algumas horas.
+    Com um `arquivo` (ArquivoLiturgia), cada dia buscado fica no histórico, e
+    datas já arquivadas são lidas dele em vez de ir às fontes (um dia parcial
+    arquivado ainda passa pelas fontes, e só é usado se elas falharem).
+    Dias parciais não ficam em memória: cada `obter` tenta de novo a fonte completa.
+    """
+
+    def __init__(self, caminho=CACHE_FILE, buscar=buscar_liturgia, arquivo=None):
+        self.caminho = caminho
+        self.buscar = buscar
+        self.arquivo = arquivo
+        self.dias = self._carregar()
+        self._pendentes = {}
+        self._gravando = asyncio.Lock()
+
+    def _carregar(self):
+        if not os.path.exists(self.caminho):
+            return {}
+        try:
+            with gzip.open(self.caminho, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            log.error("Cache da liturgia ilegível, ignorando: %s", e)
+            return {}
+
+    def _salvar(self, conteudo):
+        # Escreve num arquivo temporário próprio e troca, para não corromper o cache
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(self.caminho) or ".", prefix=".cache-",
+                                         delete=False) as f:
+            try:
+                with gzip.GzipFile(fileobj=f, mode="wb") as gz:
+                    gz.write(conteudo)
+            except BaseException:
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, self.caminho)
+
+    def expirar(self):
+        limite = chave(hoje_sp() - timedelta(days=1))
+        vencidas = [k for k in self.dias if k < limite]
+        for k in vencidas:
+            del self.dias[k]
+        return bool(vencidas)
+
+    async def _persistir(self):
+        # A cópia é feita no loop, antes de o dicionário poder mudar; o lock
+        # impede que uma gravação mais antiga termine depois de uma mais nova
+        conteudo = json.dumps(self.dias, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        async with self._gravando:
+            await asyncio.to_thread(self._salvar, conteudo)
+
+    async def obter(self, data=None):
+        """Retorna o bloco 'dia' da data pedida, buscando na API só se não estiver em cache"""
+        data = data or chave(hoje_sp())
+        if self.expirar():
+            await self._persistir()
+        if data in self.dias and not self.dias[data].get("parcial"):
+            return self.dias[data]
+        # Chamadas simultâneas para a mesma data compartilham a mesma busca
+        if data not in self._pendentes:
+            self._pendentes[data] = asyncio.ensure_future(self._buscar_e_guardar(data))
+        return await asyncio.shield(self._pendentes[data])
+
+    async def _buscar_e_guardar(self, data):
+        try:
+            dia = await self._ler_arquivo(data)
+            if dia is None or dia.get("parcial"):
+                try:
+                    with span("buscar_liturgia", data=data):
+                        buscado = await self.buscar(data)
+                except Exception as e:
+                    if dia is None:
+                        raise
+                    log.warning("Fontes indisponíveis para %s; usando o dia parcial arquivado: %s", data, e)
+                else:
+                    dia = buscado
+                    await self._arquivar(data, dia)
+            if dia.get("parcial"):
+                # Não fixa o dia parcial: a próxima chamada tenta a fonte completa de novo
+                if self.dias.pop(data, None) is not None:
+                    await self._persistir()
+                return dia
+            self.dias[data] = dia
+            await self._persistir()
+            return dia
+        finally:
+            self._pendentes.pop(data, None)
+
+    async def _ler_arquivo(self, data):
+        if self.arquivo is None:
+            return None
+        # Registro apagado ou truncado não pode impedir a busca nas fontes
+        try:
+            return await self.arquivo.ler(data)
+        except (OSError, zlib.error, ValueError) as e:
+            log.error("Liturgia de %s ilegível no arquivo; buscando nas fontes: %s", data, e)
+            return None
+
+    async def _arquivar(self, data, dia):
+        if self.arquivo is None:
+            return
+        # O histórico não pode atrasar nem impedir o envio do dia
+        try:
+            await self.arquivo.guardar(data, dia)
+        except Exception as e:
+            log.error("Falha ao arquivar a liturgia de %s: %s", data, e)
+
+    async def pre_carregar_amanha(self):
+        amanha = chave(hoje_sp() + timedelta(days=1))
+        try:
+            await self.obter(amanha)
+            log.info("Liturgia de %s pré-carregada no cache.", amanha)
+        except Exception as e:
+            log.error("Falha ao pré-carregar a liturgia de %s: %s", amanha, e)
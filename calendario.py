@@ -0,0 +1,231 @@
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from telemetria import obter_logger
+
+FUSO_PADRAO = ZoneInfo("America/Sao_Paulo")
+# Anos pré-calculados ("inicio-fim"); datas fora do intervalo são calculadas na hora
+CALENDARIO_ANOS = os.getenv("CALENDARIO_ANOS", "")
+# Domingos do Tempo Comum com os Luminosos em vez dos Gloriosos
+LUMINOSOS_DOMINGO = os.getenv("LUMINOSOS_DOMINGO", "").strip().lower() in ("1", "true", "sim")
+
+log = obter_logger("calendario")
+
+DIAS_PT = [
+    "segunda-feira", "terça-feira", "quarta-feira", "quinta-feira", "sexta-feira", "sábado", "domingo"
+]
+
+# Cada texto aparece uma vez só; os dias apontam para o tipo
+MISTERIOS = {
+    "gozosos": {
+        "nome": "Gozosos",
+        "misterios": (
+            ("A Anunciação do Anjo a Maria", "O anjo Gabriel anuncia a Maria que ela será a Mãe do Salvador. (Lc 1,26-38)"),
+            ("A Visitação de Maria a Isabel", "Maria visita sua prima Isabel, que também espera um filho (João Batista). (Lc 1,39-56)"),
+            ("O Nascimento de Jesus em Belém", "Jesus nasce em um estábulo, em humildade e pobreza. (Lc 2,1-20)"),
+            ("A Apresentação de Jesus no Templo", "Maria e José apresentam Jesus ao Senhor no templo. (Lc 2,22-38)"),
+            ("O Encontro do Menino Jesus no Templo", "Jesus, com 12 anos, é encontrado entre os doutores da Lei. (Lc 2,41-50)"),
+        ),
+    },
+    "dolorosos": {
+        "nome": "Dolorosos",
+        "misterios": (
+            ("A Agonia de Jesus no Horto", "Jesus sua sangue e reza ao Pai antes de ser preso. (Mt 26,36-46)"),
+            ("A Flagelação de Jesus", "Jesus é cruelmente açoitado. (Jo 19,1)"),
+            ("A Coroação de Espinhos", "Soldados zombam de Jesus, coroando-O com espinhos. (Mt 27,27-31)"),
+            ("Jesus Carrega a Cruz até o Calvário", "Jesus carrega Sua cruz até o lugar da crucificação. (Jo 19,17)"),
+            ("A Crucificação e Morte de Jesus", "Jesus morre na cruz para a salvação da humanidade. (Lc 23,33-46)"),
+        ),
+    },
+    "gloriosos": {
+        "nome": "Gloriosos",
+        "misterios": (
+            ("A Ressurreição de Jesus", "Jesus ressuscita dos mortos ao terceiro dia. (Mt 28,1-10)"),
+            ("A Ascensão de Jesus ao Céu", "Jesus sobe aos céus à vista dos apóstolos. (At 1,6-11)"),
+            ("A Vinda do Espírito Santo", "O Espírito Santo desce sobre os apóstolos. (At 2,1-4)"),
+            ("A Assunção de Maria", "Maria é elevada em corpo e alma ao Céu. (Ap 12)"),
+            ("A Coroação de Maria", "Maria é coroada por Deus como Rainha do Céu e da Terra. (Ap 12,1)"),
+        ),
+    },
+    "luminosos": {
+        "nome": "Luminosos",
+        "misterios": (
+            ("O Batismo de Jesus no Jordão", "Jesus é batizado por João Batista e o Espírito Santo desce sobre Ele. (Mt 3,13-17)"),
+            ("As Bodas de Caná", "Jesus realiza seu primeiro milagre, transformando água em vinho. (Jo 2,1-12)"),
+            ("O Anúncio do Reino de Deus", "Jesus prega, cura e chama todos à conversão. (Mc 1,14-15)"),
+            ("A Transfiguração de Jesus", "Jesus aparece em glória com Moisés e Elias no monte Tabor. (Lc 9,28-36)"),
+            ("A Instituição da Eucaristia", "Jesus oferece seu Corpo e Sangue sob o pão e o vinho na Última Ceia. (Lc 22,14-20)"),
+        ),
+    },
+}
+
+TEMPOS = {
+    "advento": "Tempo do Advento",
+    "natal": "Tempo do Natal",
+    "comum": "Tempo Comum",
+    "quaresma": "Tempo da Quaresma",
+    "triduo": "Tríduo Pascal",
+    "pascoa": "Tempo Pascal",
+}
+
+# Segunda a sábado; o domingo depende do tempo litúrgico
+ROTACAO = ("gozosos", "dolorosos", "gloriosos", "luminosos", "dolorosos", "gozosos")
+DOMINGOS = {
+    "advento": "gozosos",
+    "natal": "gozosos",
+    "comum": "luminosos" if LUMINOSOS_DOMINGO else "gloriosos",
+    "quaresma": "dolorosos",
+    "triduo": "dolorosos",
+    "pascoa": "gloriosos",
+}
+
+# Índices do byte de cada dia: tempo (3 bits) | cor (3 bits) | mistérios (2 bits)
+_TIPOS = tuple(MISTERIOS)
+_TEMPOS = tuple(TEMPOS)
+_CORES = ("verde", "roxo", "rosa", "branco", "vermelho")
+_INDICES = {nome: i for nomes in (_TIPOS, _TEMPOS, _CORES) for i, nome in enumerate(nomes)}
+
+
+def pascoa(ano):
+    """Domingo de Páscoa no calendário gregoriano (algoritmo de Meeus/Jones/Butcher)"""
+    a, b, c = ano % 19, ano // 100, ano % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return date(ano, mes, dia + 1)
+
+
+@lru_cache(maxsize=64)
+def _marcos(ano):
+    p = pascoa(ano)
+    natal = date(ano, 12, 25)
+    # 4º domingo do Advento: o último domingo antes do Natal
+    advento = natal - timedelta(days=(natal.weekday() + 1) % 7 or 7) - timedelta(weeks=3)
+    # No Brasil a Epifania é no domingo entre 2 e 8 de janeiro; o Batismo do Senhor
+    # fecha o Tempo do Natal no domingo seguinte (na segunda, se a Epifania cai em 7 ou 8)
+    epifania = date(ano, 1, 2) + timedelta(days=(6 - date(ano, 1, 2).weekday()) % 7)
+    batismo = epifania + timedelta(days=1 if epifania.day >= 7 else 7)
+    return {
+        "batismo": batismo,
+        "cinzas": p - timedelta(days=46),
+        "laetare": p - timedelta(days=21),
+        "ramos": p - timedelta(days=7),
+        "quinta_santa": p - timedelta(days=3),
+        "sexta_santa": p - timedelta(days=2),
+        "pascoa": p,
+        "pentecostes": p + timedelta(days=49),
+        "trindade": p + timedelta(days=56),
+        "corpus_christi": p + timedelta(days=60),
+        "cristo_rei": advento - timedelta(weeks=1),
+        "advento": advento,
+        "gaudete": advento + timedelta(weeks=2),
+        "natal": natal,
+    }
+
+
+def _tempo_e_cor(data):
+    m = _marcos(data.year)
+    if m["advento"] <= data < m["natal"]:
+        return "advento", "rosa" if data == m["gaudete"] else "roxo"
+    if data >= m["natal"] or data <= m["batismo"]:
+        return "natal", "branco"
+    if m["cinzas"] <= data < m["quinta_santa"]:
+        if data == m["laetare"]:
+            return "quaresma", "rosa"
+        return "quaresma", "vermelho" if data == m["ramos"] else "roxo"
+    if m["quinta_santa"] <= data < m["pascoa"]:
+        return "triduo", "vermelho" if data == m["sexta_santa"] else "branco"
+    if m["pascoa"] <= data <= m["pentecostes"]:
+        return "pascoa", "vermelho" if data == m["pentecostes"] else "branco"
+    if data in (m["trindade"], m["corpus_christi"], m["cristo_rei"]):
+        return "comum", "branco"
+    return "comum", "verde"
+
+
+def _codigo(data):
+    tempo, cor = _tempo_e_cor(data)
+    dia_semana = data.weekday()
+    tipo = DOMINGOS[tempo] if dia_semana == 6 else ROTACAO[dia_semana]
+    return _INDICES[tempo] << 5 | _INDICES[cor] << 2 | _INDICES[tipo]
+
+
+@dataclass(frozen=True)
+class DiaLiturgico:
+    data: date
+    tempo: str
+    cor: str
+    misterios: str
+
+    @property
+    def dia_semana(self):
+        return DIAS_PT[self.data.weekday()]
+
+    @property
+    def nome_tempo(self):
+        return TEMPOS[self.tempo]
+
+    @property
+    def terco(self):
+        """{"nome", "misterios"} do tipo de mistérios do dia"""
+        return MISTERIOS[self.misterios]
+
+
+def _ler_anos(texto):
+    if not texto.strip():
+        ano = date.today().year
+        return ano - 1, ano + 10
+    inicio, _, fim = texto.partition("-")
+    return int(inicio), int(fim or inicio)
+
+
+class Calendario:
+    """Tempo, cor e mistérios do terço de cada dia, pré-calculados.
+
+    Um byte por dia desde 1º de janeiro de `inicio` até 31 de dezembro de
+    `fim`: a consulta é uma subtração de ordinais e um índice.
+    """
+
+    def __init__(self, inicio=None, fim=None):
+        if inicio is None:
+            inicio, fim = _ler_anos(CALENDARIO_ANOS)
+        self.inicio, self.fim = inicio, fim if fim is not None else inicio
+        self._base = date(self.inicio, 1, 1).toordinal()
+        total = date(self.fim, 12, 31).toordinal() - self._base + 1
+        self._codigos = bytes(_codigo(date.fromordinal(self._base + i)) for i in range(total))
+        log.debug("Calendário litúrgico de %d a %d: %d dias", self.inicio, self.fim, total)
+
+    def __len__(self):
+        return len(self._codigos)
+
+    def codigo(self, data):
+        indice = data.toordinal() - self._base
+        if 0 <= indice < len(self._codigos):
+            return self._codigos[indice]
+        return _codigo(data)
+
+    def dia(self, data):
+        return _dia(data, self.codigo(data))
+
+    def em(self, momento, fuso=FUSO_PADRAO):
+        """Dia litúrgico do instante `momento` (datetime com fuso) no fuso dado"""
+        return self.dia(momento.astimezone(fuso).date())
+
+    def hoje(self, fuso=FUSO_PADRAO):
+        return self.dia(datetime.now(fuso).date())
+
+
+def _dia(data, codigo):
+    return DiaLiturgico(
+        data, _TEMPOS[codigo >> 5], _CORES[codigo >> 2 & 0b111], _TIPOS[codigo & 0b11]
+    )
+
+
+calendario = Calendario()
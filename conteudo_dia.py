@@ -0,0 +1,182 @@
+from dataclasses import dataclass, field
+from datetime import date
+
+import discord
+
+from calendario import calendario
+from fatiador import agrupar, montar_embeds
+from telemetria import obter_logger, span
+from texto_html import limpar_html
+
+log = obter_logger("conteudo")
+
+RODAPE = "Scriptor Sacrum · O Escriba da Aurora"
+THUMB_SANTA_SE = "https://upload.wikimedia.org/wikipedia/commons/thumb/b/ba/Emblem_of_the_Holy_See_%28no_background%29.svg/1510px-Emblem_of_the_Holy_See_%28no_background%29.svg.png"
+THUMB_TERCO = "https://yata-apix-9da23243-671c-42a8-9014-41a94dafae05.s3-object.locaweb.com.br/ae792e6635b3427f9ab1f5ed4774e121.png"
+
+CORES = {
+    "verde": 0x228B22,
+    "vermelho": 0xB22222,
+    "roxo": 0x800080,
+    "branco": 0xF8F8FF,
+    "rosa": 0xFFC0CB,
+    "preto": 0x111111
+}
+
+@dataclass(frozen=True)
+class ConteudoDia:
+    """Embeds do dia já renderizados, prontos para enviar a qualquer canal"""
+    data: str
+    tipos: tuple
+    embeds: tuple
+    _mensagens: dict = field(default_factory=dict, compare=False, repr=False)
+
+    def mensagens(self, canal_voz=None, tipos=None, horarios=()):
+        """Pares (tipos, kwargs de channel.send), na ordem de envio.
+
+        Os embeds dos tipos pedidos (todos, por padrão) vão juntos no menor número
+        de mensagens; cada par traz os tipos que têm algum embed naquela mensagem.
+        `horarios` (terço, terço em latim, fuso) vão para o aviso do canal de voz.
+        """
+        tipos = self.tipos if tipos is None else tuple(t for t in self.tipos if t in tipos)
+        # Só o aviso do terço muda entre guilds; cada variação é montada uma vez
+        chave = (canal_voz, tuple(horarios), tipos)
+        if chave not in self._mensagens:
+            sequencia = []
+            for tipo, embeds in zip(self.tipos, self.embeds):
+                if tipo not in tipos:
+                    continue
+                if canal_voz and tipo == "terco":
+                    ultimo = dict(embeds[-1])
+                    ultimo["fields"] = [*ultimo["fields"], aviso_latim(canal_voz, *horarios)]
+                    embeds = (*embeds[:-1], ultimo)
+                sequencia.extend((tipo, e) for e in embeds)
+            mensagens = []
+            inicio = 0
+            for grupo in agrupar([e for _, e in sequencia]):
+                parte = sequencia[inicio:inicio + len(grupo)]
+                inicio += len(grupo)
+                mensagens.append((
+                    tuple(dict.fromkeys(t for t, _ in parte)),
+                    {"embeds": [discord.Embed.from_dict(e) for _, e in parte]},
+                ))
+            self._mensagens[chave] = tuple(mensagens)
+        return self._mensagens[chave]
+
+
+def _embed(title, description, color, thumbnail, fields=()):
+    """Embeds (um ou mais) com o texto inteiro, dentro dos limites do Discord"""
+    base = {
+        "type": "rich",
+        "title": title,
+        "color": color,
+        "footer": {"text": RODAPE},
+        "thumbnail": {"url": thumbnail},
+    }
+    return montar_embeds(base, description, fields)
+
+
+def _juntar(*partes):
+    return "\n\n".join(p for p in partes if p).replace("\\n", "\n")
+
+
+def embed_liturgia(dia, data):
+    entry_title = limpar_html(dia.get("entry_title", ""))
+    # Sem cor na fonte, vale a cor do tempo litúrgico
+    color_lit = (dia.get("color") or calendario.dia(date.fromisoformat(data)).cor).lower()
+    date_str = dia.get("date", data)
+
+    log.debug("Dados recebidos: entry_title=%s, color=%s, date=%s", entry_title, color_lit, date_str)
+
+    # Fontes diferentes trazem partes diferentes (o RSS, por exemplo, não tem salmo)
+    readings = dia.get("readings", {})
+    first_reading = readings.get("first_reading") or {}
+    psalm = readings.get("psalm") or {}
+    gospel = readings.get("gospel") or {}
+
+    leitura = _juntar(first_reading.get("head"), first_reading.get("text"), first_reading.get("footer"))
+    salmo = _juntar(psalm.get("title"), psalm.get("response"), "\n".join(psalm.get("content_psalm", [])))
+    evangelho = _juntar(gospel.get("head_title"), gospel.get("text"), gospel.get("footer"))
+
+    descricao = f"{entry_title}\n📅 {date_str}"
+    if color_lit:
+        descricao += f"\n🕯️ Cor litúrgica: **{color_lit.capitalize()}**"
+    campos = [
+        ("📖 Letanía da Palavra", leitura),
+        ("🎶 Salmodia Real", salmo),
+        ("✝️ Evangelho Sagrado", evangelho),
+    ]
+    return _embed(
+        "📜 Proclamação da Liturgia",
+        descricao,
+        CORES.get(color_lit or "branco", 0xAAAAAA),
+        THUMB_SANTA_SE,
+        [(nome, texto) for nome, texto in campos if texto],
+    )
+
+
+def embed_meditacao(dia):
+    # Se houver meditação no campo "extra"
+    extra = dia.get("extra", [])
+    meditacao = "\n".join([limpar_html(l) for l in extra if l.strip()])
+    if not meditacao:
+        return []
+    return _embed("🕊️ Meditação do Dia", meditacao, 0x7FDBFF, THUMB_SANTA_SE)
+
+
+def embed_terco(dia):
+    """Embeds do terço de um calendario.DiaLiturgico"""
+    terco = dia.terco
+    partes = [f"**Mistérios {terco['nome']}**\n_{dia.nome_tempo}_\n\n"]
+    for idx, (titulo, descricao) in enumerate(terco["misterios"], 1):
+        partes.append(f"{idx}. **{titulo}**\n{descricao}\n\n")
+    if dia.tempo == "comum" and dia.data.weekday() == 6 and dia.misterios != "luminosos":
+        partes.append("\n_Observação: Pode-se rezar os Luminosos no Tempo Comum, se preferir._")
+    return _embed(
+        f"📿 Terço do Dia – {dia.dia_semana.capitalize()}",
+        "".join(partes),
+        0xFFD700,
+        THUMB_TERCO,
+    )
+
+
+# Nomes de fusos com acento, para o aviso; os outros saem do próprio nome IANA
+NOMES_FUSO = {
+    "America/Sao_Paulo": "São Paulo",
+    "America/Belem": "Belém",
+    "America/Maceio": "Maceió",
+    "America/Cuiaba": "Cuiabá",
+    "America/Araguaina": "Araguaína",
+}
+
+
+def _hora(horario):
+    """ "18:00" -> "18h", "18:30" -> "18h30" """
+    horas, _, minutos = horario.partition(":")
+    return f"{int(horas)}h" + (minutos if minutos.strip("0") else "")
+
+
+def _nome_fuso(fuso):
+    return NOMES_FUSO.get(fuso) or fuso.rsplit("/", 1)[-1].replace("_", " ")
+
+
+def aviso_latim(canal_nome, horario_terco="18:00", horario_latim="22:00", fuso="America/Sao_Paulo"):
+    # Aviso sobre o terço em latim, no canal de voz e nos horários configurados da guild
+    aviso = (
+        f"🔔 O terço já foi transmitido hoje em latim neste canal de voz: **{canal_nome}**.\n"
+        f"Será transmitido novamente em português às **{_hora(horario_terco)}** e em latim às "
+        f"**{_hora(horario_latim)}** (horário de {_nome_fuso(fuso)}) no mesmo canal."
+    )
+    return {"name": "ℹ️ Aviso sobre o Terço em Latim", "value": aviso, "inline": False}
+
+
+def renderizar_dia(dia, data):
+    """Transforma os dados da API nos embeds do dia, uma única vez por dia"""
+    with span("renderizar_dia", data=data):
+        embeds = [
+            ("liturgia", embed_liturgia(dia, data)),
+            ("meditacao", embed_meditacao(dia)),
+            ("terco", embed_terco(calendario.dia(date.fromisoformat(data)))),
+        ]
+    embeds = [(t, tuple(e)) for t, e in embeds if e]
+    return ConteudoDia(data, tuple(t for t, _ in embeds), tuple(e for _, e in embeds))
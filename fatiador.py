@@ -0,0 +1,122 @@
+# Limites da API do Discord, em caracteres
+LIMITE_MENSAGEM = 2000
+LIMITE_TITULO = 256
+LIMITE_DESCRICAO = 4096
+LIMITE_NOME_CAMPO = 256
+LIMITE_CAMPO = 1024
+LIMITE_RODAPE = 2048
+# Soma de título, descrição, campos e rodapé de todos os embeds de uma mensagem
+LIMITE_EMBEDS = 6000
+CAMPOS_POR_EMBED = 25
+EMBEDS_POR_MENSAGEM = 10
+
+# Onde cortar, da fronteira preferida para a pior: parágrafo, linha, frase, palavra
+FRONTEIRAS = ("\n\n", "\n", ". ", "! ", "? ", "; ", ", ", " ")
+CONTINUACAO = " (cont.)"
+
+
+def dividir(texto, limite):
+    """Divide o texto em partes de até `limite` caracteres, numa única passada.
+
+    Cada parte termina na melhor fronteira (parágrafo, linha, frase, palavra)
+    da segunda metade do limite. Como cada corte avança no mínimo limite/2, o
+    custo total é linear; uma palavra maior que o limite é cortada no meio.
+    """
+    texto = texto.strip()
+    partes = []
+    inicio, fim_texto = 0, len(texto)
+    while fim_texto - inicio > limite:
+        fim = inicio + limite
+        corte = fim
+        for fronteira in FRONTEIRAS:
+            # Até fim + 1: a pontuação no último caractere, seguida de espaço, também serve
+            i = texto.rfind(fronteira, inicio + limite // 2, fim + 1)
+            if i != -1:
+                # A pontuação fica na parte de cima; o espaço/quebra é descartado
+                corte = i + len(fronteira.rstrip())
+                break
+        partes.append(texto[inicio:corte].rstrip())
+        inicio = corte
+        while inicio < fim_texto and texto[inicio].isspace():
+            inicio += 1
+    if inicio < fim_texto:
+        partes.append(texto[inicio:])
+    return partes
+
+
+def tamanho_embed(embed):
+    """Caracteres do embed que contam para o limite de 6000 por mensagem"""
+    return (
+        len(embed.get("title") or "")
+        + len(embed.get("description") or "")
+        + sum(len(c["name"]) + len(c["value"]) for c in embed.get("fields", ()))
+        + len((embed.get("footer") or {}).get("text") or "")
+        + len((embed.get("author") or {}).get("name") or "")
+    )
+
+
+def montar_embeds(base, descricao="", campos=()):
+    """Distribui descrição e campos (nome, texto) em quantos embeds forem precisos.
+
+    `base` traz título, cor, rodapé etc. O título e a miniatura ficam no primeiro
+    embed, o rodapé no último; textos longos continuam em campos "(cont.)".
+    """
+    base = dict(base)
+    base.pop("description", None)
+    base.pop("fields", None)
+    titulo = (base.pop("title", None) or "")[:LIMITE_TITULO]
+    rodape = base.pop("footer", None)
+    miniatura = base.pop("thumbnail", None)
+    # O rodapé vai no último embed, mas como não se sabe qual será, todos reservam espaço
+    reserva = len((rodape or {}).get("text") or "")
+    orcamento = LIMITE_EMBEDS - reserva
+
+    embeds = []
+    atual = None
+
+    def novo():
+        nonlocal atual
+        atual = dict(base, fields=[])
+        if not embeds:
+            if titulo:
+                atual["title"] = titulo
+            if miniatura:
+                atual["thumbnail"] = miniatura
+        embeds.append(atual)
+        return atual
+
+    novo()
+    if descricao:
+        for i, parte in enumerate(dividir(descricao, min(LIMITE_DESCRICAO, orcamento - len(titulo)))):
+            if i:
+                novo()
+            atual["description"] = parte
+
+    for nome, texto in campos:
+        nome = nome[:LIMITE_NOME_CAMPO - len(CONTINUACAO)]
+        for i, parte in enumerate(dividir(texto, LIMITE_CAMPO)):
+            campo = {"name": nome + CONTINUACAO if i else nome, "value": parte, "inline": False}
+            if (len(atual["fields"]) >= CAMPOS_POR_EMBED
+                    or tamanho_embed(atual) + len(campo["name"]) + len(parte) > orcamento):
+                novo()
+            atual["fields"].append(campo)
+
+    if rodape:
+        atual["footer"] = rodape
+    return embeds
+
+
+def agrupar(embeds):
+    """Agrupa embeds, em ordem, no menor número de mensagens (10 e 6000 caracteres por mensagem)"""
+    mensagens = []
+    atual, tamanho = [], 0
+    for embed in embeds:
+        n = tamanho_embed(embed)
+        if atual and (len(atual) >= EMBEDS_POR_MENSAGEM or tamanho + n > LIMITE_EMBEDS):
+            mensagens.append(atual)
+            atual, tamanho = [], 0
+        atual.append(embed)
+        tamanho += n
+    if atual:
+        mensagens.append(atual)
+    return mensagens
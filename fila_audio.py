@@ -0,0 +1,139 @@
+import os
+import queue
+import threading
+
+import discord
+
+from audio_opus import FFMPEG, fonte_opus, opus_em_cache
+from calendario import MISTERIOS
+from telemetria import obter_logger
+
+DIRETORIO_SEGMENTOS = "audio/segmentos"
+# Quadros de 20 ms lidos adiante: 250 quadros = 5 segundos
+QUADROS_ADIANTE = 250
+
+_FIM = object()
+log = obter_logger("fila_audio")
+
+
+def roteiro_terco(tipo, idioma, diretorio=DIRETORIO_SEGMENTOS):
+    """Lista ordenada de segmentos do terço, ou None se faltar algum arquivo.
+
+    Layout em disco (o que está em `comum/` serve aos dois idiomas):
+        comum/vinheta.mp3
+        <idioma>/abertura.mp3, <idioma>/dezena.mp3, <idioma>/encerramento.mp3
+        <idioma>/misterios/<tipo>_<n>.mp3   (anúncio do n-ésimo mistério)
+    A dezena (Pai-Nosso, dez Ave-Marias e Glória) é a mesma nos cinco mistérios.
+    """
+    tipo = tipo.lower()
+    quantidade = len(MISTERIOS[tipo]["misterios"])
+    base = os.path.join(diretorio, idioma)
+    vinheta = os.path.join(diretorio, "comum", "vinheta.mp3")
+    segmentos = [vinheta, os.path.join(base, "abertura.mp3")]
+    for n in range(1, quantidade + 1):
+        segmentos.append(os.path.join(base, "misterios", f"{tipo}_{n}.mp3"))
+        segmentos.append(os.path.join(base, "dezena.mp3"))
+    segmentos += [os.path.join(base, "encerramento.mp3"), vinheta]
+    faltando = [s for s in segmentos if not os.path.exists(s)]
+    if faltando:
+        log.debug("Segmentos ausentes para %s/%s: %s", tipo, idioma, faltando[:3])
+        return None
+    return segmentos
+
+
+class FilaAudio(discord.AudioSource):
+    """Toca uma lista de segmentos em sequência, sem pausa entre eles.
+
+    Uma thread lê os quadros adiante num buffer limitado, então o próximo
+    segmento (inclusive a partida de um ffmpeg, se não houver Opus em cache)
+    já está pronto quando o atual termina.
+    """
+
+    def __init__(self, segmentos, executavel=FFMPEG, adiante=QUADROS_ADIANTE, inicio=0):
+        self.segmentos = list(segmentos)
+        self.executavel = executavel
+        # Todos os segmentos precisam ser do mesmo tipo (Opus ou PCM)
+        self.opus = all(opus_em_cache(s) for s in self.segmentos)
+        self.buffer = queue.Queue(maxsize=adiante)
+        self.atual = 0
+        self.posicao = 0
+        self.inicio = inicio
+        self._terminou = False
+        self._parar = threading.Event()
+        self._leitor = threading.Thread(target=self._ler_adiante, daemon=True)
+        self._leitor.start()
+
+    def _abrir(self, caminho):
+        if self.opus:
+            return fonte_opus(caminho)
+        return discord.FFmpegPCMAudio(executable=self.executavel, source=caminho)
+
+    def _colocar(self, item):
+        while not self._parar.is_set():
+            try:
+                self.buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _pular(fonte, quadros):
+        # O armazém mapeado busca em O(1); as demais fontes avançam lendo
+        if hasattr(fonte, "buscar"):
+            fonte.buscar(quadros)
+            return
+        for _ in range(quadros):
+            if not fonte.read():
+                break
+
+    def _ler_adiante(self):
+        try:
+            for indice, caminho in enumerate(self.segmentos):
+                fonte = self._abrir(caminho)
+                try:
+                    if indice == 0 and self.inicio:
+                        self._pular(fonte, self.inicio)
+                    while not self._parar.is_set():
+                        quadro = fonte.read()
+                        if not quadro:
+                            break
+                        if not self._colocar((indice, quadro)):
+                            return
+                finally:
+                    fonte.cleanup()
+        except Exception as e:
+            log.error("Falha ao ler segmento de áudio: %s", e)
+        finally:
+            self._colocar(_FIM)
+
+    def read(self):
+        if self._terminou:
+            return b""
+        item = self.buffer.get()
+        if item is _FIM:
+            self._terminou = True
+            return b""
+        indice, quadro = item
+        if indice != self.atual:
+            self.atual, self.posicao = indice, 0
+        self.posicao += 1
+        return quadro
+
+    def is_opus(self):
+        return self.opus
+
+    def retomar(self):
+        """Nova fila a partir do quadro onde esta parou, para continuar após reconectar"""
+        inicio = self.posicao + (self.inicio if self.atual == 0 else 0)
+        return FilaAudio(self.segmentos[self.atual:], self.executavel, self.buffer.maxsize, inicio)
+
+    def cleanup(self):
+        self._terminou = True
+        self._parar.set()
+        # Libera o leitor caso esteja bloqueado no buffer cheio
+        while not self.buffer.empty():
+            try:
+                self.buffer.get_nowait()
+            except queue.Empty:
+                break
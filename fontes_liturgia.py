@@ -0,0 +1,224 @@
+import asyncio
+import time
+
+import aiohttp
+from lxml import etree
+
+from liturgia_api import API_URL, ErroApi, buscar_liturgia, obter_sessao
+from rss_liturgia import URL as RSS_URL, LeitorItemRss, data_do_item, item_para_dia
+from telemetria import obter_logger, span
+
+# Sem histórico, a fonte secundária entra depois deste atraso (segundos)
+ATRASO_HEDGE = 2.0
+ATRASO_HEDGE_MINIMO = 0.5
+# Peso das amostras novas nas médias móveis de latência e de erro
+PESO = 0.2
+# Acima desta taxa de erro, a fonte completa perde a preferência e entra pelo custo
+LIMITE_ERRO = 0.5
+
+log = obter_logger("fontes")
+
+
+class ErroFonte(Exception):
+    pass
+
+
+class DataIndisponivel(ErroFonte):
+    """A fonte respondeu, mas não tem a data pedida (o RSS só tem o dia corrente)"""
+
+
+class Estatisticas:
+    def __init__(self):
+        self.latencia = None
+        self.taxa_erro = 0.0
+        self.pedidos = 0
+        self.erros = 0
+        self.canceladas = 0
+
+    def registrar(self, duracao, ok):
+        self.pedidos += 1
+        if ok:
+            self.latencia = duracao if self.latencia is None else (1 - PESO) * self.latencia + PESO * duracao
+        else:
+            self.erros += 1
+        self.taxa_erro = (1 - PESO) * self.taxa_erro + PESO * (0.0 if ok else 1.0)
+
+    def registrar_cancelada(self, duracao):
+        # Perdeu o hedge: a latência real é de pelo menos `duracao`, e só isso se sabe
+        self.pedidos += 1
+        self.canceladas += 1
+        if self.latencia is None or duracao > self.latencia:
+            self.latencia = duracao if self.latencia is None else (1 - PESO) * self.latencia + PESO * duracao
+
+    @property
+    def saudavel(self):
+        return self.taxa_erro < LIMITE_ERRO
+
+    @property
+    def custo(self):
+        # Latência esperada penalizada pelos erros; fonte sem histórico fica no meio da fila
+        latencia = ATRASO_HEDGE if self.latencia is None else self.latencia
+        return latencia * (1 + 4 * self.taxa_erro)
+
+
+class FonteApiJson:
+    nome = "api"
+    # Traz salmo, segunda leitura e cor
+    completa = True
+
+    def __init__(self, url=API_URL):
+        self.url = url
+
+    async def buscar(self, data):
+        return await buscar_liturgia(data, self.url)
+
+
+class FonteRss:
+    """Palavra do Dia do Vatican News; o feed só tem o dia corrente.
+
+    Usa GET condicional (ETag / If-Modified-Since): com o feed inalterado, o
+    servidor responde 304 e o último item lido é reaproveitado sem parsing.
+    """
+
+    nome = "rss"
+    completa = False
+
+    def __init__(self, url=RSS_URL):
+        self.url = url
+        self.etag = None
+        self.modificado = None
+        self.item = None
+
+    def _cabecalhos(self):
+        if self.item is None:
+            return {}
+        cabecalhos = {}
+        if self.etag:
+            cabecalhos["If-None-Match"] = self.etag
+        if self.modificado:
+            cabecalhos["If-Modified-Since"] = self.modificado
+        return cabecalhos
+
+    async def _ler_item(self):
+        try:
+            with span("rss_get", url=self.url) as atributos:
+                async with obter_sessao().get(self.url, headers=self._cabecalhos()) as resp:
+                    atributos["status"] = resp.status
+                    if resp.status == 304:
+                        log.debug("RSS não modificado (304), reaproveitando o último item")
+                        return self.item
+                    if resp.status != 200:
+                        raise ErroFonte(f"Status do RSS: {resp.status}")
+                    # Lê o corpo em pedaços e para assim que o primeiro item estiver completo
+                    leitor = LeitorItemRss()
+                    async for pedaco in resp.content.iter_chunked(16384):
+                        if leitor.alimentar(pedaco):
+                            break
+                    if leitor.item is not None:
+                        self.etag = resp.headers.get("ETag")
+                        self.modificado = resp.headers.get("Last-Modified")
+                        self.item = leitor.item
+                    return leitor.item
+        except (aiohttp.ClientError, asyncio.TimeoutError, etree.XMLSyntaxError) as e:
+            raise ErroFonte(f"Falha ao ler o RSS: {e!r}")
+
+    async def buscar(self, data):
+        item = await self._ler_item()
+        if item is None:
+            raise ErroFonte("RSS sem itens")
+        if data_do_item(item) != data:
+            raise DataIndisponivel(f"RSS traz {data_do_item(item)}, não {data}")
+        with span("rss_item"):
+            return item_para_dia(item)
+
+
+class MotorFontes:
+    """Busca a liturgia em várias fontes, com pedidos "hedged".
+
+    As fontes completas e saudáveis vão primeiro, depois as outras, cada grupo
+    pelo custo; se a primeira não responder dentro do atraso de hedge, a próxima
+    é disparada em paralelo e vale a primeira resposta completa. Uma resposta
+    parcial (RSS) fica de reserva e só é devolvida se nenhuma fonte completa
+    responder.
+    """
+
+    def __init__(self, fontes, atraso_hedge=None):
+        self.fontes = list(fontes)
+        self.atraso_hedge = atraso_hedge
+        self.estatisticas = {f.nome: Estatisticas() for f in self.fontes}
+
+    def ordem(self):
+        def chave(fonte):
+            estatisticas = self.estatisticas[fonte.nome]
+            return not (fonte.completa and estatisticas.saudavel), estatisticas.custo
+
+        return sorted(self.fontes, key=chave)
+
+    def _atraso(self, fonte):
+        if self.atraso_hedge is not None:
+            return self.atraso_hedge
+        latencia = self.estatisticas[fonte.nome].latencia
+        return ATRASO_HEDGE if latencia is None else max(ATRASO_HEDGE_MINIMO, 2 * latencia)
+
+    async def _medir(self, fonte, data):
+        inicio = time.perf_counter()
+        try:
+            dia = await fonte.buscar(data)
+        except asyncio.CancelledError:
+            self.estatisticas[fonte.nome].registrar_cancelada(time.perf_counter() - inicio)
+            raise
+        except DataIndisponivel:
+            # Não diz nada sobre a saúde da fonte (ex.: pré-carregar o dia seguinte no RSS)
+            raise
+        except Exception:
+            self.estatisticas[fonte.nome].registrar(time.perf_counter() - inicio, False)
+            raise
+        self.estatisticas[fonte.nome].registrar(time.perf_counter() - inicio, True)
+        return dia
+
+    async def buscar(self, data):
+        fila = self.ordem()
+        em_voo = {}
+        erros = []
+        reserva = None
+        try:
+            while fila or em_voo:
+                if fila:
+                    fonte = fila.pop(0)
+                    em_voo[asyncio.ensure_future(self._medir(fonte, data))] = fonte
+                    espera = self._atraso(fonte) if fila else None
+                else:
+                    espera = None
+                feitas, _ = await asyncio.wait(em_voo, timeout=espera, return_when=asyncio.FIRST_COMPLETED)
+                for tarefa in feitas:
+                    fonte = em_voo.pop(tarefa)
+                    if tarefa.exception() is None:
+                        dia = tarefa.result()
+                        if fonte.completa and not dia.get("parcial"):
+                            log.debug("Liturgia de %s obtida pela fonte '%s'", data, fonte.nome)
+                            return dia
+                        # Parcial: guarda e continua esperando as fontes completas
+                        log.info("Fonte '%s' trouxe só parte de %s; aguardando as completas", fonte.nome, data)
+                        reserva = reserva or (fonte, dia)
+                        continue
+                    erro = tarefa.exception()
+                    erros.append(f"{fonte.nome}: {erro}")
+                    if isinstance(erro, DataIndisponivel):
+                        log.info("Fonte '%s' sem a data pedida: %s", fonte.nome, erro)
+                    else:
+                        log.error("Fonte '%s' falhou: %s", fonte.nome, erro)
+        finally:
+            for tarefa in em_voo:
+                tarefa.cancel()
+        if reserva is not None:
+            fonte, dia = reserva
+            log.warning("Nenhuma fonte completa respondeu para %s; usando a parcial '%s'", data, fonte.nome)
+            return dia
+        raise ErroApi("Todas as fontes falharam (" + "; ".join(erros) + ")")
+
+    def resumo(self):
+        return {
+            nome: {"latencia": e.latencia, "taxa_erro": e.taxa_erro, "pedidos": e.pedidos, "erros": e.erros,
+                   "canceladas": e.canceladas}
+            for nome, e in self.estatisticas.items()
+        }
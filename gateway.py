@@ -0,0 +1,105 @@
+import os
+
+import discord
+
+from telemetria import obter_logger
+
+# Vazio: um único cliente sem shards; "auto": o Discord sugere quantos; um número fixa a contagem
+SHARD_COUNT = os.getenv("SHARD_COUNT", "").strip().lower()
+# "minimo": só guilds e estados de voz, sem cache de mensagens nem de canais de texto;
+# "completo": intents e caches padrão do discord.py
+PERFIL_CACHE = os.getenv("PERFIL_CACHE", "minimo").strip().lower()
+
+log = obter_logger("gateway")
+
+
+def intents_minimos():
+    # Comandos de barra chegam sem intent nenhum; guilds e voz bastam para o terço em áudio
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.voice_states = True
+    return intents
+
+
+# A poda usa métodos internos do Guild (conferidos no discord.py 2.0 a 2.7); em
+# outra versão, ou se sumirem, o cache fica completo: gasta mais memória, mas funciona
+_INTERNOS = ("_remove_channel", "_remove_thread", "_clear_threads")
+PODA_SUPORTADA = discord.version_info.major == 2 and all(hasattr(discord.Guild, n) for n in _INTERNOS)
+
+
+def _dispensavel(canal):
+    return not isinstance(canal, (discord.VoiceChannel, discord.StageChannel))
+
+
+def podar(guild):
+    """Tira do cache os canais que o bot nunca consulta.
+
+    Textos vão por PartialMessageable; só os canais de voz (e os membros
+    que estão neles) precisam existir no cache.
+    """
+    for canal in [c for c in guild.channels if _dispensavel(c)]:
+        guild._remove_channel(canal)
+    guild._clear_threads()
+
+
+def podar_canal(canal):
+    """Poda só o canal que acabou de ser criado"""
+    if _dispensavel(canal):
+        canal.guild._remove_channel(canal)
+
+
+class _CacheMinimo:
+    podar_cache = False
+
+    async def on_guild_available(self, guild):
+        if self.podar_cache:
+            podar(guild)
+
+    async def on_guild_join(self, guild):
+        if self.podar_cache:
+            podar(guild)
+
+    async def on_guild_channel_create(self, canal):
+        if self.podar_cache:
+            podar_canal(canal)
+
+    async def on_thread_create(self, thread):
+        if self.podar_cache:
+            thread.guild._remove_thread(thread)
+
+
+class Cliente(_CacheMinimo, discord.Client):
+    pass
+
+
+class ClienteShards(_CacheMinimo, discord.AutoShardedClient):
+    pass
+
+
+def opcoes_cliente(perfil=PERFIL_CACHE):
+    if perfil == "completo":
+        return {"intents": discord.Intents.default()}
+    intents = intents_minimos()
+    return {
+        "intents": intents,
+        # Só os membros em canais de voz: é o que canal_vazio e /definirvoz consultam
+        "member_cache_flags": discord.MemberCacheFlags.from_intents(intents),
+        "max_messages": None,
+        "chunk_guilds_at_startup": False,
+    }
+
+
+def criar_cliente(shards=SHARD_COUNT, perfil=PERFIL_CACHE):
+    opcoes = opcoes_cliente(perfil)
+    if not shards:
+        cliente = Cliente(**opcoes)
+    else:
+        if shards != "auto":
+            opcoes["shard_count"] = int(shards)
+        cliente = ClienteShards(**opcoes)
+    cliente.podar_cache = perfil != "completo" and PODA_SUPORTADA
+    if perfil != "completo" and not PODA_SUPORTADA:
+        log.warning("discord.py %s sem os métodos internos usados na poda; o cache de canais fica completo",
+                    discord.__version__)
+    log.info("Cliente do Discord: shards=%s, perfil de cache %s", shards or "nenhum", perfil)
+    return cliente
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import os
+import random
+import aiohttp
+
+from telemetria import obter_logger, span
+
+API_URL = os.getenv("LITURGIA_API_URL", "https://api-liturgia-diaria.vercel.app/")
+
+# Tempos limite (segundos) e política de novas tentativas
+TIMEOUT_CONEXAO = 5
+TIMEOUT_LEITURA = 15
+TENTATIVAS = 3
+ESPERA_BASE = 0.5
+ESPERA_MAXIMA = 8.0
+LIMITE_CONEXOES = 20
+
+_sessao = None
+log = obter_logger("api")
+
+
+class ErroApi(Exception):
+    pass
+
+
+def obter_sessao():
+    """Retorna a sessão HTTP compartilhada, criando-a na primeira chamada"""
+    global _sessao
+    if _sessao is None or _sessao.closed:
+        timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=TIMEOUT_CONEXAO, sock_read=TIMEOUT_LEITURA
+        )
+        connector = aiohttp.TCPConnector(limit=LIMITE_CONEXOES, ttl_dns_cache=300)
+        _sessao = aiohttp.ClientSession(timeout=timeout, connector=connector)
+    return _sessao
+
+
+async def fechar_sessao():
+    global _sessao
+    if _sessao is not None and not _sessao.closed:
+        await _sessao.close()
+    _sessao = None
+
+
+def _espera(tentativa):
+    # Backoff exponencial com jitter completo
+    return random.uniform(0, min(ESPERA_MAXIMA, ESPERA_BASE * (2 ** tentativa)))
+
+
+async def buscar_json(url, params=None, tentativas=TENTATIVAS):
+    """GET com timeouts e novas tentativas; erros 4xx não são repetidos"""
+    ultimo_erro = None
+    for tentativa in range(tentativas):
+        try:
+            with span("api_get", url=url, tentativa=tentativa + 1) as atributos:
+                async with obter_sessao().get(url, params=params) as resp:
+                    atributos["status"] = resp.status
+                    corpo = await resp.read() if resp.status == 200 else None
+            if corpo is not None:
+                with span("api_json", bytes=len(corpo)):
+                    return json.loads(corpo)
+            ultimo_erro = ErroApi(f"Status da API: {resp.status}")
+            if 400 <= resp.status < 500 and resp.status != 429:
+                break
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            ultimo_erro = ErroApi(f"Falha de rede: {e!r}")
+        except ValueError as e:
+            ultimo_erro = ErroApi(f"JSON inválido: {e}")
+        if tentativa + 1 < tentativas:
+            espera = _espera(tentativa)
+            log.debug("Tentativa %d falhou (%s); nova tentativa em %.2fs", tentativa + 1, ultimo_erro, espera)
+            await asyncio.sleep(espera)
+    raise ultimo_erro
+
+
+async def buscar_liturgia(data, url=API_URL):
+    """Busca a liturgia do dia (data no formato AAAA-MM-DD) e retorna o bloco 'today'"""
+    dados = await buscar_json(url, params={"date": data})
+    try:
+        return dados["today"]
+    except (KeyError, TypeError):
+        raise ErroApi("Resposta da API sem o campo 'today'")
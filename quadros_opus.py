@@ -0,0 +1,100 @@
+import mmap
+import os
+import threading
+from array import array
+
+import discord
+from discord.oggparse import OggStream
+
+# Um quadro Opus do Discord tem 20 ms
+QUADROS_POR_SEGUNDO = 50
+
+_armazens = {}
+_lock = threading.Lock()
+
+
+def caminhos(base):
+    return base + ".quadros", base + ".idx"
+
+
+def empacotar(ogg, base=None):
+    """Extrai os pacotes Opus de um Ogg para `base.quadros` + índice de offsets `base.idx`"""
+    base = base or os.path.splitext(ogg)[0]
+    arquivo_quadros, arquivo_indice = caminhos(base)
+    if os.path.exists(arquivo_quadros) and os.path.exists(arquivo_indice):
+        return base
+    offsets = array("Q", [0])
+    with open(ogg, "rb") as entrada, open(arquivo_quadros + ".tmp", "wb") as saida:
+        for pacote in OggStream(entrada).iter_packets():
+            if pacote.startswith((b"OpusHead", b"OpusTags")):
+                continue
+            saida.write(pacote)
+            offsets.append(offsets[-1] + len(pacote))
+    with open(arquivo_indice + ".tmp", "wb") as f:
+        offsets.tofile(f)
+    # O índice é trocado por último: se existir, os quadros estão completos
+    os.replace(arquivo_quadros + ".tmp", arquivo_quadros)
+    os.replace(arquivo_indice + ".tmp", arquivo_indice)
+    return base
+
+
+class ArmazemQuadros:
+    """Quadros Opus de um áudio, mapeados em memória e compartilhados entre sessões"""
+
+    def __init__(self, base):
+        self.base = base
+        arquivo_quadros, arquivo_indice = caminhos(base)
+        with open(arquivo_quadros, "rb") as f:
+            self._dados = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(arquivo_indice, "rb") as f:
+            self._mapa_indice = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.offsets = memoryview(self._mapa_indice).cast("Q")
+        self.total = len(self.offsets) - 1
+
+    def quadro(self, i):
+        # bytes, não memoryview: a cifragem do discord.py (DAVE encrypt_opus) exige bytes.
+        # A fatia do mmap copia só o pacote (~160 bytes); o arquivo continua compartilhado
+        return self._dados[self.offsets[i]:self.offsets[i + 1]]
+
+    def indice_em(self, segundos):
+        return min(self.total, max(0, int(segundos * QUADROS_POR_SEGUNDO)))
+
+
+def abrir_armazem(base):
+    """Um único ArmazemQuadros por arquivo, reaproveitado por todas as sessões"""
+    with _lock:
+        armazem = _armazens.get(base)
+        if armazem is None:
+            armazem = _armazens[base] = ArmazemQuadros(base)
+        return armazem
+
+
+def armazem_disponivel(base):
+    return all(os.path.exists(c) for c in caminhos(base))
+
+
+class LeitorQuadros(discord.AudioSource):
+    """Fonte de áudio que lê quadros do armazém a partir de uma posição (busca em O(1))"""
+
+    def __init__(self, armazem, posicao=0):
+        self.armazem = armazem
+        self.posicao = posicao
+
+    def buscar(self, indice):
+        self.posicao = min(max(0, indice), self.armazem.total)
+
+    def read(self):
+        if self.posicao >= self.armazem.total:
+            return b""
+        quadro = self.armazem.quadro(self.posicao)
+        self.posicao += 1
+        return quadro
+
+    def is_opus(self):
+        return True
+
+    def retomar(self):
+        """Nova fonte no ponto onde esta parou, para continuar após reconectar"""
+        if self.posicao >= self.armazem.total:
+            return None
+        return LeitorQuadros(self.armazem, self.posicao)
@@ -0,0 +1,86 @@
+import time
+
+from telemetria import obter_logger
+
+log = obter_logger("registro")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS entregas (
+    guild_id TEXT NOT NULL,
+    channel_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    enviado_em REAL NOT NULL,
+    PRIMARY KEY (guild_id, channel_id, data, tipo)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entregas_data ON entregas (data);
+"""
+
+
+class RegistroEntregas:
+    """Registro persistente do que já foi entregue: (guild, canal, data, tipo).
+
+    As consultas são feitas num conjunto em memória com as datas recentes; a
+    gravação usa a mesma thread, o mesmo arquivo e as mesmas tarefas do
+    BancoConfig (que as espera ao fechar). Se a gravação falha, as entregas
+    saem também da memória, que fica igual ao banco.
+    """
+
+    def __init__(self, banco, desde):
+        self.banco = banco
+        self._pendentes = []
+        self._gravando = False
+        self.enviados = banco._executor.submit(self._abrir, banco._conexao, desde).result()
+
+    @staticmethod
+    def _abrir(conexao, desde):
+        conexao.executescript(ESQUEMA)
+        cursor = conexao.execute(
+            "SELECT guild_id, channel_id, data, tipo FROM entregas WHERE data >= ?", (desde,)
+        )
+        return set(cursor)
+
+    def ja_enviado(self, guild_id, channel_id, data, tipo):
+        return (str(guild_id), str(channel_id), data, tipo) in self.enviados
+
+    def pendentes(self, guild_id, channel_id, data, tipos):
+        return [t for t in tipos if not self.ja_enviado(guild_id, channel_id, data, t)]
+
+    def expirar(self, desde):
+        """Descarta da memória as datas anteriores a `desde` (o histórico fica no banco)"""
+        self.enviados = {k for k in self.enviados if k[2] >= desde}
+
+    @staticmethod
+    def _gravar_lote(conexao, linhas):
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            conexao.executemany(
+                "INSERT OR IGNORE INTO entregas (guild_id, channel_id, data, tipo, enviado_em) VALUES (?, ?, ?, ?, ?)",
+                linhas,
+            )
+            conexao.execute("COMMIT")
+        except Exception:
+            conexao.execute("ROLLBACK")
+            raise
+
+    async def _gravar(self):
+        try:
+            while self._pendentes:
+                lote, self._pendentes = self._pendentes, []
+                try:
+                    await self.banco.executar(self._gravar_lote, lote)
+                except Exception as e:
+                    log.error("Falha ao gravar %d entregas no registro: %s", len(lote), e)
+                    self.enviados.difference_update(linha[:4] for linha in lote)
+        finally:
+            self._gravando = False
+
+    def marcar(self, guild_id, channel_id, data, tipo):
+        chave = (str(guild_id), str(channel_id), data, tipo)
+        if chave in self.enviados:
+            return
+        self.enviados.add(chave)
+        self._pendentes.append((*chave, time.time()))
+        if not self._gravando:
+            self._gravando = True
+            self.banco.em_segundo_plano(self._gravar())
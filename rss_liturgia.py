@@ -0,0 +1,111 @@
+import os
+from datetime import datetime
+
+from lxml import etree
+
+import texto_html
+
+URL = os.getenv("LITURGIA_RSS_URL", "https://www.vaticannews.va/pt/palavra-do-dia.rss.xml")
+
+def limpar_html(html):
+    """Remove tags HTML, converte entidades e tira espaços antes de pontuação"""
+    return texto_html.limpar_html(html, pontuacao=True)
+
+def dividir_em_blocos(texto):
+    """Divide texto em blocos com base em marcadores conhecidos"""
+    leitura = evangelho = reflexao = ""
+
+    if "Proclamação do Evangelho" in texto:
+        partes = texto.split("Proclamação do Evangelho de Jesus Cristo segundo")
+        leitura = partes[0].strip()
+        resto = "Proclamação do Evangelho de Jesus Cristo segundo" + partes[1]
+
+        if "Prefiro gloriar-me das minhas fraquezas" in resto:
+            partes_ev = resto.split("Prefiro gloriar-me das minhas fraquezas")
+            evangelho = partes_ev[0].strip()
+            reflexao = "Prefiro gloriar-me das minhas fraquezas" + partes_ev[1]
+        else:
+            evangelho = resto.strip()
+    else:
+        leitura = texto
+
+    return leitura, evangelho, reflexao
+
+def formatar_bloco(titulo, texto, emoji):
+    """Formata um bloco com emoji e título"""
+    if not texto:
+        return ""
+    return f"{emoji} {titulo}:\n{texto.strip()}\n"
+
+def formatar_data(data_str):
+    """Converte data do RSS para formato '21 de junho de 2025'"""
+    try:
+        dt = datetime.strptime(data_str, "%a, %d %b %Y %H:%M:%S %z")
+        meses_pt = {
+            "January": "janeiro", "February": "fevereiro", "March": "março", "April": "abril",
+            "May": "maio", "June": "junho", "July": "julho", "August": "agosto",
+            "September": "setembro", "October": "outubro", "November": "novembro", "December": "dezembro"
+        }
+        mes_extenso = dt.strftime("%B")
+        return dt.strftime(f"%d de {meses_pt[mes_extenso]} de %Y")
+    except Exception:
+        return data_str
+
+class LeitorItemRss:
+    """Parser incremental: recebe o feed em pedaços e para no primeiro <item>"""
+
+    def __init__(self):
+        self._parser = etree.XMLPullParser(events=("end",), tag="{*}item", resolve_entities=False)
+        self.item = None
+
+    def alimentar(self, pedaco):
+        """Retorna True quando o primeiro item já foi lido (o resto do feed pode ser descartado)"""
+        if self.item is not None:
+            return True
+        self._parser.feed(pedaco)
+        for _, elemento in self._parser.read_events():
+            campos = {etree.QName(filho).localname: filho.text or "" for filho in elemento}
+            self.item = {
+                "titulo": campos.get("title", ""),
+                "pubdate": campos.get("pubDate", ""),
+                "descricao": campos.get("description", ""),
+            }
+            elemento.clear()
+            return True
+        return False
+
+
+def ler_primeiro_item(conteudo, pedaco=16384):
+    """Extrai título, data e descrição HTML do item mais recente do feed"""
+    leitor = LeitorItemRss()
+    for inicio in range(0, len(conteudo), pedaco):
+        if leitor.alimentar(conteudo[inicio:inicio + pedaco]):
+            break
+    return leitor.item
+
+
+def item_para_dia(item):
+    """Converte o item do RSS para o mesmo formato do bloco 'today' da API JSON.
+
+    O feed não traz salmo, segunda leitura nem cor: o dia sai marcado como parcial.
+    """
+    texto_limpo = limpar_html(item["descricao"])
+    leitura, evangelho, reflexao = dividir_em_blocos(texto_limpo)
+    return {
+        "date": formatar_data(item["pubdate"]),
+        "entry_title": item["titulo"],
+        "readings": {
+            "first_reading": {"text": leitura},
+            "gospel": {"text": evangelho},
+        },
+        "extra": [reflexao] if reflexao else [],
+        "parcial": True,
+    }
+
+
+def data_do_item(item):
+    """Data (AAAA-MM-DD) de publicação do item, ou None se não for possível ler"""
+    try:
+        return datetime.strptime(item["pubdate"], "%a, %d %b %Y %H:%M:%S %z").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
@@ -0,0 +1,165 @@
+import math
+import os
+import time
+
+from aiohttp import web
+
+from telemetria import linhas_prometheus, obter_logger
+from voz import rss_processo
+
+log = obter_logger("saude")
+
+PORTA = int(os.getenv("PORT", 8080))
+# Sem uma transmissão bem-sucedida há mais que isto, /healthz avisa (mas não derruba)
+TRANSMISSAO_ATRASADA = 26 * 3600
+
+
+def _numero(valor):
+    if valor is None or math.isnan(valor):
+        return "NaN"
+    if math.isinf(valor):
+        return "+Inf" if valor > 0 else "-Inf"
+    return repr(float(valor))
+
+
+class ServidorSaude:
+    """Servidor HTTP no mesmo event loop do bot: /healthz e /metrics (Prometheus)"""
+
+    def __init__(self, client, agenda, gerenciador_voz=None, motor_fontes=None, porta=PORTA):
+        self.client = client
+        self.agenda = agenda
+        self.gerenciador_voz = gerenciador_voz
+        self.motor_fontes = motor_fontes
+        self.porta = porta
+        self.iniciado = time.time()
+        self.ultima_transmissao = None
+        self.transmissoes = {"ok": 0, "falha": 0}
+        self.canais = {"ok": 0, "falha": 0}
+        self.mensagens_enviadas = 0
+        # shard_id -> pronto, atualizado pelos eventos on_shard_* (só no cliente com shards)
+        self.shards_prontos = {}
+        self._runner = None
+
+    def shard_pronto(self, shard_id):
+        self.shards_prontos[shard_id] = True
+
+    def shard_caiu(self, shard_id):
+        self.shards_prontos[shard_id] = False
+
+    def shards(self):
+        """shard_id -> {pronto, latencia}; vazio quando o cliente não usa shards"""
+        latencias = getattr(self.client, "latencies", None)
+        if latencias is None:
+            return {}
+        return {
+            shard_id: {
+                "pronto": self.shards_prontos.get(shard_id, False),
+                "latencia": latencia if math.isfinite(latencia) else None,
+            }
+            for shard_id, latencia in latencias
+        }
+
+    def registrar_transmissao(self, relatorio):
+        self.canais["ok"] += relatorio.sucessos
+        self.canais["falha"] += len(relatorio.falhas)
+        self.mensagens_enviadas += sum(r.enviadas for r in relatorio.resultados)
+        if relatorio.sucessos or not relatorio.resultados:
+            self.transmissoes["ok"] += 1
+            self.ultima_transmissao = time.time()
+        else:
+            self.registrar_falha()
+
+    def registrar_falha(self):
+        self.transmissoes["falha"] += 1
+
+    def estado(self):
+        latencia = self.client.latency
+        shards = self.shards()
+        pronto = (
+            self.client.is_ready() and not self.client.is_closed() and math.isfinite(latencia)
+            and all(s["pronto"] for s in shards.values())
+        )
+        agendador = self.agenda.resumo()
+        atraso = None if self.ultima_transmissao is None else time.time() - self.ultima_transmissao
+        return {
+            "status": "ok" if pronto and agendador["rodando"] else "indisponivel",
+            "gateway": {"pronto": pronto, "latencia": latencia if math.isfinite(latencia) else None, "shards": shards},
+            "agendador": agendador,
+            "ultima_transmissao": self.ultima_transmissao,
+            "transmissao_atrasada": atraso is not None and atraso > TRANSMISSAO_ATRASADA,
+            "guilds": len(self.client.guilds),
+            "uptime": time.time() - self.iniciado,
+        }
+
+    async def healthz(self, request):
+        estado = self.estado()
+        return web.json_response(estado, status=200 if estado["status"] == "ok" else 503)
+
+    async def raiz(self, request):
+        return web.Response(text="Bot online!")
+
+    def linhas_metricas(self):
+        linhas = []
+
+        def metrica(nome, tipo, ajuda, amostras):
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+            for rotulos, valor in amostras:
+                if rotulos:
+                    rotulos = "{" + ",".join(f'{k}="{v}"' for k, v in rotulos.items()) + "}"
+                linhas.append(f"{nome}{rotulos or ''} {_numero(valor)}")
+
+        metrica("liturgia_up", "gauge", "1 se o gateway está conectado e o agendador rodando",
+                [(None, 1 if self.estado()["status"] == "ok" else 0)])
+        metrica("liturgia_gateway_latency_seconds", "gauge", "Latência do heartbeat do gateway",
+                [(None, self.client.latency)])
+        shards = self.shards()
+        if shards:
+            metrica("liturgia_shard_up", "gauge", "1 se o shard está conectado e pronto",
+                    [({"shard": i}, 1 if s["pronto"] else 0) for i, s in shards.items()])
+            metrica("liturgia_shard_latency_seconds", "gauge", "Latência do heartbeat de cada shard",
+                    [({"shard": i}, s["latencia"]) for i, s in shards.items()])
+        metrica("liturgia_schedule_entries", "gauge", "Entradas na agenda por tipo",
+                [({"tipo": t}, n) for t, n in self.agenda.resumo()["entradas"].items()])
+        metrica("liturgia_guilds", "gauge", "Guilds em que o bot está", [(None, len(self.client.guilds))])
+        metrica("liturgia_broadcast_last_success_timestamp_seconds", "gauge",
+                "Horário (unix) da última transmissão bem-sucedida", [(None, self.ultima_transmissao)])
+        metrica("liturgia_broadcasts_total", "counter", "Transmissões por resultado",
+                [({"resultado": r}, n) for r, n in self.transmissoes.items()])
+        metrica("liturgia_broadcast_channels_total", "counter", "Canais atendidos por resultado",
+                [({"resultado": r}, n) for r, n in self.canais.items()])
+        metrica("liturgia_messages_sent_total", "counter", "Mensagens enviadas nas transmissões",
+                [(None, self.mensagens_enviadas)])
+        if self.gerenciador_voz is not None:
+            metrica("liturgia_voice_sessions", "gauge", "Sessões de voz tocando",
+                    [(None, self.gerenciador_voz.relatorio()["sessoes_ativas"])])
+        if self.motor_fontes is not None:
+            resumo = self.motor_fontes.resumo()
+            metrica("liturgia_source_latency_seconds", "gauge", "Latência média (EWMA) de cada fonte",
+                    [({"fonte": f}, e["latencia"]) for f, e in resumo.items()])
+            metrica("liturgia_source_requests_total", "counter", "Pedidos a cada fonte",
+                    [({"fonte": f}, e["pedidos"]) for f, e in resumo.items()])
+            metrica("liturgia_source_errors_total", "counter", "Erros de cada fonte",
+                    [({"fonte": f}, e["erros"]) for f, e in resumo.items()])
+        metrica("process_resident_memory_bytes", "gauge", "RSS do processo", [(None, rss_processo())])
+        metrica("process_start_time_seconds", "gauge", "Início do processo (unix)", [(None, self.iniciado)])
+        return linhas + linhas_prometheus()
+
+    async def metricas(self, request):
+        corpo = ("\n".join(self.linhas_metricas()) + "\n").encode("utf-8")
+        return web.Response(body=corpo, headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    async def iniciar(self):
+        app = web.Application()
+        app.router.add_get("/", self.raiz)
+        app.router.add_get("/healthz", self.healthz)
+        app.router.add_get("/metrics", self.metricas)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "0.0.0.0", self.porta).start()
+        log.info("Servidor de saúde ouvindo na porta %d", self.porta)
+
+    async def parar(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,129 @@
+import asyncio
+import bisect
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from contextlib import contextmanager
+
+FORMATO = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+# Limites (segundos) dos baldes dos histogramas, no estilo do Prometheus
+BALDES_PADRAO = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BALDES_LAG = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+_listener = None
+_histogramas = {}
+
+
+def configurar(nivel=None):
+    """Logs do bot vão para uma fila; uma thread separada formata e escreve no stdout.
+
+    O nível vem de LOG_LEVEL (padrão INFO): abaixo dele, nem a mensagem é formatada.
+    """
+    global _listener
+    raiz = logging.getLogger("liturgia")
+    raiz.setLevel((nivel or os.getenv("LOG_LEVEL", "INFO")).upper())
+    if _listener is not None:
+        return _listener
+    fila = queue.SimpleQueue()
+    saida = logging.StreamHandler(sys.stdout)
+    saida.setFormatter(logging.Formatter(FORMATO))
+    manipulador = logging.handlers.QueueHandler(fila)
+    raiz.addHandler(manipulador)
+    raiz.propagate = False
+    # Os logs do discord.py passam pela mesma fila, mas só a partir de WARNING
+    discord_log = logging.getLogger("discord")
+    discord_log.setLevel(max(logging.WARNING, raiz.level))
+    discord_log.addHandler(manipulador)
+    _listener = logging.handlers.QueueListener(fila, saida, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def encerrar():
+    """Esvazia a fila de logs (chamar ao sair)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def obter_logger(nome):
+    return logging.getLogger(f"liturgia.{nome}")
+
+
+class Histograma:
+    """Histograma cumulativo (contagem, soma e baldes), exportado em /metrics"""
+
+    def __init__(self, nome, ajuda, baldes=BALDES_PADRAO, rotulos=None):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.baldes = tuple(baldes)
+        self.rotulos = rotulos or {}
+        self.contagens = [0] * (len(self.baldes) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.contagens[bisect.bisect_left(self.baldes, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+    def amostras(self):
+        acumulado = 0
+        for limite, contagem in zip((*self.baldes, float("inf")), self.contagens):
+            acumulado += contagem
+            yield "+Inf" if limite == float("inf") else repr(limite), acumulado
+
+
+def histograma(nome, ajuda, baldes=BALDES_PADRAO, **rotulos):
+    """Um histograma por nome + rótulos, criado no primeiro uso"""
+    chave = (nome, tuple(sorted(rotulos.items())))
+    h = _histogramas.get(chave)
+    if h is None:
+        h = _histogramas[chave] = Histograma(nome, ajuda, baldes, rotulos)
+    return h
+
+
+def linhas_prometheus():
+    linhas = []
+    vistos = set()
+    for (nome, _), h in sorted(_histogramas.items(), key=lambda item: item[0]):
+        if nome not in vistos:
+            vistos.add(nome)
+            linhas.append(f"# HELP {nome} {h.ajuda}")
+            linhas.append(f"# TYPE {nome} histogram")
+        rotulos = "".join(f',{k}="{v}"' for k, v in h.rotulos.items())
+        for limite, acumulado in h.amostras():
+            linhas.append(f'{nome}_bucket{{le="{limite}"{rotulos}}} {acumulado}')
+        sufixo = "{" + rotulos[1:] + "}" if rotulos else ""
+        linhas.append(f"{nome}_sum{sufixo} {h.soma!r}")
+        linhas.append(f"{nome}_count{sufixo} {h.total}")
+    return linhas
+
+
+_log_span = obter_logger("span")
+
+
+@contextmanager
+def span(nome, **atributos):
+    """Mede um trecho: duração vai para o histograma liturgia_span_seconds{span=nome}
+    e, em nível DEBUG, para o log com os atributos"""
+    inicio = time.perf_counter()
+    erro = None
+    try:
+        yield atributos
+    except BaseException as e:
+        erro = e
+        raise
+    finally:
+        duracao = time.perf_counter() - inicio
+        histograma("liturgia_span_seconds", "Duração dos trechos instrumentados", span=nome).observar(duracao)
+        if erro is not None and not isinstance(erro, asyncio.CancelledError):
+            _log_span.warning("%s falhou em %.1fms %s: %r", nome, duracao * 1000, atributos, erro)
+        elif _log_span.isEnabledFor(logging.DEBUG):
+            _log_span.debug("%s %.1fms %s", nome, duracao * 1000, atributos)
+
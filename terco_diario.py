@@ -1,9 +1,10 @@
 import os
 import asyncio
 import discord
-from datetime import datetime, time, timedelta, timezone
+from datetime import datetime, time
 from discord.ext import tasks
 from dotenv import load_dotenv
+from calendario import FUSO_PADRAO, calendario
 
 load_dotenv()
 
@@ -11,22 +12,10 @@ TOKEN = os.getenv("DISCORD_TOKEN")
 GUILD_ID = int(os.getenv("GUILD_ID", 1307006114612908083))
 CHANNEL_ID = int(os.getenv("CHANNEL_ID", 1386432203486920845))  # Atualizado para o canal de voz comum
 
-# Mistérios por dia da semana
-def tipo_misterio_hoje():
-    dias = {
-        0: "gozosos",     # Segunda
-        1: "dolorosos",   # Terça
-        2: "gloriosos",   # Quarta
-        3: "luminosos",   # Quinta
-        4: "dolorosos",   # Sexta
-        5: "gozosos",     # Sábado
-        6: "gloriosos"    # Domingo
-    }
-    return dias[datetime.now().weekday()]
-
+# Mistérios do dia (horário de São Paulo) segundo o calendário litúrgico
 def caminho_audio_terco():
-    tipo = tipo_misterio_hoje()
-    return f"audio/{tipo}.mp3", tipo.capitalize()
+    dia = calendario.hoje(FUSO_PADRAO)
+    return f"audio/{dia.misterios}.mp3", dia.terco["nome"]
 
 # Discord setup
 intents = discord.Intents.default()
@@ -37,7 +26,7 @@ async def on_ready():
     print(f"[INFO] Bot conectado como {client.user}")
     tocar_terco_diario.start()
 
-@tasks.loop(time=time(hour=17, minute=57, tzinfo=timezone(timedelta(hours=-3))))
+@tasks.loop(time=time(hour=17, minute=57, tzinfo=FUSO_PADRAO))
 async def tocar_terco_diario():
     print("[INFO] Preparando para iniciar o Terço...")
     guild = client.get_guild(GUILD_ID)
@@ -61,7 +50,7 @@ async def tocar_terco_diario():
             print(f"[INFO] Conectado ao canal de voz: {voice_channel.name}")
 
         # Espera até 18h00
-        agora = datetime.now(timezone(timedelta(hours=-3)))
+        agora = datetime.now(FUSO_PADRAO)
         inicio_terco = datetime.combine(agora.date(), time(18, 0), tzinfo=agora.tzinfo)
         segundos_ate_inicio = (inicio_terco - agora).total_seconds()
 
@@ -96,13 +85,6 @@ async def tocar_terco_diario():
         if 'voice_client' in locals() and voice_client.is_connected():
             await voice_client.disconnect()
 
-# Execução
-if __name__ == "__main__":
-    client.run(TOKEN)
-        # Garante que desconecta em caso de erro
-        if 'voice_client' in locals() and voice_client.is_connected():
-            await voice_client.disconnect()
-
 # Execução
 if __name__ == "__main__":
     client.run(TOKEN)
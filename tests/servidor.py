@@ -0,0 +1,34 @@
+import contextlib
+import json
+import os
+
+from aiohttp import web
+
+from liturgia_api import fechar_sessao
+
+DADOS = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "dados", "liturgia.json")
+
+
+def dia_exemplo():
+    with open(DADOS, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@contextlib.asynccontextmanager
+async def servidor_local(rotas):
+    """Servidor HTTP em 127.0.0.1 numa porta livre; `rotas` é {caminho: handler}.
+
+    Ao sair, fecha também a sessão HTTP compartilhada, presa ao event loop do teste.
+    """
+    app = web.Application()
+    for caminho, handler in rotas.items():
+        app.router.add_get(caminho, handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    try:
+        yield f"http://127.0.0.1:{runner.addresses[0][1]}"
+    finally:
+        await fechar_sessao()
+        await runner.cleanup()
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+
+from agenda import Agenda, Diaria
+
+
+class Relogio:
+    def __init__(self, instante):
+        self.agora = instante.timestamp()
+
+    def __call__(self):
+        return self.agora
+
+    def avancar(self, **delta):
+        self.agora += timedelta(**delta).total_seconds()
+
+
+def utc(*campos):
+    return datetime(*campos, tzinfo=timezone.utc)
+
+
+def nada(alvos, horario):
+    raise AssertionError("a ação não é chamada sem o timer")
+
+
+def test_diaria_inicio_do_horario_de_verao():
+    # Nova York, 2026-03-08: às 02:00 o relógio pula para 03:00
+    regra = Diaria(["02:30", "08:00"], "America/New_York")
+    assert regra.proximo(utc(2026, 3, 7, 14)) == utc(2026, 3, 8, 7, 30)
+    assert regra.proximo(utc(2026, 3, 8, 7, 30)) == utc(2026, 3, 8, 12)
+    # Antes da mudança 08:00 era 13:00 UTC
+    assert regra.proximo(utc(2026, 3, 7, 7, 30)) == utc(2026, 3, 7, 13)
+
+
+def test_diaria_fim_do_horario_de_verao():
+    # Nova York, 2026-11-01: 01:00-02:00 acontece duas vezes
+    regra = Diaria(["01:30"], "America/New_York")
+    primeiro = regra.proximo(utc(2026, 11, 1, 0))
+    assert primeiro == utc(2026, 11, 1, 5, 30)
+    # A repetição (06:30 UTC) não dispara de novo
+    assert regra.proximo(primeiro) == utc(2026, 11, 2, 6, 30)
+    assert regra.inicio_do_dia(primeiro) == utc(2026, 11, 1, 4)
+
+
+def test_disparo_perdido_so_roda_com_recuperar():
+    relogio = Relogio(utc(2026, 10, 18, 15))
+    agenda = Agenda({"liturgia": nada, "terco": nada}, relogio=relogio)
+    regra = Diaria(["08:00"], "America/Sao_Paulo")
+    # Bot fora do ar desde três dias atrás
+    desde = utc(2026, 10, 15, 12)
+    agenda.agendar("liturgia", 1, regra, recuperar=True, desde=desde)
+    agenda.agendar("terco", 1, regra, desde=desde)
+
+    # Três disparos perdidos da liturgia viram um só; o terço é pulado
+    assert agenda.vencidas() == {("liturgia", utc(2026, 10, 16, 11)): [1]}
+    assert agenda.vencidas() == {}
+    assert agenda.entradas["liturgia", 1].horario == utc(2026, 10, 19, 11)
+    assert agenda.entradas["terco", 1].horario == utc(2026, 10, 19, 11)
+
+
+def test_atraso_dentro_da_tolerancia_dispara():
+    relogio = Relogio(utc(2026, 10, 18, 10, 59))
+    agenda = Agenda({"terco": nada}, relogio=relogio)
+    agenda.agendar("terco", 1, Diaria(["08:00"], "America/Sao_Paulo"), tolerancia=60)
+    agenda.agendar("terco", 2, Diaria(["08:00"], "America/Sao_Paulo"), tolerancia=60)
+    assert agenda.vencidas() == {}
+    relogio.avancar(seconds=90)
+    assert agenda.vencidas() == {("terco", utc(2026, 10, 18, 11)): [1, 2]}
+
+
+def test_reagendar_nao_dispara_o_horario_antigo():
+    relogio = Relogio(utc(2026, 10, 18, 10))
+    agenda = Agenda({"terco": nada}, relogio=relogio)
+    agenda.agendar("terco", 1, Diaria(["08:00"], "America/Sao_Paulo"))
+    agenda.agendar("terco", 1, Diaria(["09:00"], "America/Sao_Paulo"))
+    assert len(agenda) == 1
+
+    relogio.avancar(hours=1, seconds=1)
+    assert agenda.vencidas() == {}
+    relogio.avancar(hours=1)
+    assert agenda.vencidas() == {("terco", utc(2026, 10, 18, 12)): [1]}
+    assert agenda.proximo() == ("terco", 1, utc(2026, 10, 19, 12))
+
+
+def test_remover_reconstroi_o_heap():
+    relogio = Relogio(utc(2026, 10, 18, 10))
+    agenda = Agenda({"terco": nada}, relogio=relogio)
+    regra = Diaria(["08:00"], "America/Sao_Paulo")
+    for guild in range(100):
+        agenda.agendar("terco", guild, regra)
+    for guild in range(60):
+        assert agenda.remover("terco", guild)
+    assert not agenda.remover("terco", 0)
+
+    # As removidas saíram do heap sem esperar chegar ao topo
+    assert len(agenda) == 40
+    assert len(agenda._heap) < 100
+    assert agenda.resumo()["entradas"] == {"terco": 40}
+
+    relogio.avancar(hours=1)
+    assert agenda.vencidas() == {("terco", utc(2026, 10, 18, 11)): list(range(60, 100))}
+    assert all(item[2].ativa for item in agenda._heap)
+    assert len(agenda._heap) == 40
@@ -0,0 +1,224 @@
+import asyncio
+import copy
+import json
+import os
+import sqlite3
+
+import pytest
+
+from arquivo_liturgia import CABECALHO, ArquivoLiturgia
+from cache_liturgia import CacheLiturgia
+from rss_liturgia import item_para_dia, ler_primeiro_item
+
+DADOS = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "dados", "liturgia.json")
+FEED = os.path.join(os.path.dirname(__file__), "dados", "palavra_do_dia.rss")
+
+
+def dia_completo(evangelho="Naquele tempo, Jesus falou do zimbro e da romãzeira."):
+    with open(DADOS, encoding="utf-8") as f:
+        dia = json.load(f)
+    dia = copy.deepcopy(dia.get("today", dia))
+    dia["readings"]["gospel"]["head_title"] = "Evangelho (Jo 15,1-8)"
+    dia["readings"]["gospel"]["text"] = evangelho
+    return dia
+
+
+def dia_parcial():
+    return {
+        "date": "18 de outubro de 2026",
+        "entry_title": "Palavra do Dia",
+        "readings": {
+            "first_reading": {"text": "Leitura do Livro do Êxodo (Ex 17,8-13) Os amalecitas vieram."},
+            "gospel": {"text": "Proclamação do Evangelho segundo Lucas (Lc 18,1-8) Rezar sempre, sem desanimar."},
+        },
+        "extra": [],
+        "parcial": True,
+    }
+
+
+def test_dia_do_rss_e_parcial():
+    # É a marca que o arquivo usa para deixar o dia completo substituir o do RSS
+    with open(FEED, "rb") as f:
+        dia = item_para_dia(ler_primeiro_item(f.read()))
+    assert dia["parcial"] is True
+    assert "psalm" not in dia["readings"]
+    assert "second_reading" not in dia["readings"]
+
+
+@pytest.fixture
+def caminhos(tmp_path):
+    return str(tmp_path / "a.bin"), str(tmp_path / "a.db")
+
+
+def abrir(caminhos):
+    return ArquivoLiturgia(*caminhos)
+
+
+def test_guardar_e_ler(caminhos):
+    arquivo = abrir(caminhos)
+    try:
+        assert asyncio.run(arquivo.guardar("2026-10-18", dia_completo()))
+        assert not asyncio.run(arquivo.guardar("2026-10-18", dia_completo("outro texto")))
+        assert asyncio.run(arquivo.ler("2026-10-18")) == dia_completo()
+        assert asyncio.run(arquivo.ler("2026-10-19")) is None
+    finally:
+        arquivo.fechar()
+
+
+def test_dia_completo_substitui_o_parcial(caminhos):
+    arquivo = abrir(caminhos)
+    try:
+        assert asyncio.run(arquivo.guardar("2026-10-18", dia_parcial()))
+        assert [r.parte for r in asyncio.run(arquivo.buscar("sem desanimar"))] == ["evangelho"]
+        # Outro parcial não substitui; o completo sim, e o índice esquece o texto antigo
+        assert not asyncio.run(arquivo.guardar("2026-10-18", dia_parcial()))
+        assert asyncio.run(arquivo.guardar("2026-10-18", dia_completo()))
+        assert not asyncio.run(arquivo.guardar("2026-10-18", dia_parcial()))
+        assert asyncio.run(arquivo.ler("2026-10-18")) == dia_completo()
+        assert asyncio.run(arquivo.buscar("sem desanimar")) == []
+        assert asyncio.run(arquivo.buscar("Lc 18,3")) == []
+        assert [r.data for r in asyncio.run(arquivo.buscar("zimbro romãzeira"))] == ["2026-10-18"]
+        assert asyncio.run(arquivo.resumo())["dias"] == 1
+    finally:
+        arquivo.fechar()
+
+
+def test_indice_refeito_vale_o_completo(caminhos):
+    arquivo = abrir(caminhos)
+    asyncio.run(arquivo.guardar("2026-10-18", dia_parcial()))
+    asyncio.run(arquivo.guardar("2026-10-18", dia_completo()))
+    arquivo.fechar()
+    os.remove(caminhos[1])
+
+    arquivo = abrir(caminhos)
+    try:
+        assert asyncio.run(arquivo.ler("2026-10-18")) == dia_completo()
+        assert asyncio.run(arquivo.buscar("sem desanimar")) == []
+    finally:
+        arquivo.fechar()
+
+
+def test_indice_alem_do_fim_do_arquivo(caminhos):
+    arquivo = abrir(caminhos)
+    asyncio.run(arquivo.guardar("2026-10-17", dia_completo("Primeiro dia, sobre a mostarda.")))
+    tamanho = os.path.getsize(caminhos[0])
+    asyncio.run(arquivo.guardar("2026-10-18", dia_completo()))
+    arquivo.fechar()
+    with open(caminhos[0], "r+b") as f:
+        f.truncate(tamanho)
+
+    arquivo = abrir(caminhos)
+    try:
+        assert asyncio.run(arquivo.ler("2026-10-18")) is None
+        assert asyncio.run(arquivo.buscar("zimbro")) == []
+        assert [r.data for r in asyncio.run(arquivo.buscar("mostarda"))] == ["2026-10-17"]
+        assert asyncio.run(arquivo.resumo())["dias"] == 1
+    finally:
+        arquivo.fechar()
+
+
+def test_esquema_antigo_ganha_a_coluna_parcial(caminhos):
+    conexao = sqlite3.connect(caminhos[1])
+    conexao.execute("CREATE TABLE dias (data TEXT PRIMARY KEY, deslocamento INTEGER NOT NULL, tamanho INTEGER NOT NULL)")
+    conexao.close()
+    arquivo = abrir(caminhos)
+    try:
+        assert asyncio.run(arquivo.guardar("2026-10-18", dia_parcial()))
+        assert asyncio.run(arquivo.guardar("2026-10-18", dia_completo()))
+    finally:
+        arquivo.fechar()
+
+
+class FontesFalsas:
+    def __init__(self, dia=None):
+        self.dia = dia
+        self.chamadas = 0
+
+    async def __call__(self, data):
+        self.chamadas += 1
+        if self.dia is None:
+            raise RuntimeError("fontes fora do ar")
+        return self.dia
+
+
+def test_cache_busca_nas_fontes_se_o_registro_estiver_ilegivel(caminhos, tmp_path):
+    arquivo = abrir(caminhos)
+    try:
+        asyncio.run(arquivo.guardar("2026-10-18", dia_completo("texto antigo")))
+        # Registro corrompido com o índice intacto
+        with open(caminhos[0], "r+b") as f:
+            f.seek(-20, os.SEEK_END)
+            f.write(b"\0" * 20)
+        fontes = FontesFalsas(dia_completo())
+        cache = CacheLiturgia(str(tmp_path / "cache.json.gz"), buscar=fontes, arquivo=arquivo)
+        assert asyncio.run(cache.obter("2026-10-18")) == dia_completo()
+        assert fontes.chamadas == 1
+    finally:
+        arquivo.fechar()
+
+
+def test_cache_troca_o_parcial_arquivado(caminhos, tmp_path):
+    arquivo = abrir(caminhos)
+    try:
+        asyncio.run(arquivo.guardar("2026-10-18", dia_parcial()))
+        cache = CacheLiturgia(str(tmp_path / "cache.json.gz"), buscar=FontesFalsas(dia_completo()), arquivo=arquivo)
+        assert asyncio.run(cache.obter("2026-10-18")) == dia_completo()
+        assert asyncio.run(arquivo.ler("2026-10-18")) == dia_completo()
+    finally:
+        arquivo.fechar()
+
+
+def test_cache_usa_o_parcial_se_as_fontes_falharem(caminhos, tmp_path):
+    arquivo = abrir(caminhos)
+    try:
+        asyncio.run(arquivo.guardar("2026-10-18", dia_parcial()))
+        cache = CacheLiturgia(str(tmp_path / "cache.json.gz"), buscar=FontesFalsas(), arquivo=arquivo)
+        assert asyncio.run(cache.obter("2026-10-18")) == dia_parcial()
+    finally:
+        arquivo.fechar()
+
+
+def test_parcial_ilegivel_substituido_pelo_completo(caminhos):
+    arquivo = abrir(caminhos)
+    asyncio.run(arquivo.guardar("2026-10-17", dia_completo("Outro dia, sobre a mostarda.")))
+    inicio = os.path.getsize(caminhos[0])
+    asyncio.run(arquivo.guardar("2026-10-18", dia_parcial()))
+    with open(caminhos[0], "r+b") as f:
+        f.seek(inicio + CABECALHO.size + 4)
+        f.write(b"\xff" * 16)
+    assert asyncio.run(arquivo.guardar("2026-10-18", dia_completo()))
+    arquivo.fechar()
+
+    arquivo = abrir(caminhos)
+    try:
+        assert asyncio.run(arquivo.ler("2026-10-18")) == dia_completo()
+        assert [r.data for r in asyncio.run(arquivo.buscar("zimbro romãzeira"))] == ["2026-10-18"]
+        assert [r.data for r in asyncio.run(arquivo.buscar("mostarda"))] == ["2026-10-17"]
+        # As entradas órfãs do parcial não casam com nenhum trecho
+        assert asyncio.run(arquivo.buscar("sem desanimar")) == []
+        assert asyncio.run(arquivo.resumo())["dias"] == 2
+    finally:
+        arquivo.fechar()
+
+
+def test_recuperacao_pula_registro_que_nao_indexa(caminhos, monkeypatch):
+    arquivo = abrir(caminhos)
+    asyncio.run(arquivo.guardar("2026-10-17", dia_completo("Outro dia, sobre a mostarda.")))
+    asyncio.run(arquivo.guardar("2026-10-18", dia_completo()))
+    arquivo.fechar()
+    os.remove(caminhos[1])
+
+    indexar = ArquivoLiturgia._indexar
+
+    def falhar_em_17(self, data, *args, **kwargs):
+        if data == "2026-10-17":
+            raise sqlite3.OperationalError("disco cheio")
+        return indexar(self, data, *args, **kwargs)
+
+    monkeypatch.setattr(ArquivoLiturgia, "_indexar", falhar_em_17)
+    arquivo = abrir(caminhos)
+    try:
+        assert asyncio.run(arquivo.ler("2026-10-18")) == dia_completo()
+        assert asyncio.run(arquivo.ler("2026-10-17")) is None
+    finally:
+        arquivo.fechar()
@@ -0,0 +1,79 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from banco_config import BancoConfig
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / "config.db")
+
+
+def test_definir_grava_e_atualiza_a_memoria(caminho):
+    async def cenario():
+        banco = BancoConfig(caminho)
+        await asyncio.gather(*(banco.definir(1, canal_texto=str(c)) for c in range(50)))
+        await banco.definir(2, fuso="Europe/Lisbon")
+        guild = dict(banco.guild(1))
+        await banco.fechar()
+        return guild
+
+    assert asyncio.run(cenario())["canal_texto"] == "49"
+    gravado = dict(sqlite3.connect(caminho).execute("SELECT guild_id, canal_texto FROM guilds"))
+    assert gravado == {"1": "49", "2": None}
+
+
+def test_definir_que_falha_nao_muda_a_memoria(caminho):
+    async def cenario():
+        banco = BancoConfig(caminho)
+        await banco.definir(1, canal_texto="10")
+
+        def falhar(conexao, linhas):
+            raise sqlite3.OperationalError("disco cheio")
+
+        banco._gravar_lote = falhar
+        with pytest.raises(sqlite3.OperationalError):
+            await banco.definir(1, canal_texto="20", canal_voz="30")
+        with pytest.raises(sqlite3.OperationalError):
+            await banco.definir(3, canal_texto="40")
+        resultado = dict(banco.guild(1)), "3" in banco.guilds
+        await banco.fechar()
+        return resultado
+
+    guild, criada = asyncio.run(cenario())
+    assert guild["canal_texto"] == "10" and guild["canal_voz"] is None
+    assert not criada
+
+
+def test_campo_desconhecido(caminho):
+    async def cenario():
+        banco = BancoConfig(caminho)
+        try:
+            await banco.definir(1, cor="azul")
+        finally:
+            await banco.fechar()
+
+    with pytest.raises(ValueError):
+        asyncio.run(cenario())
+
+
+def test_chamador_cancelado_no_meio_do_lote(caminho):
+    async def cenario():
+        banco = BancoConfig(caminho)
+        chamadas = [asyncio.ensure_future(banco.definir(g, canal_texto=str(10 * g))) for g in (1, 2, 3)]
+        await asyncio.sleep(0)
+        # Cancelado com o lote já na thread do banco: a gravação segue para os três
+        chamadas[1].cancel()
+        resultados = await asyncio.wait_for(asyncio.gather(*chamadas, return_exceptions=True), 5)
+        memoria = {g: banco.guild(g)["canal_texto"] for g in (1, 2, 3)}
+        await banco.fechar()
+        return resultados, memoria
+
+    resultados, memoria = asyncio.run(cenario())
+    assert resultados[0] is None and resultados[2] is None
+    assert isinstance(resultados[1], asyncio.CancelledError)
+    gravado = dict(sqlite3.connect(caminho).execute("SELECT guild_id, canal_texto FROM guilds"))
+    assert memoria == {1: "10", 2: "20", 3: "30"}
+    assert gravado == {"1": "10", "2": "20", "3": "30"}
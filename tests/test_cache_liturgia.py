@@ -0,0 +1,68 @@
+import asyncio
+import os
+from datetime import timedelta
+
+from cache_liturgia import CacheLiturgia, chave, hoje_sp
+
+
+def test_expirar_guarda_ontem(tmp_path):
+    cache = CacheLiturgia(str(tmp_path / "cache.json.gz"))
+    hoje = hoje_sp()
+    datas = [chave(hoje + timedelta(days=n)) for n in (-2, -1, 0, 1)]
+    cache.dias = {d: {"date": d} for d in datas}
+    assert cache.expirar()
+    assert sorted(cache.dias) == datas[1:]
+    assert not cache.expirar()
+
+
+def test_buscas_simultaneas_compartilham_a_mesma(tmp_path):
+    chamadas = []
+
+    async def buscar(data):
+        chamadas.append(data)
+        await asyncio.sleep(0.01)
+        return {"date": data}
+
+    async def cenario():
+        cache = CacheLiturgia(str(tmp_path / "cache.json.gz"), buscar=buscar)
+        return await asyncio.gather(*(cache.obter("2099-01-01") for _ in range(5)))
+
+    assert asyncio.run(cenario()) == [{"date": "2099-01-01"}] * 5
+    assert chamadas == ["2099-01-01"]
+    # Gravado em disco: outra instância não vai às fontes
+    assert CacheLiturgia(str(tmp_path / "cache.json.gz"), buscar=None).dias == {"2099-01-01": {"date": "2099-01-01"}}
+
+
+def test_dia_parcial_nao_fica_fixado(tmp_path):
+    respostas = [{"date": "2099-01-01", "parcial": True}, {"date": "2099-01-01"}]
+
+    async def buscar(data):
+        return respostas.pop(0)
+
+    async def cenario():
+        cache = CacheLiturgia(str(tmp_path / "cache.json.gz"), buscar=buscar)
+        primeiro = await cache.obter("2099-01-01")
+        assert "2099-01-01" not in cache.dias
+        return primeiro, await cache.obter("2099-01-01"), await cache.obter("2099-01-01")
+
+    primeiro, segundo, terceiro = asyncio.run(cenario())
+    assert primeiro["parcial"] is True
+    assert segundo == terceiro == {"date": "2099-01-01"}
+    assert respostas == []
+
+
+def test_gravacoes_simultaneas(tmp_path):
+    async def buscar(data):
+        await asyncio.sleep(0)
+        return {"date": data, "texto": "x" * 10000}
+
+    datas = [f"2099-01-{n:02d}" for n in range(1, 21)]
+
+    async def cenario():
+        cache = CacheLiturgia(str(tmp_path / "cache.json.gz"), buscar=buscar)
+        await asyncio.gather(*(cache.obter(d) for d in datas))
+
+    asyncio.run(cenario())
+    # A última gravação tem todos os dias e nenhum temporário fica para trás
+    assert sorted(CacheLiturgia(str(tmp_path / "cache.json.gz"), buscar=None).dias) == datas
+    assert os.listdir(tmp_path) == ["cache.json.gz"]
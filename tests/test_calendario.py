@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+
+import pytest
+
+from calendario import DOMINGOS, Calendario, pascoa
+
+calendario = Calendario(2022, 2027)
+
+PASCOAS = {
+    1818: date(1818, 3, 22),
+    2000: date(2000, 4, 23),
+    2019: date(2019, 4, 21),
+    2024: date(2024, 3, 31),
+    2025: date(2025, 4, 20),
+    2026: date(2026, 4, 5),
+    2038: date(2038, 4, 25),
+}
+
+CINZAS = {
+    2024: date(2024, 2, 14),
+    2025: date(2025, 3, 5),
+    2026: date(2026, 2, 18),
+}
+
+
+@pytest.mark.parametrize("ano", PASCOAS)
+def test_pascoa(ano):
+    assert pascoa(ano) == PASCOAS[ano]
+    assert pascoa(ano).weekday() == 6
+
+
+@pytest.mark.parametrize("ano", CINZAS)
+def test_quarta_feira_de_cinzas(ano):
+    cinzas = CINZAS[ano]
+    assert calendario.dia(cinzas - timedelta(days=1)).tempo == "comum"
+    assert (calendario.dia(cinzas).tempo, calendario.dia(cinzas).cor) == ("quaresma", "roxo")
+
+
+@pytest.mark.parametrize("inicio", [date(2022, 11, 27), date(2023, 12, 3), date(2024, 12, 1),
+                                    date(2025, 11, 30), date(2026, 11, 29)])
+def test_inicio_do_advento(inicio):
+    assert calendario.dia(inicio - timedelta(days=1)).tempo == "comum"
+    assert calendario.dia(inicio).tempo == "advento"
+    assert calendario.dia(inicio + timedelta(weeks=2)).cor == "rosa"
+    assert calendario.dia(date(inicio.year, 12, 24)).tempo == "advento"
+    assert calendario.dia(date(inicio.year, 12, 25)).tempo == "natal"
+
+
+@pytest.mark.parametrize("batismo", [
+    date(2024, 1, 8),   # Epifania em 7 de janeiro: Batismo na segunda
+    date(2025, 1, 12),
+    date(2026, 1, 11),
+])
+def test_fim_do_tempo_do_natal_no_batismo(batismo):
+    assert calendario.dia(batismo).tempo == "natal"
+    assert calendario.dia(batismo + timedelta(days=1)).tempo == "comum"
+    assert calendario.dia(date(batismo.year, 1, 1)).tempo == "natal"
+
+
+def test_cores_dos_marcos_de_2026():
+    cores = {
+        date(2026, 3, 15): ("quaresma", "rosa"),      # Laetare
+        date(2026, 3, 29): ("quaresma", "vermelho"),  # Ramos
+        date(2026, 4, 2): ("triduo", "branco"),
+        date(2026, 4, 3): ("triduo", "vermelho"),
+        date(2026, 4, 5): ("pascoa", "branco"),
+        date(2026, 5, 24): ("pascoa", "vermelho"),    # Pentecostes
+        date(2026, 5, 25): ("comum", "verde"),
+        date(2026, 11, 22): ("comum", "branco"),      # Cristo Rei
+    }
+    for data, esperado in cores.items():
+        assert (calendario.dia(data).tempo, calendario.dia(data).cor) == esperado, data
+
+
+def test_rotacao_dos_misterios():
+    # Semana de 19 a 24 de outubro de 2026, Tempo Comum
+    semana = [calendario.dia(date(2026, 10, 19) + timedelta(days=n)).misterios for n in range(6)]
+    assert semana == ["gozosos", "dolorosos", "gloriosos", "luminosos", "dolorosos", "gozosos"]
+    domingos = {
+        date(2026, 10, 18): DOMINGOS["comum"],
+        date(2026, 12, 6): "gozosos",    # Advento
+        date(2026, 3, 1): "dolorosos",   # Quaresma
+        date(2026, 4, 12): "gloriosos",  # Páscoa
+        date(2026, 12, 27): "gozosos",   # Natal
+    }
+    for data, misterios in domingos.items():
+        assert calendario.dia(data).misterios == misterios, data
+
+
+def test_fora_do_intervalo_calcula_na_hora():
+    curto = Calendario(2026)
+    assert len(curto) == 365
+    for data in (date(2021, 12, 26), date(2026, 4, 3), date(2030, 12, 1)):
+        assert curto.dia(data) == Calendario(data.year).dia(data)
+    assert curto.dia(date(2030, 12, 1)).tempo == "advento"
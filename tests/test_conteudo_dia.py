@@ -0,0 +1,43 @@
+import json
+import os
+
+from conteudo_dia import aviso_latim, renderizar_dia
+
+DADOS = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "dados", "liturgia.json")
+
+
+def conteudo():
+    with open(DADOS, encoding="utf-8") as f:
+        dia = json.load(f)
+    return renderizar_dia(dia.get("today", dia), "2026-10-18")
+
+
+def test_aviso_com_os_horarios_padrao():
+    aviso = aviso_latim("Capela")["value"]
+    assert "**Capela**" in aviso
+    assert "português às **18h** e em latim às **22h** (horário de São Paulo)" in aviso
+
+
+def test_aviso_com_os_horarios_da_guild():
+    aviso = aviso_latim("Capela", "19:30", "21:00", "America/New_York")["value"]
+    assert "português às **19h30** e em latim às **21h** (horário de New York)" in aviso
+    assert "às **7h05**" in aviso_latim("Capela", "07:05", "22:00", "America/Manaus")["value"]
+    assert "horário de Belém" in aviso_latim("Capela", "18:00", "22:00", "America/Belem")["value"]
+
+
+def ultimo_campo(mensagens):
+    return mensagens[-1][1]["embeds"][-1].fields[-1].value
+
+
+def test_mensagens_por_horario_da_guild():
+    dia = conteudo()
+    sao_paulo = dia.mensagens("Capela", None, ("18:00", "22:00", "America/Sao_Paulo"))
+    lisboa = dia.mensagens("Capela", None, ("20:00", "22:00", "Europe/Lisbon"))
+    assert "às **18h**" in ultimo_campo(sao_paulo) and "São Paulo" in ultimo_campo(sao_paulo)
+    assert "às **20h**" in ultimo_campo(lisboa) and "Lisbon" in ultimo_campo(lisboa)
+    assert dia.mensagens("Capela", None, ("18:00", "22:00", "America/Sao_Paulo")) is sao_paulo
+
+
+def test_sem_canal_de_voz_sem_aviso():
+    nomes = [c.name for _, m in conteudo().mensagens() for e in m["embeds"] for c in e.fields]
+    assert not any("Latim" in n for n in nomes)
@@ -0,0 +1,118 @@
+import random
+
+from fatiador import (
+    EMBEDS_POR_MENSAGEM, LIMITE_CAMPO, LIMITE_EMBEDS, agrupar, dividir, montar_embeds, tamanho_embed,
+)
+
+SEPARADORES = (" ", " ", " ", "\n", "\n\n", ", ", ". ")
+CASOS = 300
+
+
+def texto_aleatorio(rng, palavras, maior_palavra):
+    partes = []
+    for _ in range(palavras):
+        partes.append("".join(rng.choices("abcdefghijlmnoprstuvxzçã", k=rng.randint(1, maior_palavra))))
+        partes.append(rng.choice(SEPARADORES))
+    return "".join(partes)
+
+
+def test_dividir_propriedades():
+    rng = random.Random(15)
+    for _ in range(CASOS):
+        limite = rng.randint(20, 200)
+        texto = texto_aleatorio(rng, rng.randint(0, 200), min(limite // 2 - 2, 25))
+        partes = dividir(texto, limite)
+        assert all(0 < len(p) <= limite for p in partes)
+        assert all(p == p.strip() for p in partes)
+        # Com palavras menores que meio limite sempre há fronteira na janela:
+        # nenhuma palavra cortada e nada perdido
+        assert " ".join(partes).split() == texto.split()
+        # Cada corte avança pelo menos metade do limite (menos a quebra descartada)
+        assert all(len(p) >= limite // 2 - 1 for p in partes[:-1])
+
+
+def test_dividir_palavras_maiores_que_o_limite():
+    rng = random.Random(16)
+    for _ in range(CASOS):
+        limite = rng.randint(5, 60)
+        texto = texto_aleatorio(rng, rng.randint(1, 60), 3 * limite)
+        partes = dividir(texto, limite)
+        assert all(0 < len(p) <= limite for p in partes)
+        assert "".join("".join(partes).split()) == "".join(texto.split())
+
+
+def test_dividir_prefere_paragrafo_a_frase_e_palavra():
+    rng = random.Random(19)
+    for _ in range(CASOS):
+        limite = rng.randint(40, 200)
+        texto = texto_aleatorio(rng, rng.randint(20, 200), min(limite // 2 - 2, 25))
+        partes = dividir(texto, limite)
+        inicio = 0
+        for parte in partes[:-1]:
+            inicio = texto.index(parte, inicio)
+            janela = texto[inicio + limite // 2:inicio + limite + 1]
+            fim = inicio + len(parte)
+            if "\n\n" in janela:
+                assert texto.startswith("\n\n", fim)
+            elif "\n" in janela:
+                assert texto.startswith("\n", fim)
+            elif ". " in janela:
+                assert texto.startswith(" ", fim) and parte.endswith(".")
+            inicio = fim
+
+
+def test_dividir_corta_no_paragrafo_antes_do_limite():
+    frase = "Naquele tempo, disse Jesus aos seus discípulos: Eu sou a videira e vós os ramos. "
+    paragrafos = [(frase * 22).strip(), (frase * 8).strip()]
+    texto = "\n\n".join(paragrafos)
+    assert len(paragrafos[0]) < 2000 < len(texto)
+    assert dividir(texto, 2000) == paragrafos
+
+
+def test_dividir_corta_no_espaco_logo_depois_do_limite():
+    assert dividir("abcde fghij", 5) == ["abcde", "fghij"]
+    assert dividir("abcd. efghi", 5) == ["abcd.", "efghi"]
+    assert dividir("abcdefghij", 4) == ["abcd", "efgh", "ij"]
+    assert dividir("  curto  ", 10) == ["curto"]
+    assert dividir("", 10) == []
+
+
+def embeds_aleatorios(rng, quantidade):
+    return [{"description": "x" * rng.choice((0, 10, 500, 1500, 4096))} for _ in range(quantidade)]
+
+
+def minimo_de_mensagens(embeds):
+    melhor = [0] + [None] * len(embeds)
+    for fim in range(1, len(embeds) + 1):
+        total = 0
+        for inicio in range(fim - 1, max(-1, fim - 1 - EMBEDS_POR_MENSAGEM), -1):
+            total += tamanho_embed(embeds[inicio])
+            if total > LIMITE_EMBEDS:
+                break
+            if melhor[fim] is None or melhor[inicio] + 1 < melhor[fim]:
+                melhor[fim] = melhor[inicio] + 1
+    return melhor[-1]
+
+
+def test_agrupar_propriedades():
+    rng = random.Random(17)
+    for _ in range(CASOS):
+        embeds = embeds_aleatorios(rng, rng.randint(0, 60))
+        mensagens = agrupar(embeds)
+        assert [e for m in mensagens for e in m] == embeds
+        assert all(0 < len(m) <= EMBEDS_POR_MENSAGEM for m in mensagens)
+        assert all(sum(map(tamanho_embed, m)) <= LIMITE_EMBEDS for m in mensagens)
+        assert len(mensagens) == minimo_de_mensagens(embeds)
+
+
+def test_montar_embeds_dentro_dos_limites():
+    rng = random.Random(18)
+    for _ in range(50):
+        campos = [(f"Campo {i}", texto_aleatorio(rng, rng.randint(1, 800), 12)) for i in range(rng.randint(1, 4))]
+        embeds = montar_embeds({"title": "Título", "footer": {"text": "rodapé"}}, "descrição", campos)
+        assert all(tamanho_embed(e) <= LIMITE_EMBEDS for e in embeds)
+        assert all(len(c["value"]) <= LIMITE_CAMPO for e in embeds for c in e["fields"])
+        assert embeds[0]["title"] == "Título" and embeds[-1]["footer"] == {"text": "rodapé"}
+        for nome, texto in campos:
+            valores = [c["value"] for e in embeds for c in e["fields"] if c["name"].startswith(nome)]
+            assert " ".join(valores).split() == texto.split()
@@ -0,0 +1,155 @@
+import asyncio
+import os
+
+import pytest
+from aiohttp import web
+
+from fontes_liturgia import DataIndisponivel, FonteApiJson, FonteRss, MotorFontes
+from liturgia_api import ErroApi
+from servidor import dia_exemplo, servidor_local
+
+FEED = os.path.join(os.path.dirname(__file__), "dados", "palavra_do_dia.rss")
+
+
+def test_api_json():
+    pedidos = []
+
+    async def liturgia(request):
+        pedidos.append(request.query["date"])
+        return web.json_response({"today": dia_exemplo()})
+
+    async def cenario():
+        async with servidor_local({"/": liturgia}) as url:
+            return await FonteApiJson(url + "/").buscar("2026-10-18")
+
+    assert asyncio.run(cenario()) == dia_exemplo()
+    assert pedidos == ["2026-10-18"]
+
+
+def test_api_json_erro_do_cliente_sem_novas_tentativas():
+    pedidos = []
+
+    async def liturgia(request):
+        pedidos.append(request.query["date"])
+        return web.json_response({"erro": "data inválida"}, status=404)
+
+    async def cenario():
+        async with servidor_local({"/": liturgia}) as url:
+            await FonteApiJson(url + "/").buscar("1900-01-01")
+
+    with pytest.raises(ErroApi, match="404"):
+        asyncio.run(cenario())
+    assert len(pedidos) == 1
+
+
+def servir_feed(pedidos):
+    with open(FEED, "rb") as f:
+        corpo = f.read()
+
+    async def feed(request):
+        pedidos.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=corpo, content_type="application/rss+xml", headers={"ETag": '"v1"'})
+
+    return {"/feed": feed}
+
+
+def test_rss_get_condicional():
+    pedidos = []
+
+    async def cenario():
+        async with servidor_local(servir_feed(pedidos)) as url:
+            fonte = FonteRss(url + "/feed")
+            return await fonte.buscar("2026-10-18"), await fonte.buscar("2026-10-18")
+
+    primeiro, segundo = asyncio.run(cenario())
+    assert primeiro == segundo
+    assert primeiro["parcial"] is True
+    assert primeiro["readings"]["gospel"]["text"].startswith("Proclamação do Evangelho")
+    assert pedidos == [None, '"v1"']
+
+
+def test_rss_sem_a_data_pedida():
+    async def cenario():
+        async with servidor_local(servir_feed([])) as url:
+            await FonteRss(url + "/feed").buscar("2026-10-19")
+
+    with pytest.raises(DataIndisponivel):
+        asyncio.run(cenario())
+
+
+class FonteFalsa:
+    def __init__(self, nome, completa, atraso=0.0, erro=None):
+        self.nome = nome
+        self.completa = completa
+        self.atraso = atraso
+        self.erro = erro
+        self.chamadas = 0
+
+    async def buscar(self, data):
+        self.chamadas += 1
+        await asyncio.sleep(self.atraso)
+        if self.erro is not None:
+            raise self.erro
+        return {"fonte": self.nome, "date": data}
+
+
+def test_fonte_completa_primeiro_mesmo_se_mais_lenta():
+    api, rss = FonteFalsa("api", True, 0.02), FonteFalsa("rss", False)
+    motor = MotorFontes([rss, api], atraso_hedge=1)
+    for _ in range(5):
+        assert asyncio.run(motor.buscar("2026-10-18"))["fonte"] == "api"
+    motor.estatisticas["rss"].registrar(0.001, True)
+    assert motor.estatisticas["rss"].custo < motor.estatisticas["api"].custo
+    assert [f.nome for f in motor.ordem()] == ["api", "rss"]
+    assert rss.chamadas == 0
+
+
+def test_fonte_completa_com_erros_perde_a_preferencia():
+    api, rss = FonteFalsa("api", True, erro=RuntimeError("fora do ar")), FonteFalsa("rss", False)
+    motor = MotorFontes([api, rss], atraso_hedge=1)
+    for _ in range(4):
+        assert asyncio.run(motor.buscar("2026-10-18"))["fonte"] == "rss"
+    assert not motor.estatisticas["api"].saudavel
+    assert [f.nome for f in motor.ordem()] == ["rss", "api"]
+
+
+def test_data_indisponivel_nao_conta_como_erro():
+    api = FonteFalsa("api", True, erro=RuntimeError("fora do ar"))
+    rss = FonteFalsa("rss", False, erro=DataIndisponivel("RSS traz outro dia"))
+    motor = MotorFontes([api, rss], atraso_hedge=1)
+    with pytest.raises(ErroApi):
+        asyncio.run(motor.buscar("2026-10-19"))
+    assert motor.resumo()["rss"]["erros"] == 0 and motor.estatisticas["rss"].taxa_erro == 0
+    assert motor.resumo()["api"]["erros"] == 1
+
+
+def test_parcial_espera_a_fonte_completa():
+    api, rss = FonteFalsa("api", True, 0.1), FonteFalsa("rss", False)
+    motor = MotorFontes([api, rss], atraso_hedge=0.01)
+    assert asyncio.run(motor.buscar("2026-10-18"))["fonte"] == "api"
+    assert rss.chamadas == 1 and motor.estatisticas["api"].canceladas == 0
+
+
+def test_parcial_so_se_nenhuma_completa_responder():
+    api, rss = FonteFalsa("api", True, 0.05, erro=RuntimeError("fora do ar")), FonteFalsa("rss", False)
+    motor = MotorFontes([api, rss], atraso_hedge=0.01)
+    assert asyncio.run(motor.buscar("2026-10-18"))["fonte"] == "rss"
+    assert motor.resumo()["api"]["erros"] == 1
+
+
+def test_perdedor_do_hedge_registra_o_tempo():
+    lenta, rapida = FonteFalsa("api", True, 0.5), FonteFalsa("espelho", True)
+    motor = MotorFontes([lenta, rapida], atraso_hedge=0.05)
+
+    async def cenario():
+        dia = await motor.buscar("2026-10-18")
+        # O cancelamento do perdedor roda na volta seguinte do event loop
+        await asyncio.sleep(0)
+        return dia
+
+    assert asyncio.run(cenario())["fonte"] == "espelho"
+    estatisticas = motor.estatisticas["api"]
+    assert estatisticas.canceladas == 1 and estatisticas.erros == 0
+    assert 0.05 <= estatisticas.latencia < 0.5
@@ -0,0 +1,64 @@
+import asyncio
+
+from discord.user import ClientUser
+
+import gateway
+from benchmarks.ambiente import USUARIO
+from benchmarks.memoria import guild_create
+
+
+async def cliente_com_guild(perfil):
+    cliente = gateway.criar_cliente(shards="", perfil=perfil)
+    await cliente._async_setup_hook()
+    estado = cliente._connection
+    estado.user = ClientUser(state=estado, data=USUARIO)
+    dados = guild_create(0, estado.intents, texto=6, voz=2, categorias=2, threads=3)
+    estado.parse_guild_create(dados)
+    # Deixa rodar on_guild_available, que poda o cache
+    await asyncio.sleep(0)
+    return cliente, estado, dados
+
+
+def canal_novo(dados, canal_id, tipo):
+    return {"id": str(canal_id), "type": tipo, "guild_id": dados["id"], "name": f"novo-{tipo}", "position": 0,
+            "parent_id": None, "nsfw": False, "permission_overwrites": [], "bitrate": 64000, "user_limit": 0}
+
+
+def test_poda_so_deixa_os_canais_de_voz(monkeypatch):
+    podas = []
+    podar = gateway.podar
+    monkeypatch.setattr(gateway, "podar", lambda guild: podas.append(guild.id) or podar(guild))
+
+    async def cenario():
+        cliente, estado, dados = await cliente_com_guild("minimo")
+        guild = cliente.guilds[0]
+        antes = [c.id for c in guild.channels]
+        estado.parse_channel_create(canal_novo(dados, int(dados["id"]) + 9000, 0))
+        estado.parse_channel_create(canal_novo(dados, int(dados["id"]) + 9001, 2))
+        await asyncio.sleep(0)
+        return antes, [c.id for c in guild.channels], len(guild.threads), int(dados["id"])
+
+    antes, depois, threads, base = asyncio.run(cenario())
+    assert len(antes) == 2 and threads == 0
+    # O canal de texto novo sai do cache; o de voz fica, e os antigos não são tocados
+    assert depois == antes + [base + 9001]
+    # A guild inteira só é podada quando chega
+    assert podas == [base]
+
+
+def test_perfil_completo_nao_poda():
+    async def cenario():
+        cliente, _, _ = await cliente_com_guild("completo")
+        return len(cliente.guilds[0].channels), cliente.podar_cache
+
+    assert asyncio.run(cenario()) == (10, False)
+
+
+def test_sem_os_metodos_internos_o_cache_fica_completo(monkeypatch):
+    monkeypatch.setattr(gateway, "PODA_SUPORTADA", False)
+
+    async def cenario():
+        cliente, _, _ = await cliente_com_guild("minimo")
+        return len(cliente.guilds[0].channels), cliente.podar_cache
+
+    assert asyncio.run(cenario()) == (10, False)
@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+from aiohttp import web
+
+import liturgia_api
+from liturgia_api import buscar_liturgia
+from servidor import dia_exemplo, servidor_local
+
+ATRASO = 1.0
+TIQUE = 0.01
+
+
+def test_resposta_lenta_nao_trava_o_event_loop():
+    async def liturgia(request):
+        await asyncio.sleep(ATRASO)
+        return web.json_response({"today": dia_exemplo()})
+
+    async def relogio(intervalos, parar):
+        anterior = time.perf_counter()
+        while not parar.is_set():
+            await asyncio.sleep(TIQUE)
+            agora = time.perf_counter()
+            intervalos.append(agora - anterior)
+            anterior = agora
+
+    async def cenario():
+        intervalos = []
+        parar = asyncio.Event()
+        async with servidor_local({"/": liturgia}) as url:
+            tique = asyncio.create_task(relogio(intervalos, parar))
+            inicio = time.perf_counter()
+            dia = await buscar_liturgia("2026-10-18", url + "/")
+            duracao = time.perf_counter() - inicio
+            parar.set()
+            await tique
+        return dia, duracao, intervalos
+
+    dia, duracao, intervalos = asyncio.run(cenario())
+    assert dia == dia_exemplo()
+    assert duracao >= ATRASO
+    # O relógio continua batendo enquanto a resposta não chega
+    assert len(intervalos) >= ATRASO / TIQUE * 0.5
+    assert max(intervalos) < 0.1
+
+
+def test_servidor_fora_do_ar_tenta_de_novo(monkeypatch):
+    pedidos = []
+
+    async def liturgia(request):
+        pedidos.append(request.query["date"])
+        if len(pedidos) < 3:
+            return web.Response(status=503)
+        return web.json_response({"today": dia_exemplo()})
+
+    monkeypatch.setattr(liturgia_api, "ESPERA_BASE", 0.001)
+
+    async def cenario():
+        async with servidor_local({"/": liturgia}) as url:
+            return await buscar_liturgia("2026-10-18", url + "/")
+
+    assert asyncio.run(cenario()) == dia_exemplo()
+    assert len(pedidos) == 3
@@ -0,0 +1,42 @@
+import os
+from array import array
+
+from quadros_opus import QUADROS_POR_SEGUNDO, LeitorQuadros, abrir_armazem, caminhos
+
+
+def criar_armazem(pasta, pacotes):
+    base = os.path.join(pasta, "terco")
+    arquivo_quadros, arquivo_indice = caminhos(base)
+    offsets = array("Q", [0])
+    with open(arquivo_quadros, "wb") as f:
+        for pacote in pacotes:
+            f.write(pacote)
+            offsets.append(offsets[-1] + len(pacote))
+    with open(arquivo_indice, "wb") as f:
+        offsets.tofile(f)
+    return abrir_armazem(base)
+
+
+def test_leitor_entrega_bytes(tmp_path):
+    pacotes = [bytes([i % 256]) * (100 + i % 60) for i in range(3 * QUADROS_POR_SEGUNDO)]
+    armazem = criar_armazem(str(tmp_path), pacotes)
+    leitor = LeitorQuadros(armazem)
+    lidos = []
+    while quadro := leitor.read():
+        # A cifragem do discord.py exige bytes (memoryview não serve)
+        assert type(quadro) is bytes
+        lidos.append(quadro)
+    assert lidos == pacotes
+    assert leitor.retomar() is None
+
+
+def test_busca_e_retomada(tmp_path):
+    pacotes = [b"%05d" % i for i in range(5 * QUADROS_POR_SEGUNDO)]
+    armazem = criar_armazem(str(tmp_path), pacotes)
+    leitor = LeitorQuadros(armazem)
+    leitor.buscar(armazem.indice_em(2.0))
+    assert leitor.read() == pacotes[2 * QUADROS_POR_SEGUNDO]
+    retomado = leitor.retomar()
+    assert retomado.read() == pacotes[2 * QUADROS_POR_SEGUNDO + 1]
+    leitor.buscar(10**6)
+    assert leitor.read() == b""
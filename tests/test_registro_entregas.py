@@ -0,0 +1,54 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from banco_config import BancoConfig
+from registro_entregas import RegistroEntregas
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / "config.db")
+
+
+def test_fechar_espera_as_gravacoes_pendentes(caminho):
+    async def cenario():
+        banco = BancoConfig(caminho)
+        registro = RegistroEntregas(banco, desde="2026-10-01")
+        # Sem await: as gravações ficam em tarefas, e fechar() precisa esperar por elas
+        definir = asyncio.ensure_future(banco.definir(1, canal_texto="10"))
+        await asyncio.sleep(0)
+        for tipo in ("liturgia", "terco"):
+            registro.marcar(1, 10, "2026-10-18", tipo)
+        await banco.fechar()
+        return definir.done()
+
+    assert asyncio.run(cenario())
+    conexao = sqlite3.connect(caminho)
+    assert conexao.execute("SELECT canal_texto FROM guilds").fetchall() == [("10",)]
+    assert sorted(t for t, in conexao.execute("SELECT tipo FROM entregas")) == ["liturgia", "terco"]
+
+
+def test_registro_que_falha_sai_da_memoria(caminho):
+    async def cenario():
+        banco = BancoConfig(caminho)
+        registro = RegistroEntregas(banco, desde="2026-10-01")
+        registro.marcar(1, 10, "2026-10-18", "liturgia")
+        await banco.fechar()
+
+        banco = BancoConfig(caminho)
+        registro = RegistroEntregas(banco, desde="2026-10-01")
+
+        def falhar(conexao, linhas):
+            raise sqlite3.OperationalError("disco cheio")
+
+        registro._gravar_lote = falhar
+        registro.marcar(1, 10, "2026-10-18", "terco")
+        assert registro.ja_enviado(1, 10, "2026-10-18", "terco")
+        await banco.fechar()
+        return registro
+
+    registro = asyncio.run(cenario())
+    assert registro.ja_enviado(1, 10, "2026-10-18", "liturgia")
+    assert not registro.ja_enviado(1, 10, "2026-10-18", "terco")
@@ -0,0 +1,52 @@
+import os
+
+from rss_liturgia import (
+    LeitorItemRss, data_do_item, dividir_em_blocos, formatar_data, item_para_dia, ler_primeiro_item,
+)
+
+FEED = os.path.join(os.path.dirname(__file__), "dados", "palavra_do_dia.rss")
+
+
+def carregar_feed():
+    with open(FEED, "rb") as f:
+        return f.read()
+
+
+def test_primeiro_item():
+    item = ler_primeiro_item(carregar_feed())
+    assert item["titulo"] == "Palavra do Dia 18/10/2026"
+    assert item["pubdate"] == "Sun, 18 Oct 2026 00:00:00 +0200"
+    assert "Rafidim" in item["descricao"]
+
+
+def test_leitor_para_no_primeiro_item_mesmo_em_pedacos_pequenos():
+    conteudo = carregar_feed()
+    leitor = LeitorItemRss()
+    for inicio in range(0, len(conteudo), 7):
+        if leitor.alimentar(conteudo[inicio:inicio + 7]):
+            break
+    assert inicio < len(conteudo) - 7
+    assert leitor.item == ler_primeiro_item(conteudo)
+
+
+def test_blocos_da_descricao():
+    dia = item_para_dia(ler_primeiro_item(carregar_feed()))
+    leitura = dia["readings"]["first_reading"]["text"]
+    evangelho = dia["readings"]["gospel"]["text"]
+    assert leitura.startswith("Leitura do Livro do Êxodo (Ex 17,8-13)")
+    assert "Rafidim." in leitura
+    assert evangelho.startswith("Proclamação do Evangelho de Jesus Cristo segundo Lucas")
+    assert "parábola sobre" in evangelho and "sempre, e nunca desistir." in evangelho
+    assert dia["extra"] == ["Prefiro gloriar-me das minhas fraquezas, para que a força de Cristo habite em mim."]
+
+
+def test_datas():
+    item = ler_primeiro_item(carregar_feed())
+    assert data_do_item(item) == "2026-10-18"
+    assert formatar_data(item["pubdate"]) == "18 de outubro de 2026"
+    assert data_do_item({"pubdate": "ontem"}) is None
+    assert formatar_data("ontem") == "ontem"
+
+
+def test_sem_evangelho_tudo_e_leitura():
+    assert dividir_em_blocos("Só a leitura.") == ("Só a leitura.", "", "")
@@ -0,0 +1,32 @@
+import pytest
+
+from texto_html import limpar_html
+
+CASOS = [
+    ("", ""),
+    (None, ""),
+    ("texto simples", "texto simples"),
+    ("<a href='x>y'>link</a>", "link"),
+    ('<a href="x>y" title=\'a>b\'>link</a>', "link"),
+    ('<img alt="1 > 0"/>depois', "depois"),
+    ("<p>Primeiro</p><p>Segundo</p>", "Primeiro\n\nSegundo"),
+    ("linha<br>outra<br/>mais", "linha\noutra\nmais"),
+    ("<b>Leitura</b> do&nbsp;Livro &mdash; Êxodo", "Leitura do Livro — Êxodo"),
+    ("<p>a</p>\n\n\n<div></div><p>b</p>", "a\n\nb"),
+    ("antes<script>var x = '<p>';</script>depois", "antesdepois"),
+    ("antes<!-- <p>comentário</p> -->depois", "antesdepois"),
+    ("5 &lt; 6 e 7 &gt; 2", "5 < 6 e 7 > 2"),
+    ("a < b", "a < b"),
+    ("  espaços   \t soltos  ", "espaços soltos"),
+    ("marca\x00<i>x</i>", "marcax"),
+]
+
+
+@pytest.mark.parametrize("html, esperado", CASOS)
+def test_golden(html, esperado):
+    assert limpar_html(html) == esperado
+
+
+def test_pontuacao():
+    assert limpar_html("<p>Rezar sempre , e nunca desistir .</p>", pontuacao=True) == "Rezar sempre, e nunca desistir."
+    assert limpar_html("Rezar sempre , e nunca desistir .") == "Rezar sempre , e nunca desistir ."
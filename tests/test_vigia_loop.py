@@ -0,0 +1,24 @@
+import asyncio
+import time
+
+from vigia_loop import VigiaLoop
+
+
+def test_batimento_alimenta_travamentos_e_lag():
+    vigia = VigiaLoop(limite=0.05)
+
+    async def cenario():
+        vigia.iniciar()
+        await asyncio.sleep(0.05)
+        total, soma = vigia._lag.total, vigia._lag.soma
+        # Segura o loop bem acima do limite
+        time.sleep(0.3)
+        await asyncio.sleep(0.1)
+        vigia.parar()
+        return vigia._lag.total - total, vigia._lag.soma - soma
+
+    amostras, soma = asyncio.run(cenario())
+    assert amostras >= 1 and soma >= 0.2
+    assert len(vigia.travamentos) == 1
+    assert "test_vigia_loop.py" in vigia.travamentos[0]["pilha"]
+    assert vigia.travamentos[0]["duracao"] >= 0.2
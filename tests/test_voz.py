@@ -0,0 +1,29 @@
+import discord
+
+from voz import FonteMedida, GerenciadorVoz, SessaoVoz
+
+
+class Silencio(discord.AudioSource):
+    def read(self):
+        return b""
+
+    def is_opus(self):
+        return True
+
+
+def test_relatorio_so_da_guild():
+    gerenciador = GerenciadorVoz(client=None)
+    for guild_id in (1, 2):
+        gerenciador.sessoes[guild_id] = SessaoVoz(guild_id, 10 * guild_id, "terço", fonte=FonteMedida(Silencio()))
+    # Sessão ainda conectando, sem fonte: não conta
+    gerenciador.sessoes[3] = SessaoVoz(3, 30, "terço")
+
+    todas = gerenciador.relatorio()
+    assert todas["sessoes_ativas"] == 2
+    assert "rss_por_sessao" not in todas
+
+    uma = gerenciador.relatorio(2)
+    assert uma["sessoes_ativas"] == 1
+    assert [s["guild_id"] for s in uma["sessoes"]] == [2]
+    assert uma["sessoes"][0]["rss_ffmpeg"] == 0
+    assert gerenciador.relatorio(3)["sessoes"] == []
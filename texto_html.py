@@ -0,0 +1,49 @@
+import html
+import re
+
+# Tags que abrem/fecham um parágrafo; <br> vira só uma quebra de linha
+BLOCOS = frozenset({
+    "p", "div", "section", "article", "blockquote", "pre", "hr",
+    "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li", "table", "tr",
+})
+
+_IGNORADOS = re.compile(r"<(script|style)\b.*?</\1\s*>|<!--.*?-->", re.S | re.I)
+# Atributos entre aspas podem conter ">": <a href='x>y'>
+_TAG = re.compile(r"""</?([a-zA-Z][a-zA-Z0-9]*)(?:"[^"]*"|'[^']*'|[^'">])*>""")
+_QUEBRAS = re.compile(r"\n{3,}")
+_ANTES_PONTUACAO = re.compile(r" +([.,;!?])")
+
+# Marca de quebra enquanto o texto ainda tem espaços do HTML original
+_QUEBRA = "\x00"
+
+
+def _tag(m):
+    nome = m.group(1).lower()
+    if nome == "br":
+        return _QUEBRA
+    if nome in BLOCOS:
+        return _QUEBRA * 2
+    return ""
+
+
+def limpar_html(texto, pontuacao=False):
+    """Converte HTML em texto: decodifica entidades, junta espaços e mantém os parágrafos.
+
+    Com `pontuacao=True`, também remove espaços antes de pontuação.
+    """
+    if not texto:
+        return ""
+    if "<" in texto:
+        if _QUEBRA in texto:
+            texto = texto.replace(_QUEBRA, "")
+        texto = _TAG.sub(_tag, _IGNORADOS.sub("", texto))
+    if "&" in texto:
+        texto = html.unescape(texto)
+    # Uma passada só: cada linha tem os espaços (inclusive &nbsp;) juntados por str.split
+    texto = "\n".join([" ".join(linha.split()) for linha in texto.split(_QUEBRA)])
+    if "\n\n\n" in texto:
+        texto = _QUEBRAS.sub("\n\n", texto)
+    texto = texto.strip()
+    if pontuacao and " " in texto:
+        texto = _ANTES_PONTUACAO.sub(r"\1", texto)
+    return texto
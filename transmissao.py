@@ -0,0 +1,112 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from telemetria import span
+
+# Limite global de requisições da API do Discord por bot
+LIMITE_GLOBAL = 50
+CONCORRENCIA = 25
+
+
+class LimitadorTaxa:
+    """Balde de fichas: no máximo `taxa` requisições por segundo, com rajada de `rajada`"""
+
+    def __init__(self, taxa=LIMITE_GLOBAL, rajada=None):
+        self.taxa = taxa
+        self.rajada = rajada or taxa
+        self.fichas = self.rajada
+        self.ultimo = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def aguardar(self):
+        async with self._lock:
+            agora = time.monotonic()
+            self.fichas = min(self.rajada, self.fichas + (agora - self.ultimo) * self.taxa)
+            self.ultimo = agora
+            if self.fichas < 1:
+                await asyncio.sleep((1 - self.fichas) / self.taxa)
+                self.ultimo = time.monotonic()
+                self.fichas = 0
+            else:
+                self.fichas -= 1
+
+
+@dataclass
+class ResultadoEnvio:
+    guild_id: str
+    channel_id: str
+    ok: bool = False
+    enviadas: int = 0
+    erro: str = None
+    duracao: float = 0.0
+
+
+@dataclass
+class RelatorioTransmissao:
+    resultados: list = field(default_factory=list)
+    duracao: float = 0.0
+
+    @property
+    def sucessos(self):
+        return sum(1 for r in self.resultados if r.ok)
+
+    @property
+    def falhas(self):
+        return [r for r in self.resultados if not r.ok]
+
+
+class Transmissor:
+    """Envia mensagens para vários canais ao mesmo tempo.
+
+    Cada canal recebe suas mensagens em ordem; entre canais, no máximo
+    `concorrencia` envios simultâneos e `limite_global` requisições por segundo.
+    Os limites por rota (e os 429) continuam sendo tratados pelo discord.py.
+    """
+
+    def __init__(self, concorrencia=CONCORRENCIA, limite_global=LIMITE_GLOBAL):
+        self.semaforo = asyncio.Semaphore(concorrencia)
+        self.limitador = LimitadorTaxa(limite_global) if limite_global else None
+
+    async def _enviar_canal(self, guild_id, channel_id, channel, mensagens, ao_enviar):
+        resultado = ResultadoEnvio(str(guild_id), str(channel_id))
+        if channel is None:
+            resultado.erro = "Canal não encontrado"
+            return resultado
+        async with self.semaforo:
+            inicio = time.perf_counter()
+            try:
+                # Um tipo pode ocupar várias mensagens; só conta como entregue na última
+                ultima = {tipo: i for i, (tipos, _) in enumerate(mensagens) for tipo in tipos}
+                for i, (tipos, mensagem) in enumerate(mensagens):
+                    if self.limitador:
+                        await self.limitador.aguardar()
+                    with span("channel_send", canal=channel_id, tipos=tipos):
+                        await channel.send(**mensagem)
+                    resultado.enviadas += 1
+                    if ao_enviar:
+                        for tipo in tipos:
+                            if ultima[tipo] == i:
+                                ao_enviar(guild_id, channel_id, tipo)
+                resultado.ok = True
+            except Exception as e:
+                resultado.erro = f"{type(e).__name__}: {e}"
+            resultado.duracao = time.perf_counter() - inicio
+        return resultado
+
+    async def transmitir(self, destinos, montar, ao_enviar=None):
+        """destinos: (guild_id, channel_id, channel); montar(guild_id, channel_id, channel)
+        devolve os pares (tipos, kwargs de channel.send) daquele canal, onde `tipos`
+        são os conteúdos que a mensagem carrega (uma mensagem pode levar vários).
+        ao_enviar(guild_id, channel_id, tipo) é chamado quando a última mensagem
+        de cada tipo é enviada com sucesso.
+        """
+        inicio = time.perf_counter()
+        tarefas = [
+            self._enviar_canal(
+                guild_id, channel_id, channel, montar(guild_id, channel_id, channel) if channel else [], ao_enviar
+            )
+            for guild_id, channel_id, channel in destinos
+        ]
+        resultados = await asyncio.gather(*tarefas)
+        return RelatorioTransmissao(list(resultados), time.perf_counter() - inicio)
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+
+from telemetria import BALDES_LAG, histograma, obter_logger
+
+# Um callback que segura o loop por mais que isto vira um travamento registrado (segundos)
+LIMITE_BLOQUEIO = float(os.getenv("LIMITE_BLOQUEIO_LOOP", 0.1))
+PERFIL_MAXIMO = 60
+INTERVALO_AMOSTRAS = 0.005
+
+log = obter_logger("vigia")
+
+
+def _pilha(frame):
+    quadros = []
+    while frame is not None:
+        codigo = frame.f_code
+        quadros.append(f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(quadros))
+
+
+def amostrar(thread_id, segundos, intervalo=INTERVALO_AMOSTRAS):
+    """Perfil por amostragem de uma thread: pilhas no formato "a;b;c" -> contagem.
+
+    Bloqueia por `segundos`; chamar fora do event loop.
+    """
+    contagem = Counter()
+    fim = time.monotonic() + segundos
+    while time.monotonic() < fim:
+        frame = sys._current_frames().get(thread_id)
+        if frame is not None:
+            contagem[_pilha(frame)] += 1
+        del frame
+        time.sleep(intervalo)
+    return contagem
+
+
+class VigiaLoop:
+    """Thread que vigia o event loop: se o batimento atrasar mais que `limite`,
+    registra a pilha do callback que está segurando o loop naquele instante.
+
+    O batimento é também a única amostra do atraso do loop: quanto cada
+    sleep(intervalo) demorou além do pedido vai para o histograma de lag.
+    """
+
+    def __init__(self, limite=LIMITE_BLOQUEIO, guardar=20):
+        self.limite = limite
+        self.intervalo = limite / 4
+        self.travamentos = deque(maxlen=guardar)
+        self._batida = time.monotonic()
+        self._thread_loop = None
+        self._tarefa = None
+        self._thread = None
+        self._parar = threading.Event()
+        self._perfil = asyncio.Lock()
+        self._duracoes = histograma(
+            "liturgia_event_loop_stall_seconds", "Duração dos travamentos do event loop",
+            (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+        )
+        self._lag = histograma("liturgia_event_loop_lag_seconds", "Atraso do event loop", BALDES_LAG)
+
+    async def _bater(self):
+        while True:
+            self._batida = time.monotonic()
+            await asyncio.sleep(self.intervalo)
+            self._lag.observar(max(0.0, time.monotonic() - self._batida - self.intervalo))
+
+    def iniciar(self):
+        """Chamar de dentro do event loop a ser vigiado"""
+        self._thread_loop = threading.get_ident()
+        self._batida = time.monotonic()
+        self._tarefa = asyncio.create_task(self._bater())
+        self._thread = threading.Thread(target=self._vigiar, name="vigia-loop", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+
+    def _vigiar(self):
+        atual = None
+        while not self._parar.wait(self.intervalo):
+            batida = self._batida
+            parado = time.monotonic() - batida - self.intervalo
+            if parado > self.limite:
+                if atual is None or atual["batida"] != batida:
+                    # Pilha capturada enquanto o loop ainda está preso no callback culpado
+                    frame = sys._current_frames().get(self._thread_loop)
+                    pilha = "".join(traceback.format_stack(frame)) if frame is not None else ""
+                    del frame
+                    atual = {"batida": batida, "quando": time.time() - parado, "duracao": parado, "pilha": pilha}
+                    self.travamentos.append(atual)
+                    log.warning("Event loop travado há %.0fms; pilha do loop:\n%s", parado * 1000, pilha)
+                else:
+                    atual["duracao"] = parado
+            elif atual is not None:
+                atual["duracao"] = max(atual["duracao"], batida - atual["batida"] - self.intervalo)
+                self._duracoes.observar(atual["duracao"])
+                log.warning("Event loop voltou após %.0fms travado", atual["duracao"] * 1000)
+                atual = None
+
+    async def perfilar(self, segundos):
+        """Amostra a pilha do event loop por `segundos` (um perfil por vez)"""
+        segundos = max(1, min(PERFIL_MAXIMO, segundos))
+        if self._perfil.locked():
+            return None
+        async with self._perfil:
+            return await asyncio.to_thread(amostrar, self._thread_loop, segundos)
+
+
+def resumir_perfil(contagem, linhas=10):
+    """As pilhas mais frequentes, mostrando só os últimos quadros de cada uma"""
+    total = sum(contagem.values()) or 1
+    saida = [f"{total} amostras"]
+    for pilha, n in contagem.most_common(linhas):
+        folhas = " ← ".join(reversed(pilha.split(";")[-3:]))
+        saida.append(f"{n * 100 / total:5.1f}%  {folhas}")
+    return "\n".join(saida)
+
+
+def pilhas_agregadas(contagem):
+    """Formato "pilha contagem" por linha, aceito por flamegraph.pl e speedscope"""
+    return "\n".join(f"{pilha} {n}" for pilha, n in contagem.most_common()) + "\n"
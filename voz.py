@@ -0,0 +1,283 @@
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import discord
+
+from telemetria import obter_logger, span
+
+# Máximo de sessões tocando ao mesmo tempo (cada uma ocupa uma thread de player
+# e, no caminho antigo, um processo ffmpeg)
+MAX_SESSOES = int(os.getenv("MAX_SESSOES_VOZ", 64))
+SILENCIO_APOS_TERCO = 600
+
+log = obter_logger("voz")
+
+
+def rss_processo(pid="self"):
+    """RSS em bytes, lido de /proc (0 quando indisponível)"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class FonteMedida(discord.AudioSource):
+    """Envolve uma fonte de áudio e mede a CPU da thread do player que a consome"""
+
+    def __init__(self, fonte):
+        self.fonte = fonte
+        self.quadros = 0
+        self._relogio = None
+        self._cpu_inicial = 0.0
+        self._cpu_final = None
+
+    def read(self):
+        if self._relogio is None:
+            self._relogio = time.pthread_getcpuclockid(threading.get_ident())
+            self._cpu_inicial = time.clock_gettime(self._relogio)
+        dados = self.fonte.read()
+        if dados:
+            self.quadros += 1
+        else:
+            # Fim do áudio: guarda a CPU antes de a thread do player terminar
+            self._cpu_final = time.clock_gettime(self._relogio) - self._cpu_inicial
+        return dados
+
+    def is_opus(self):
+        return self.fonte.is_opus()
+
+    def cleanup(self):
+        self.fonte.cleanup()
+
+    @property
+    def cpu(self):
+        if self._cpu_final is not None:
+            return self._cpu_final
+        if self._relogio is None:
+            return 0.0
+        try:
+            return time.clock_gettime(self._relogio) - self._cpu_inicial
+        except OSError:
+            # A thread do player já terminou
+            return 0.0
+
+    @property
+    def rss_ffmpeg(self):
+        processo = getattr(self.fonte, "_process", None)
+        return rss_processo(processo.pid) if processo and processo.poll() is None else 0
+
+
+@dataclass
+class SessaoVoz:
+    guild_id: int
+    channel_id: int
+    rotulo: str
+    inicio: float = field(default_factory=time.monotonic)
+    fonte: FonteMedida = None
+    cpu: float = 0.0
+    quadros: int = 0
+    silencio: bool = False
+    parar: asyncio.Event = field(default_factory=asyncio.Event)
+    encerrada: asyncio.Event = field(default_factory=asyncio.Event)
+
+    async def esperar(self, segundos):
+        """Espera `segundos` ou até a sessão ser interrompida; retorna True se interrompida"""
+        try:
+            await asyncio.wait_for(self.parar.wait(), segundos)
+        except asyncio.TimeoutError:
+            pass
+        return self.parar.is_set()
+
+
+class GerenciadorVoz:
+    """Sessões de terço em voz, uma por guild, com os voice clients indexados por guild"""
+
+    def __init__(self, client, max_sessoes=MAX_SESSOES):
+        self.client = client
+        self.clientes = {}
+        self.sessoes = {}
+        self.semaforo = asyncio.Semaphore(max_sessoes)
+
+    def cliente(self, guild_id):
+        vc = self.clientes.get(guild_id)
+        if vc is not None and not vc.is_connected():
+            del self.clientes[guild_id]
+            vc = None
+        return vc
+
+    async def conectar(self, voice_channel):
+        vc = self.cliente(voice_channel.guild.id)
+        if vc is not None:
+            if vc.channel != voice_channel:
+                await vc.move_to(voice_channel)
+            log.info("Já conectado ao canal de voz: %s", voice_channel.name)
+            return vc
+        log.debug("Tentando conectar ao canal de voz...")
+        with span("voz_conectar", guild=voice_channel.guild.id):
+            vc = await voice_channel.connect()
+        self.clientes[voice_channel.guild.id] = vc
+        log.info("Conectado ao canal de voz: %s", voice_channel.name)
+        return vc
+
+    def interromper(self, guild_id):
+        """Encerra a espera, o áudio ou o silêncio da sessão em curso na guild"""
+        sessao = self.sessoes.get(guild_id)
+        if sessao is None:
+            return None
+        sessao.parar.set()
+        vc = self.clientes.get(guild_id)
+        if vc is not None and vc.is_playing():
+            vc.stop()
+        return sessao
+
+    def canal_vazio(self, guild_id):
+        vc = self.cliente(guild_id)
+        return vc is None or not any(not m.bot for m in vc.channel.members)
+
+    def canal_atualizado(self, guild_id):
+        """Chamado em on_voice_state_update: libera a conexão se só restou o bot no canal"""
+        sessao = self.sessoes.get(guild_id)
+        if sessao is not None and sessao.fonte is None and sessao.silencio and self.canal_vazio(guild_id):
+            log.info("Canal de voz vazio na guild %s, encerrando o silêncio.", guild_id)
+            sessao.parar.set()
+
+    async def desconectar(self, guild_id):
+        self.interromper(guild_id)
+        vc = self.clientes.pop(guild_id, None)
+        if vc is not None and vc.is_connected():
+            await vc.disconnect()
+            return True
+        return False
+
+    async def desconectar_todos(self):
+        resultados = await asyncio.gather(*(self.desconectar(g) for g in list(self.clientes)))
+        return sum(resultados)
+
+    def relatorio(self, guild_id=None):
+        """Sessões ativas (todas, ou só as da guild) e memória.
+
+        `rss_processo` é o bot inteiro; o que cada sessão ocupa de fato fica no
+        seu ffmpeg (`rss_ffmpeg`), já que as sessões dividem buffers e quadros.
+        """
+        ativas = [
+            s for s in self.sessoes.values()
+            if s.fonte is not None and (guild_id is None or str(s.guild_id) == str(guild_id))
+        ]
+        return {
+            "sessoes_ativas": len(ativas),
+            "rss_processo": rss_processo(),
+            "sessoes": [
+                {
+                    "guild_id": s.guild_id,
+                    "rotulo": s.rotulo,
+                    "cpu": s.fonte.cpu,
+                    "quadros": s.fonte.quadros,
+                    "rss_ffmpeg": s.fonte.rss_ffmpeg,
+                    "duracao": time.monotonic() - s.inicio,
+                }
+                for s in ativas
+            ],
+        }
+
+    async def _tocar(self, voice_client, fonte):
+        # O player chama `after` na sua thread ao terminar (ou ao ser parado)
+        loop = asyncio.get_running_loop()
+        fim = loop.create_future()
+
+        def ao_terminar(erro):
+            loop.call_soon_threadsafe(lambda: fim.done() or fim.set_result(erro))
+
+        voice_client.play(fonte, after=ao_terminar)
+        return await fim
+
+    async def sessao(self, guild_id, channel_id, fonte, rotulo, inicio=None):
+        """Conecta, espera até `inicio` (datetime com fuso), toca a fonte e fica em silêncio"""
+        guild = self.client.get_guild(int(guild_id))
+        if guild is None:
+            log.error("Guild %s não encontrada.", guild_id)
+            return False
+        voice_channel = guild.get_channel(int(channel_id))
+        if not voice_channel or not isinstance(voice_channel, discord.VoiceChannel):
+            log.error("Canal de voz inválido ou não encontrado na guild %s.", guild_id)
+            return False
+
+        # Uma nova sessão substitui a anterior da mesma guild, sem derrubar a conexão
+        anterior = self.interromper(guild.id)
+        sessao = SessaoVoz(guild.id, voice_channel.id, rotulo)
+        self.sessoes[guild.id] = sessao
+        if anterior is not None:
+            await anterior.encerrada.wait()
+        try:
+            voice_client = await self.conectar(voice_channel)
+
+            if inicio is not None:
+                segundos_ate_inicio = (inicio - datetime.now(inicio.tzinfo)).total_seconds()
+                if segundos_ate_inicio > 0:
+                    log.info("Aguardando %.1f segundos até %s", segundos_ate_inicio, inicio.strftime("%H:%M"))
+                    if await sessao.esperar(segundos_ate_inicio):
+                        return False
+
+            async with self.semaforo:
+                if sessao.parar.is_set():
+                    return False
+                # A fonte (e um eventual processo ffmpeg) só é criada dentro do limite de sessões
+                with span("fonte_iniciar", guild=guild.id, rotulo=rotulo):
+                    audio_source = fonte()
+                if audio_source is None:
+                    return False
+                log.info("Tocando o %s na guild %s...", rotulo, guild.id)
+                while audio_source is not None:
+                    sessao.fonte = FonteMedida(audio_source)
+                    with span("voz_tocar", guild=guild.id, rotulo=rotulo):
+                        erro = await self._tocar(voice_client, sessao.fonte)
+                    sessao.cpu += sessao.fonte.cpu
+                    sessao.quadros += sessao.fonte.quadros
+                    sessao.fonte = None
+                    if sessao.parar.is_set() or voice_client.is_connected():
+                        if erro:
+                            raise erro
+                        break
+                    # A conexão de voz caiu no meio do terço: reconecta e continua de onde parou
+                    retomar = getattr(audio_source, "retomar", None)
+                    audio_source = retomar() if retomar else None
+                    if audio_source is not None:
+                        log.info("Voz desconectada na guild %s; reconectando para retomar o %s...", guild.id, rotulo)
+                        voice_client = await self.conectar(voice_channel)
+
+            duracao = time.monotonic() - sessao.inicio
+            log.info("%s finalizado na guild %s: %d quadros, CPU %.2fs em %.0fs.",
+                     rotulo, guild.id, sessao.quadros, sessao.cpu, duracao)
+            if sessao.parar.is_set():
+                return True
+
+            if self.canal_vazio(guild.id):
+                log.info("Canal de voz vazio, desconectando sem esperar o silêncio.")
+            else:
+                log.info("Permanecendo em silêncio por 10 minutos...")
+                sessao.silencio = True
+                await sessao.esperar(SILENCIO_APOS_TERCO)
+            return True
+        except Exception as e:
+            log.exception("Falha ao executar transmissão do %s na guild %s: %s", rotulo, guild_id, e)
+            return False
+        finally:
+            # Só desconecta quem ainda é a sessão atual; uma sessão substituída deixa a conexão para a nova
+            if self.sessoes.get(guild.id) is sessao:
+                del self.sessoes[guild.id]
+                vc = self.clientes.pop(guild.id, None)
+                if vc is not None and vc.is_connected():
+                    await vc.disconnect()
+                    log.info("Desconectado do canal de voz.")
+            sessao.encerrada.set()
+
+    async def tocar_em(self, destinos, fonte, rotulo, inicio=None):
+        """Inicia sessões simultâneas; destinos: {guild_id: voice_channel_id}"""
+        tarefas = [self.sessao(g, c, fonte, rotulo, inicio) for g, c in destinos.items()]
+        resultados = await asyncio.gather(*tarefas)
+        log.info("%s: %d/%d sessões concluídas.", rotulo, sum(resultados), len(resultados))
+        return resultados